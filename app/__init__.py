@@ -17,7 +17,8 @@ load_dotenv()
 # ⚙ Extensões principais
 # ==========================================================
 from app.ext import db, migrate, login_manager, csrf
-from app.models.modelos import Usuario
+from app.principais import carregar_principal
+from app.relatorios.pdf import configurar_reportlab
 
 # ==========================================================
 # 📦 Importação dos Blueprints (módulos principais)
@@ -53,6 +54,11 @@ def create_app():
     login_manager.init_app(app)
     csrf.init_app(app)
 
+    # ------------------------------------------------------
+    # 📄 Geração de PDFs (reportlab, configuração global)
+    # ------------------------------------------------------
+    configurar_reportlab()
+
     # ------------------------------------------------------
     # 🔐 Configuração de autenticação (Flask-Login)
     # ------------------------------------------------------
@@ -62,8 +68,8 @@ def create_app():
 
     @login_manager.user_loader
     def load_user(user_id):
-        """Carrega o usuário autenticado na sessão."""
-        return Usuario.query.get(int(user_id))
+        """Carrega o usuário autenticado na sessão (Principal em cache, ver app/principais.py)."""
+        return carregar_principal(int(user_id))
 
     # ------------------------------------------------------
     # 📦 Registro de Blueprints institucionais
@@ -0,0 +1,116 @@
+# app/admin/busca_usuarios.py
+"""
+Busca paginada de usuários do painel administrativo — CR-NOVACAP.
+
+Usuario.busca_normalizada guarda nome, usuário e e-mail em minúsculas e
+sem acentos (preenchida pelo próprio modelo). A busca é por trecho em
+qualquer posição, como antes. Termos com 3 ou mais caracteres usam o
+índice de trigramas `usuario_trigramas` (candidatos_trigramas, de
+app/processos/trigramas.py) e o LIKE confirma os candidatos. Termos mais
+curtos usam LIKE '%termo%' direto, sem índice, o que é aceitável no
+tamanho da tabela de usuários.
+
+As facetas (pendentes, bloqueados, administradores) saem de UMA consulta
+agrupada por (aprovado, bloqueado, is_admin) sobre o resultado da busca;
+o total da listagem vem da mesma consulta.
+"""
+
+from sqlalchemy import and_, false, func, or_, select, true
+
+from app.ext import db
+from app.models.modelos import Usuario, UsuarioTrigrama
+from app.processos.trigramas import TAMANHO_NGRAMA, candidatos_trigramas, gerar_trigramas
+
+# Facetas de situação: nome → condição
+FACETAS_USUARIOS = {
+    "pendentes": or_(Usuario.aprovado.is_(None), Usuario.aprovado == false()),
+    "bloqueados": Usuario.bloqueado == true(),
+    "admins": Usuario.is_admin == true(),
+}
+
+
+# ==========================================================
+# ✏️ Manutenção do índice
+# ==========================================================
+def indexar_usuario(usuario):
+    """Regrava os trigramas do usuário (o usuário já deve ter id)."""
+    UsuarioTrigrama.query.filter_by(id_usuario=usuario.id_usuario).delete(synchronize_session=False)
+    for trigrama in gerar_trigramas(usuario.busca_normalizada):
+        db.session.add(UsuarioTrigrama(trigrama=trigrama, id_usuario=usuario.id_usuario))
+
+
+def reconstruir_indice(tamanho_lote=1000):
+    """Recria todo o índice a partir de `usuarios` (sem commit). Retorna o total."""
+    UsuarioTrigrama.query.delete(synchronize_session=False)
+
+    total = 0
+    ultimo_id = 0
+    while True:
+        lote = (
+            db.session.query(Usuario.id_usuario, Usuario.busca_normalizada)
+            .filter(Usuario.id_usuario > ultimo_id)
+            .order_by(Usuario.id_usuario)
+            .limit(tamanho_lote)
+            .all()
+        )
+        if not lote:
+            return total
+        db.session.execute(UsuarioTrigrama.__table__.insert(), [
+            {'trigrama': trigrama, 'id_usuario': id_usuario}
+            for id_usuario, texto in lote
+            for trigrama in gerar_trigramas(texto)
+        ])
+        total += len(lote)
+        ultimo_id = lote[-1].id_usuario
+
+
+# ==========================================================
+# 🔍 Busca
+# ==========================================================
+def condicao_busca(termo):
+    """Expressão SQL para 'nome, usuário ou e-mail contém o termo' (None se vazio)."""
+    termo = Usuario.normalizar_busca(termo)
+    if not termo:
+        return None
+
+    contem = Usuario.busca_normalizada.like(f"%{termo}%")
+    if len(termo) < TAMANHO_NGRAMA:
+        # Termo curto demais para trigramas
+        return contem
+
+    candidatos = candidatos_trigramas(UsuarioTrigrama, 'id_usuario', gerar_trigramas(termo))
+    return and_(Usuario.id_usuario.in_(candidatos), contem)
+
+
+def contar_facetas(termo):
+    """Total e contagem de cada faceta para o termo, em uma consulta agrupada."""
+    stmt = select(Usuario.aprovado, Usuario.bloqueado, Usuario.is_admin, func.count())
+    condicao = condicao_busca(termo)
+    if condicao is not None:
+        stmt = stmt.where(condicao)
+    stmt = stmt.group_by(Usuario.aprovado, Usuario.bloqueado, Usuario.is_admin)
+
+    facetas = {"total": 0, **{nome: 0 for nome in FACETAS_USUARIOS}}
+    for aprovado, bloqueado, is_admin, quantidade in db.session.execute(stmt):
+        facetas["total"] += quantidade
+        facetas["pendentes"] += 0 if aprovado else quantidade
+        facetas["bloqueados"] += quantidade if bloqueado else 0
+        facetas["admins"] += quantidade if is_admin else 0
+    return facetas
+
+
+def listar_usuarios(termo, faceta=None, pagina=1, por_pagina=50):
+    """Página de usuários (por nome) que atendem ao termo e à faceta."""
+    query = Usuario.query
+    condicao = condicao_busca(termo)
+    if condicao is not None:
+        query = query.filter(condicao)
+    if faceta:
+        query = query.filter(FACETAS_USUARIOS[faceta])
+
+    return (
+        query.order_by(Usuario.nome.asc(), Usuario.id_usuario.asc())
+        .offset((pagina - 1) * por_pagina)
+        .limit(por_pagina)
+        .all()
+    )
@@ -1,16 +1,22 @@
 # app/admin/routes.py
 """
 Rotas do módulo administrativo — CR-NOVACAP.
-Inclui painel de usuários, aprovação, bloqueio, desbloqueio e atribuição de permissões.
+Inclui painel de usuários, aprovação, bloqueio, desbloqueio, atribuição de permissões
+e as estatísticas do cache de resultados.
 """
 
-from flask import render_template, redirect, url_for, flash, session, request
+from flask import render_template, redirect, url_for, flash, session, request, jsonify
 from flask_login import login_required
-from sqlalchemy import or_
 
 from app.ext import db
+from app.cache_resultados import estatisticas_cache
+from app.catalogo import nova_versao_catalogo
+from app.principais import nova_versao_usuarios
 from app.models.modelos import Usuario
 from app.admin import admin_bp
+from app.admin.busca_usuarios import FACETAS_USUARIOS, contar_facetas, listar_usuarios
+
+POR_PAGINA_USUARIOS = 50
 
 
 # ==========================================================
@@ -19,25 +25,33 @@ from app.admin import admin_bp
 @admin_bp.route('/painel')
 @login_required
 def painel_admin():
-    """Exibe o painel com a lista de usuários cadastrados (com busca e filtro)"""
+    """Exibe o painel com a lista paginada de usuários (busca e facetas de situação)"""
     if not session.get('is_admin'):
         flash("Acesso restrito ao administrador.", "error")
         return redirect(url_for('main_bp.login'))
 
     termo_busca = request.args.get('q', '').strip()
-    query = Usuario.query
-
-    if termo_busca:
-        query = query.filter(
-            or_(
-                Usuario.nome.ilike(f"%{termo_busca}%"),
-                Usuario.usuario.ilike(f"%{termo_busca}%"),
-                Usuario.email.ilike(f"%{termo_busca}%")
-            )
-        )
-
-    usuarios = query.order_by(Usuario.nome.asc()).all()
-    return render_template('painel_admin.html', usuarios=usuarios)
+    faceta = request.args.get('faceta', '')
+    if faceta not in FACETAS_USUARIOS:
+        faceta = ''
+    pagina = max(request.args.get('pagina', 1, type=int), 1)
+
+    facetas = contar_facetas(termo_busca)
+    total = facetas[faceta] if faceta else facetas['total']
+    total_paginas = max((total + POR_PAGINA_USUARIOS - 1) // POR_PAGINA_USUARIOS, 1)
+    pagina = min(pagina, total_paginas)
+
+    usuarios = listar_usuarios(termo_busca, faceta, pagina, POR_PAGINA_USUARIOS)
+    return render_template(
+        'painel_admin.html',
+        usuarios=usuarios,
+        termo_busca=termo_busca,
+        faceta=faceta,
+        facetas=facetas,
+        total=total,
+        pagina=pagina,
+        total_paginas=total_paginas
+    )
 
 
 # ==========================================================
@@ -57,6 +71,8 @@ def aprovar_usuario(id_usuario):
         flash(f"ℹ️ O usuário '{usuario.usuario}' já está aprovado.", "info")
     else:
         usuario.aprovado = True
+        nova_versao_catalogo()
+        nova_versao_usuarios()
         db.session.commit()
         flash(f"✅ Usuário '{usuario.usuario}' aprovado com sucesso.", "success")
 
@@ -80,6 +96,8 @@ def bloquear_usuario(id_usuario):
         flash(f"ℹ️ O usuário '{usuario.usuario}' já está bloqueado.", "info")
     else:
         usuario.bloqueado = True
+        nova_versao_catalogo()
+        nova_versao_usuarios()
         db.session.commit()
         flash(f"🚫 Usuário '{usuario.usuario}' bloqueado.", "warning")
 
@@ -103,6 +121,8 @@ def desbloquear_usuario(id_usuario):
         flash(f"ℹ️ O usuário '{usuario.usuario}' já está desbloqueado.", "info")
     else:
         usuario.bloqueado = False
+        nova_versao_catalogo()
+        nova_versao_usuarios()
         db.session.commit()
         flash(f"✅ Usuário '{usuario.usuario}' desbloqueado com sucesso.", "success")
 
@@ -126,7 +146,21 @@ def atribuir_admin(id_usuario):
         flash(f"ℹ️ O usuário '{usuario.usuario}' já é administrador.", "info")
     else:
         usuario.is_admin = True
+        nova_versao_usuarios()
         db.session.commit()
         flash(f"👑 Usuário '{usuario.usuario}' agora é administrador.", "success")
 
     return redirect(url_for('admin_bp.painel_admin'))
+
+
+# ==========================================================
+# 6️⃣ Estatísticas do Cache de Resultados
+# ==========================================================
+@admin_bp.route('/cache-resultados')
+@login_required
+def cache_resultados():
+    """Acertos, falhas e ocupação do cache de resultados (deste worker), em JSON"""
+    if not session.get('is_admin'):
+        return jsonify({"erro": "Acesso restrito ao administrador."}), 403
+
+    return jsonify(estatisticas_cache())
@@ -0,0 +1,160 @@
+# app/cache_resultados.py
+"""
+Cache de resultados das consultas de relatórios e listagens — CR-NOVACAP.
+
+Os mesmos filtros (mês corrente, por diretoria, por RA) são executados o
+dia todo por usuários diferentes. Cada resultado fica em memória, no
+processo, indexado por
+    (consulta, filtros normalizados + parâmetros extras)
+Os filtros já chegam convertidos por app/filtros.py, então a mesma
+combinação sempre gera a mesma chave.
+
+A geração dos dados NÃO faz parte da chave. Ela (tabela geracoes_dados) é
+incrementada por nova_geracao() na mesma transação de cada cadastro,
+alteração ou exclusão de processo. Os escopos (processos, catálogo,
+usuários) são lidos juntos, numa única consulta por requisição. Quando
+a geração lida difere da última vista, o worker descarta o cache inteiro
+antes de consultá-lo; um resultado calculado enquanto a geração mudou não
+é guardado. Uma escrita desfeita (rollback) não invalida nada.
+
+O cache é um LRU limitado em bytes (tamanho aproximado de cada resultado,
+CACHE_RESULTADOS_BYTES na configuração). Resultados maiores que uma fração
+do limite não são guardados. estatisticas_cache() expõe acertos e falhas
+para o dimensionamento.
+"""
+
+import sys
+import threading
+
+from cachetools import LRUCache
+from flask import current_app, g
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Row
+
+from app.ext import db
+from app.models.modelos import GeracaoDados
+
+TAMANHO_CACHE_RESULTADOS = 64 * 1024 * 1024   # bytes (aproximados) por worker
+FRACAO_MAXIMA_ENTRADA = 10                    # entrada maior que limite/10 não é guardada
+
+ESCOPO_PROCESSOS = "processos"
+
+_cache = None
+_geracao_vista = None
+_lock = threading.Lock()
+_estatisticas = {"acertos": 0, "falhas": 0, "nao_guardados": 0, "invalidacoes": 0}
+
+
+# ==========================================================
+# 🔢 Geração dos dados
+# ==========================================================
+def nova_geracao(escopo=ESCOPO_PROCESSOS):
+    """Incrementa a geração na transação corrente (chamar antes do commit)."""
+    incremento = (
+        update(GeracaoDados)
+        .where(GeracaoDados.escopo == escopo)
+        .values(geracao=GeracaoDados.geracao + 1)
+    )
+    if db.session.execute(incremento).rowcount:
+        return
+
+    # Primeira escrita do escopo: a inserção vai num savepoint; se outro
+    # escritor criou a linha antes (chave duplicada), incrementa a dele
+    try:
+        with db.session.begin_nested():
+            db.session.add(GeracaoDados(escopo=escopo, geracao=1))
+    except IntegrityError:
+        db.session.execute(incremento)
+
+
+def _geracoes():
+    """Todas as gerações (escopo → geração), lidas em UMA consulta por requisição."""
+    if "geracoes_dados" not in g:
+        g.geracoes_dados = dict(
+            db.session.execute(select(GeracaoDados.escopo, GeracaoDados.geracao)).all()
+        )
+    return g.geracoes_dados
+
+
+def geracao_atual(escopo=ESCOPO_PROCESSOS):
+    """Geração gravada no banco para o escopo (0 se ainda não houver linha)."""
+    return _geracoes().get(escopo) or 0
+
+
+# ==========================================================
+# 🗃 Cache
+# ==========================================================
+def _tamanho(valor):
+    """Tamanho aproximado em bytes, somando as estruturas aninhadas."""
+    tamanho = sys.getsizeof(valor)
+    if isinstance(valor, dict):
+        tamanho += sum(_tamanho(k) + _tamanho(v) for k, v in valor.items())
+    elif isinstance(valor, (list, tuple, set, frozenset, Row)):
+        tamanho += sum(_tamanho(v) for v in valor)
+    return tamanho
+
+
+def _obter_cache():
+    global _cache
+    if _cache is None:
+        limite = current_app.config.get("CACHE_RESULTADOS_BYTES", TAMANHO_CACHE_RESULTADOS)
+        _cache = LRUCache(maxsize=limite, getsizeof=lambda entrada: entrada[1])
+    return _cache
+
+
+def chave_filtros(filtros, **extras):
+    """Forma canônica (ordenada e imutável) dos filtros e parâmetros extras."""
+    return tuple(sorted({**filtros, **extras}.items()))
+
+
+def em_cache(consulta, filtros, calcular, **extras):
+    """
+    Resultado de `calcular()` para a consulta e os filtros na geração atual.
+    `extras` (ordenação, cursor, limite...) entram na chave junto com os filtros.
+    """
+    global _geracao_vista
+    geracao = geracao_atual()
+    chave = (consulta, chave_filtros(filtros, **extras))
+
+    with _lock:
+        cache = _obter_cache()
+        if geracao != _geracao_vista:
+            if cache:
+                _estatisticas["invalidacoes"] += 1
+            cache.clear()
+            _geracao_vista = geracao
+        entrada = cache.get(chave)
+        if entrada is not None:
+            _estatisticas["acertos"] += 1
+            return entrada[0]
+        _estatisticas["falhas"] += 1
+
+    # Fora da trava: consultas concorrentes não esperam umas pelas outras
+    resultado = calcular()
+    tamanho = _tamanho(resultado)
+
+    with _lock:
+        cache = _obter_cache()
+        if geracao != _geracao_vista:
+            return resultado
+        if tamanho > cache.maxsize // FRACAO_MAXIMA_ENTRADA:
+            _estatisticas["nao_guardados"] += 1
+        else:
+            cache[chave] = (resultado, tamanho)
+    return resultado
+
+
+def estatisticas_cache():
+    """Acertos, falhas e ocupação do cache deste worker."""
+    with _lock:
+        cache = _obter_cache()
+        consultas = _estatisticas["acertos"] + _estatisticas["falhas"]
+        return {
+            **_estatisticas,
+            "taxa_acerto": round(_estatisticas["acertos"] / consultas, 4) if consultas else None,
+            "entradas": len(cache),
+            "bytes": cache.currsize,
+            "limite_bytes": cache.maxsize,
+            "geracao": _geracao_vista,
+        }
@@ -0,0 +1,141 @@
+# app/catalogo.py
+"""
+Catálogo de dados de referência em memória — CR-NOVACAP.
+
+Status, regiões administrativas, a hierarquia Diretoria → Departamento →
+Demanda e a lista de usuários aprovados mudam raramente, mas eram relidos
+a cada cadastro, alteração, consulta e relatório. O catálogo é carregado
+em poucas consultas (uma por tabela, com a hierarquia montada em memória)
+e servido como um instantâneo imutável (tuplas de namedtuples).
+
+O instantâneo é identificado pela versão do catálogo (escopo "catalogo"
+da tabela geracoes_dados, ver app/cache_resultados.py). Quem altera esses
+dados — rotas do admin_bp, scripts de carga e migrações — chama
+nova_versao_catalogo() antes do commit; cada worker percebe a versão nova
+na requisição seguinte e recarrega o catálogo.
+"""
+
+import threading
+from collections import namedtuple
+
+from sqlalchemy import select
+
+from app.cache_resultados import geracao_atual, nova_geracao
+from app.ext import db
+from app.models.modelos import (
+    Status, RegiaoAdministrativa, Diretoria, Departamento, Demanda, Usuario
+)
+
+ESCOPO_CATALOGO = "catalogo"
+
+ItemStatus = namedtuple("ItemStatus", "id_status descricao ordem_exibicao finaliza_processo")
+ItemRA = namedtuple("ItemRA", "id_ra codigo_ra nome_ra descricao_ra")
+ItemDiretoria = namedtuple("ItemDiretoria", "id_diretoria nome_completo sigla descricao_exibicao departamentos")
+ItemDepartamento = namedtuple("ItemDepartamento", "id_departamento nome id_diretoria")
+ItemDemanda = namedtuple("ItemDemanda", "id_demanda descricao id_diretoria id_departamento departamento")
+ItemUsuario = namedtuple("ItemUsuario", "id_usuario usuario nome")
+
+Catalogo = namedtuple("Catalogo", [
+    "versao",
+    "status",               # por ordem_exibicao
+    "ras",                  # por descricao_ra
+    "diretorias",           # por descricao_exibicao, com seus departamentos
+    "departamentos",        # por nome
+    "demandas",             # por descricao, com o departamento
+    "usuarios_aprovados",   # aprovados e não bloqueados, por usuario
+])
+
+_catalogo = None
+_lock = threading.Lock()
+
+
+def nova_versao_catalogo():
+    """Invalida o catálogo de todos os workers (chamar antes do commit)."""
+    nova_geracao(ESCOPO_CATALOGO)
+
+
+def _carregar(versao):
+    """Lê as tabelas de referência (uma consulta por tabela)."""
+    def linhas(*colunas, ordem, filtros=()):
+        return db.session.execute(select(*colunas).where(*filtros).order_by(*ordem)).all()
+
+    departamentos = tuple(
+        ItemDepartamento(*linha)
+        for linha in linhas(
+            Departamento.id_departamento, Departamento.nome, Departamento.id_diretoria,
+            ordem=[Departamento.nome]
+        )
+    )
+    por_id_departamento = {d.id_departamento: d for d in departamentos}
+
+    diretorias = tuple(
+        ItemDiretoria(*linha, departamentos=tuple(d for d in departamentos if d.id_diretoria == linha[0]))
+        for linha in linhas(
+            Diretoria.id_diretoria, Diretoria.nome_completo, Diretoria.sigla, Diretoria.descricao_exibicao,
+            ordem=[Diretoria.descricao_exibicao]
+        )
+    )
+
+    demandas = tuple(
+        ItemDemanda(*linha, departamento=por_id_departamento.get(linha.id_departamento))
+        for linha in linhas(
+            Demanda.id_demanda, Demanda.descricao, Demanda.id_diretoria, Demanda.id_departamento,
+            ordem=[Demanda.descricao]
+        )
+    )
+
+    return Catalogo(
+        versao=versao,
+        status=tuple(
+            ItemStatus(*linha)
+            for linha in linhas(
+                Status.id_status, Status.descricao, Status.ordem_exibicao, Status.finaliza_processo,
+                ordem=[Status.ordem_exibicao]
+            )
+        ),
+        ras=tuple(
+            ItemRA(*linha)
+            for linha in linhas(
+                RegiaoAdministrativa.id_ra, RegiaoAdministrativa.codigo_ra,
+                RegiaoAdministrativa.nome_ra, RegiaoAdministrativa.descricao_ra,
+                ordem=[RegiaoAdministrativa.descricao_ra]
+            )
+        ),
+        diretorias=diretorias,
+        departamentos=departamentos,
+        demandas=demandas,
+        usuarios_aprovados=tuple(
+            ItemUsuario(*linha)
+            for linha in linhas(
+                Usuario.id_usuario, Usuario.usuario, Usuario.nome,
+                ordem=[Usuario.usuario],
+                filtros=[Usuario.aprovado == True, Usuario.bloqueado == False]  # noqa: E712
+            )
+        ),
+    )
+
+
+def catalogo():
+    """Instantâneo do catálogo na versão atual (recarregado só quando ela muda)."""
+    global _catalogo
+    versao = geracao_atual(ESCOPO_CATALOGO)
+    atual = _catalogo
+    if atual is not None and atual.versao == versao:
+        return atual
+
+    with _lock:
+        if _catalogo is None or _catalogo.versao != versao:
+            _catalogo = _carregar(versao)
+        return _catalogo
+
+
+# ==========================================================
+# 🔀 Ordenações alternativas usadas pelos formulários
+# ==========================================================
+def status_por_descricao(cat):
+    return tuple(sorted(cat.status, key=lambda s: s.descricao))
+
+
+def nomes_diretorias(cat):
+    """Nomes completos das diretorias, em ordem alfabética."""
+    return sorted(d.nome_completo for d in cat.diretorias)
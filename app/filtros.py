@@ -0,0 +1,86 @@
+# app/filtros.py
+"""
+Especificação dos filtros das listagens e exportações — CR-NOVACAP.
+
+Cada consulta declara seus filtros como
+    parâmetro da querystring → (conversor, condição)
+`extrair` converte a querystring (vazios e inválidos são descartados) e
+`aplicar` acrescenta as condições a uma instrução lambda_stmt.
+
+Com lambda_stmt o SQLAlchemy guarda a instrução já compilada indexada pelo
+código das lambdas, não pelos valores: os valores capturados viram
+parâmetros ligados, e cada combinação de filtros é montada e compilada uma
+única vez por processo.
+
+Regra para as condições: a estrutura do SQL dentro de uma lambda não pode
+depender do valor capturado. Quando depende (ex.: filtro por trigramas),
+a expressão é montada fora e registrada com `condicao_pronta`.
+"""
+
+from datetime import datetime
+
+
+# ==========================================================
+# 🔄 Conversores (valor da querystring → valor do filtro ou None)
+# ==========================================================
+def texto(valor):
+    """Texto sem espaços nas pontas (vazio → None)."""
+    valor = (valor or "").strip()
+    return valor or None
+
+
+def inteiro(valor):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def data(valor):
+    """AAAA-MM-DD → datetime (vazia ou inválida → None)."""
+    try:
+        return datetime.strptime(valor, "%Y-%m-%d") if valor else None
+    except (TypeError, ValueError):
+        return None
+
+
+def condicao_pronta(stmt, condicao):
+    """Acrescenta uma expressão já montada; o cache considera a estrutura dela."""
+    return stmt.add_criteria(lambda s: s.where(condicao), track_on=[condicao])
+
+
+# ==========================================================
+# 🧩 Conjunto de filtros
+# ==========================================================
+class Filtros:
+    """Filtros de uma consulta: parâmetro → (conversor, condição(stmt, valor) → stmt)."""
+
+    def __init__(self, **campos):
+        self.campos = campos
+
+    @property
+    def nomes(self):
+        return tuple(self.campos)
+
+    def extrair(self, args):
+        """Valores convertidos dos filtros preenchidos e válidos."""
+        filtros = {}
+        for nome, (converter, _) in self.campos.items():
+            valor = converter(args.get(nome))
+            if valor is not None:
+                filtros[nome] = valor
+        return filtros
+
+    def invalidos(self, args):
+        """Parâmetros preenchidos que o conversor rejeitou."""
+        return [
+            nome for nome, (converter, _) in self.campos.items()
+            if (args.get(nome) or "").strip() and converter(args.get(nome)) is None
+        ]
+
+    def aplicar(self, stmt, filtros):
+        """Acrescenta à instrução as condições dos filtros informados (sempre na mesma ordem)."""
+        for nome, (_, condicao) in self.campos.items():
+            if filtros.get(nome) is not None:
+                stmt = condicao(stmt, filtros[nome])
+        return stmt
@@ -10,6 +10,7 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from app.ext import db
 from app.models.modelos import Usuario
 from app.main import main_bp
+from app.admin.busca_usuarios import indexar_usuario
 
 
 # ==========================================================
@@ -112,6 +113,8 @@ def cadastro():
         )
 
         db.session.add(novo_usuario)
+        db.session.flush()
+        indexar_usuario(novo_usuario)
         db.session.commit()
 
         flash("✅ Cadastro enviado com sucesso. Aguarde aprovação do administrador.", "success")
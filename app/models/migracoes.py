@@ -0,0 +1,36 @@
+# app/models/migracoes.py
+"""
+Utilitários de migração leve — CR-NOVACAP.
+
+Adicionam colunas e índices declarados nos modelos que ainda não existem
+no banco (db.create_all() só cria tabelas novas). Usados pelos scripts de
+backfill em scripts/.
+"""
+
+from sqlalchemy import inspect, text
+
+from app.ext import db
+
+
+def adicionar_colunas_ausentes(modelo, *nomes_colunas):
+    """Executa ALTER TABLE ... ADD COLUMN para as colunas que faltarem."""
+    tabela = modelo.__table__
+    existentes = {c['name'] for c in inspect(db.engine).get_columns(tabela.name)}
+    adicionadas = []
+
+    for nome in nomes_colunas:
+        if nome in existentes:
+            continue
+        coluna = tabela.c[nome]
+        tipo = coluna.type.compile(dialect=db.engine.dialect)
+        db.session.execute(text(f"ALTER TABLE {tabela.name} ADD COLUMN {nome} {tipo}"))
+        adicionadas.append(nome)
+
+    db.session.commit()
+    return adicionadas
+
+
+def criar_indices_ausentes(modelo):
+    """Cria os índices declarados no modelo que ainda não existem."""
+    for indice in modelo.__table__.indexes:
+        indice.create(db.engine, checkfirst=True)
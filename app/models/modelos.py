@@ -5,8 +5,10 @@ Contém entidades de usuários, processos, protocolo, status, demandas, logs e a
 Atualizado para incluir a hierarquia Diretoria → Departamento → Demanda (corrigido).
 """
 
+import unicodedata
 from datetime import datetime
 from flask_login import UserMixin
+from sqlalchemy.orm import validates
 from app.ext import db
 
 
@@ -25,9 +27,47 @@ class Usuario(db.Model, UserMixin):
     bloqueado = db.Column(db.Boolean, default=False)
     is_admin = db.Column(db.Boolean, default=False)
 
+    # 🔎 Nome, usuário e e-mail em minúsculas e sem acentos (busca do painel admin)
+    busca_normalizada = db.Column(db.String(255))
+
+    __table_args__ = (
+        db.Index('ix_usuarios_nome_id', 'nome', 'id_usuario'),
+    )
+
     def get_id(self):
         return str(self.id_usuario)
 
+    @staticmethod
+    def normalizar_busca(*textos):
+        """Textos unidos por espaço, em minúsculas e sem acentos ('José' → 'jose')."""
+        decomposto = unicodedata.normalize('NFKD', ' '.join(t or '' for t in textos))
+        return ''.join(c for c in decomposto if not unicodedata.combining(c)).lower().strip()
+
+    @validates('nome', 'usuario', 'email')
+    def _preencher_busca_normalizada(self, chave, valor):
+        campos = {'nome': self.nome, 'usuario': self.usuario, 'email': self.email, chave: valor}
+        self.busca_normalizada = Usuario.normalizar_busca(campos['nome'], campos['usuario'], campos['email'])
+        return valor
+
+
+# ==========================================================
+# 🔤 TRIGRAMAS DA BUSCA DE USUÁRIOS
+# ----------------------------------------------------------
+# Índice invertido (trigrama → usuário) sobre busca_normalizada,
+# usado na busca do painel administrativo
+# (ver app/admin/busca_usuarios.py).
+# ==========================================================
+class UsuarioTrigrama(db.Model):
+    __tablename__ = 'usuario_trigramas'
+
+    trigrama = db.Column(db.String(3), primary_key=True)
+    id_usuario = db.Column(
+        db.Integer,
+        db.ForeignKey('usuarios.id_usuario', ondelete='CASCADE'),
+        primary_key=True,
+        index=True
+    )
+
 
 # ==========================================================
 # 🧭 DIRETORIAS
@@ -63,7 +103,8 @@ class Departamento(db.Model):
     id_diretoria = db.Column(
         db.Integer,
         db.ForeignKey('diretorias.id_diretoria'),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     # 🔁 Relação 1:N com Demandas
@@ -124,10 +165,17 @@ class Processo(db.Model):
 
     id_processo = db.Column(db.Integer, primary_key=True)
     numero_processo = db.Column(db.String(25), unique=True, nullable=False)
+    # 🔑 Chave canônica (somente dígitos) para checagem de duplicidade indexada
+    numero_normalizado = db.Column(db.String(25), unique=True, index=True)
     status_atual = db.Column(db.String(100))
     observacoes = db.Column(db.Text)
     diretoria_destino = db.Column(db.String(100), nullable=False)
 
+    # 🕒 Última movimentação (desnormalizada, mantida nas rotas de escrita)
+    # Critério: maior (data, id_movimentacao) — empates resolvidos pelo id
+    id_ultima_movimentacao = db.Column(db.Integer)
+    data_ultima_movimentacao = db.Column(db.DateTime)
+
     entradas = db.relationship(
         'EntradaProcesso',
         backref='processo',
@@ -135,6 +183,96 @@ class Processo(db.Model):
         lazy=True
     )
 
+    @staticmethod
+    def normalizar_numero(numero):
+        """Mantém apenas os dígitos do número SEI (None se não houver dígitos)."""
+        digitos = ''.join(filter(str.isdigit, numero or ''))
+        return digitos or None
+
+    @validates('numero_processo')
+    def _preencher_numero_normalizado(self, chave, numero):
+        self.numero_normalizado = Processo.normalizar_numero(numero)
+        return numero
+
+
+# ==========================================================
+# 🔤 TRIGRAMAS DO NÚMERO DE PROCESSO
+# ----------------------------------------------------------
+# Índice invertido (trigrama → processo) sobre numero_normalizado,
+# usado na busca por fragmento e no autocompletar
+# (ver app/processos/trigramas.py).
+# ==========================================================
+class ProcessoTrigrama(db.Model):
+    __tablename__ = 'processo_trigramas'
+
+    trigrama = db.Column(db.String(3), primary_key=True)
+    id_processo = db.Column(
+        db.Integer,
+        db.ForeignKey('processos.id_processo', ondelete='CASCADE'),
+        primary_key=True,
+        index=True
+    )
+
+
+# ==========================================================
+# 📚 ÍNDICE TEXTUAL (observações)
+# ----------------------------------------------------------
+# Índice invertido termo → documento, onde documento é a observação do
+# processo (id_movimentacao nulo) ou de uma movimentação
+# (ver app/processos/busca_textual.py).
+# ==========================================================
+class IndiceTextual(db.Model):
+    __tablename__ = 'indice_textual'
+
+    id_indice = db.Column(db.Integer, primary_key=True)
+    termo = db.Column(db.String(60), nullable=False)
+    id_processo = db.Column(
+        db.Integer,
+        db.ForeignKey('processos.id_processo', ondelete='CASCADE'),
+        nullable=False,
+        index=True
+    )
+    id_movimentacao = db.Column(db.Integer)
+    frequencia = db.Column(db.Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        db.Index('ix_indice_textual_termo_processo', 'termo', 'id_processo'),
+    )
+
+
+# ==========================================================
+# 🔢 CONTADORES DE PROCESSOS (status × diretoria)
+# ----------------------------------------------------------
+# Tabela-resumo mantida na mesma transação das escritas em
+# Processo (ver app/processos/contadores.py).
+# Status nulo é gravado como string vazia.
+# ==========================================================
+class ProcessoContador(db.Model):
+    __tablename__ = 'processo_contadores'
+
+    id_contador = db.Column(db.Integer, primary_key=True)
+    status_atual = db.Column(db.String(100), nullable=False, default='')
+    diretoria_destino = db.Column(db.String(100), nullable=False)
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('status_atual', 'diretoria_destino', name='uq_contador_status_diretoria'),
+    )
+
+
+# ==========================================================
+# 🔢 GERAÇÃO DOS DADOS (cache de resultados)
+# ----------------------------------------------------------
+# Contador por escopo, incrementado na mesma transação das
+# escritas; quando muda, cada worker descarta o cache
+# correspondente (ver app/cache_resultados.py).
+# ==========================================================
+class GeracaoDados(db.Model):
+    __tablename__ = 'geracoes_dados'
+
+    escopo = db.Column(db.String(50), primary_key=True)
+    geracao = db.Column(db.Integer, nullable=False, default=0)
+
 
 # ==========================================================
 # 🔁 ENTRADAS DE PROCESSO
@@ -151,7 +289,7 @@ class EntradaProcesso(db.Model):
     data_criacao_ra = db.Column(db.Date, nullable=False)
     data_entrada_novacap = db.Column(db.Date, nullable=False)
     data_documento = db.Column(db.Date, nullable=False)
-    ra_origem = db.Column(db.String(100), nullable=False)
+    ra_origem = db.Column(db.String(100), nullable=False, index=True)
 
     id_demanda = db.Column(
         db.Integer,
@@ -185,6 +323,12 @@ class EntradaProcesso(db.Model):
         lazy=True
     )
 
+    # Primeira entrada de cada processo (MIN(id_entrada) por id_processo) sem
+    # varrer a tabela: ver app/processos/consultas.py
+    __table_args__ = (
+        db.Index('ix_entradas_processo_processo_entrada', 'id_processo', 'id_entrada'),
+    )
+
 
 # ==========================================================
 # 🔄 MOVIMENTAÇÕES DE PROCESSOS
@@ -213,6 +357,12 @@ class Movimentacao(db.Model):
 
     usuario = db.relationship("Usuario", backref="movimentacoes", lazy=True)
 
+    # Ordenação/paginação por cursor do detalhamento dos relatórios
+    __table_args__ = (
+        db.Index('ix_movimentacoes_data_id', 'data', 'id_movimentacao'),
+        db.Index('ix_movimentacoes_status_id', 'novo_status', 'id_movimentacao'),
+    )
+
 
 # ==========================================================
 # 🏷️ STATUS
@@ -0,0 +1,90 @@
+# app/principais.py
+"""
+Usuário autenticado (Flask-Login) com cache — CR-NOVACAP.
+
+O user_loader roda em toda requisição autenticada. Em vez de carregar a
+linha completa de `usuarios` (inclusive senha_hash), ele usa um
+Principal leve (id, usuario, nome, is_admin, aprovado, bloqueado)
+guardado num cache com expiração (TTLCache).
+
+O cache é amarrado à versão dos usuários (escopo "usuarios" da tabela
+geracoes_dados, ver app/cache_resultados.py). Essa versão não custa uma
+consulta própria: vem da leitura única de todos os escopos que a
+requisição já faz para o catálogo e o cache de resultados. As rotas do admin_bp e os scripts que aprovam, bloqueiam,
+desbloqueiam ou concedem administração chamam nova_versao_usuarios()
+antes do commit; ao perceber a versão nova, cada worker descarta o cache
+inteiro, então a alteração vale em todos já na requisição seguinte.
+Usuário bloqueado ou não aprovado não é carregado (a sessão passa a ser
+anônima).
+"""
+
+import threading
+
+from cachetools import TTLCache
+from flask_login import UserMixin
+from sqlalchemy import select
+
+from app.cache_resultados import geracao_atual, nova_geracao
+from app.ext import db
+from app.models.modelos import Usuario
+
+ESCOPO_USUARIOS = "usuarios"
+
+TEMPO_CACHE_PRINCIPAL = 60     # segundos
+MAXIMO_PRINCIPAIS = 2048
+
+_cache = TTLCache(maxsize=MAXIMO_PRINCIPAIS, ttl=TEMPO_CACHE_PRINCIPAL)
+_versao_vista = None
+_lock = threading.Lock()
+
+
+class Principal(UserMixin):
+    """Dados do usuário necessários para autorizar a requisição."""
+
+    def __init__(self, id_usuario, usuario, nome, is_admin, aprovado, bloqueado):
+        self.id_usuario = id_usuario
+        self.usuario = usuario
+        self.nome = nome
+        self.is_admin = bool(is_admin)
+        self.aprovado = bool(aprovado)
+        self.bloqueado = bool(bloqueado)
+
+    def get_id(self):
+        return str(self.id_usuario)
+
+    @property
+    def is_active(self):
+        return self.aprovado and not self.bloqueado
+
+
+def nova_versao_usuarios():
+    """Invalida os Principals de todos os workers (chamar antes do commit)."""
+    nova_geracao(ESCOPO_USUARIOS)
+
+
+def carregar_principal(id_usuario):
+    """Principal ativo do usuário (cache → banco) ou None."""
+    global _versao_vista
+    versao = geracao_atual(ESCOPO_USUARIOS)
+
+    with _lock:
+        if versao != _versao_vista:
+            _cache.clear()
+            _versao_vista = versao
+        principal = _cache.get(id_usuario)
+
+    if principal is None:
+        linha = db.session.execute(
+            select(
+                Usuario.id_usuario, Usuario.usuario, Usuario.nome,
+                Usuario.is_admin, Usuario.aprovado, Usuario.bloqueado
+            ).where(Usuario.id_usuario == id_usuario)
+        ).first()
+        if linha is None:
+            return None
+        principal = Principal(*linha)
+        with _lock:
+            if versao == _versao_vista:
+                _cache[id_usuario] = principal
+
+    return principal if principal.is_active else None
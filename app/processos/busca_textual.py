@@ -0,0 +1,209 @@
+# app/processos/busca_textual.py
+"""
+Busca textual nas observações — CR-NOVACAP.
+
+Processo.observacoes e Movimentacao.observacao são decompostos em termos
+(minúsculos, sem acento, sem stopwords) gravados em `indice_textual` com a
+frequência de cada termo no documento. A busca exige todos os termos
+(AND) e ordena por TF-IDF: termos raros pesam mais que termos comuns.
+
+O índice é atualizado incrementalmente pelas rotas de escrita;
+scripts/indexar_textos.py reconstrói tudo.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+
+from sqlalchemy import case, func
+
+from app.ext import db
+from app.models.modelos import Processo, EntradaProcesso, Movimentacao, IndiceTextual
+
+TAMANHO_MAXIMO_TERMO = 60
+
+STOPWORDS = {
+    'a', 'ao', 'aos', 'as', 'com', 'da', 'das', 'de', 'do', 'dos', 'e', 'em',
+    'na', 'nas', 'no', 'nos', 'o', 'os', 'ou', 'para', 'pela', 'pelas', 'pelo',
+    'pelos', 'por', 'que', 'se', 'sem', 'um', 'uma', 'uns', 'umas', 'foi',
+    'ser', 'sao', 'esta', 'este', 'isso', 'mais', 'ja', 'nao',
+}
+
+_PALAVRA = re.compile(r'\w+')
+
+
+def normalizar_texto(texto):
+    """Minúsculas e sem acentos ('Pavimentação' → 'pavimentacao')."""
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in decomposto if not unicodedata.combining(c)).lower()
+
+
+def extrair_termos(texto):
+    """Contagem dos termos indexáveis de um texto."""
+    return Counter(
+        palavra[:TAMANHO_MAXIMO_TERMO]
+        for palavra in _PALAVRA.findall(normalizar_texto(texto))
+        if len(palavra) > 1 and palavra not in STOPWORDS
+    )
+
+
+def _linhas_documento(id_processo, texto, id_movimentacao=None):
+    return [
+        {
+            'termo': termo,
+            'id_processo': id_processo,
+            'id_movimentacao': id_movimentacao,
+            'frequencia': frequencia,
+        }
+        for termo, frequencia in extrair_termos(texto).items()
+    ]
+
+
+# ==========================================================
+# ✏️ Manutenção incremental (chamada pelas rotas de escrita)
+# ==========================================================
+def indexar_texto_processo(processo):
+    """Indexa Processo.observacoes (o processo já deve ter id)."""
+    linhas = _linhas_documento(processo.id_processo, processo.observacoes)
+    if linhas:
+        db.session.execute(IndiceTextual.__table__.insert(), linhas)
+
+
+def indexar_texto_movimentacao(id_processo, movimentacao):
+    """Indexa a observação de uma movimentação (já com id, após flush)."""
+    linhas = _linhas_documento(id_processo, movimentacao.observacao, movimentacao.id_movimentacao)
+    if linhas:
+        db.session.execute(IndiceTextual.__table__.insert(), linhas)
+
+
+def remover_texto_processo(id_processo):
+    """Remove do índice todos os documentos de um processo."""
+    IndiceTextual.query.filter_by(id_processo=id_processo).delete(synchronize_session=False)
+
+
+def reconstruir_indice(tamanho_lote=1000):
+    """Recria todo o índice (sem commit). Retorna o total de documentos."""
+    IndiceTextual.query.delete(synchronize_session=False)
+
+    documentos = (
+        (Processo.id_processo, False,
+         db.session.query(Processo.id_processo, Processo.id_processo, Processo.observacoes)),
+        (Movimentacao.id_movimentacao, True,
+         db.session.query(Movimentacao.id_movimentacao, EntradaProcesso.id_processo, Movimentacao.observacao)
+         .join(EntradaProcesso, EntradaProcesso.id_entrada == Movimentacao.id_entrada)),
+    )
+
+    total = 0
+    for chave, eh_movimentacao, consulta in documentos:
+        ultimo_id = 0
+        while True:
+            lote = consulta.filter(chave > ultimo_id).order_by(chave).limit(tamanho_lote).all()
+            if not lote:
+                break
+            linhas = [
+                linha
+                for id_documento, id_processo, texto in lote
+                for linha in _linhas_documento(
+                    id_processo, texto, id_documento if eh_movimentacao else None
+                )
+            ]
+            if linhas:
+                db.session.execute(IndiceTextual.__table__.insert(), linhas)
+            total += len(lote)
+            ultimo_id = lote[-1][0]
+    return total
+
+
+# ==========================================================
+# 🔍 Busca ranqueada
+# ==========================================================
+def buscar(consulta, pagina=1, por_pagina=20):
+    """
+    Processos que contêm todos os termos da consulta, ordenados por TF-IDF.
+    Retorna (resultados, total), onde cada resultado é um dict com
+    id_processo, numero_processo, status_atual, pontuacao e trecho.
+    """
+    termos = sorted(extrair_termos(consulta))
+    if not termos:
+        return [], 0
+
+    # Em quantos processos aparece cada termo (document frequency)
+    frequencias = dict(
+        db.session.query(IndiceTextual.termo, func.count(func.distinct(IndiceTextual.id_processo)))
+        .filter(IndiceTextual.termo.in_(termos))
+        .group_by(IndiceTextual.termo)
+        .all()
+    )
+    if len(frequencias) < len(termos):
+        return [], 0
+
+    total_processos = db.session.query(func.count(Processo.id_processo)).scalar() or 1
+    peso = case(
+        *[
+            (IndiceTextual.termo == termo, math.log(1 + total_processos / frequencias[termo]))
+            for termo in termos
+        ],
+        else_=0
+    )
+    pontuacao = func.sum(IndiceTextual.frequencia * peso).label('pontuacao')
+
+    encontrados = (
+        db.session.query(IndiceTextual.id_processo, pontuacao)
+        .filter(IndiceTextual.termo.in_(termos))
+        .group_by(IndiceTextual.id_processo)
+        .having(func.count(func.distinct(IndiceTextual.termo)) == len(termos))
+    )
+    total = db.session.query(func.count()).select_from(encontrados.subquery()).scalar()
+
+    pagina_atual = (
+        encontrados
+        .order_by(pontuacao.desc(), IndiceTextual.id_processo.desc())
+        .offset((pagina - 1) * por_pagina)
+        .limit(por_pagina)
+        .all()
+    )
+    if not pagina_atual:
+        return [], total
+
+    ids = [linha.id_processo for linha in pagina_atual]
+    processos = {
+        p.id_processo: p
+        for p in db.session.query(
+            Processo.id_processo, Processo.numero_processo,
+            Processo.status_atual, Processo.observacoes
+        ).filter(Processo.id_processo.in_(ids))
+    }
+    trechos = _trechos(ids, termos, processos)
+
+    return [
+        {
+            'id_processo': linha.id_processo,
+            'numero_processo': processos[linha.id_processo].numero_processo,
+            'status_atual': processos[linha.id_processo].status_atual,
+            'pontuacao': round(float(linha.pontuacao), 3),
+            'trecho': trechos.get(linha.id_processo, ''),
+        }
+        for linha in pagina_atual
+    ], total
+
+
+def _trechos(ids, termos, processos):
+    """Texto de um documento que contém algum termo, por processo (movimentação mais recente primeiro)."""
+    documentos = (
+        db.session.query(IndiceTextual.id_processo, func.max(IndiceTextual.id_movimentacao))
+        .filter(IndiceTextual.id_processo.in_(ids), IndiceTextual.termo.in_(termos))
+        .group_by(IndiceTextual.id_processo)
+        .all()
+    )
+    ids_movimentacao = [id_mov for _, id_mov in documentos if id_mov]
+    observacoes = dict(
+        db.session.query(Movimentacao.id_movimentacao, Movimentacao.observacao)
+        .filter(Movimentacao.id_movimentacao.in_(ids_movimentacao))
+        .all()
+    ) if ids_movimentacao else {}
+
+    return {
+        id_processo: (observacoes.get(id_mov) if id_mov else processos[id_processo].observacoes) or ''
+        for id_processo, id_mov in documentos
+    }
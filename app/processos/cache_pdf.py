@@ -0,0 +1,126 @@
+# app/processos/cache_pdf.py
+"""
+Cache em disco dos PDFs de processo — CR-NOVACAP.
+
+O PDF de um processo só muda quando entra uma nova movimentação (ou quando
+o layout muda), então ele é identificado por
+(id_processo, maior id_movimentacao, VERSAO_MODELO_DOSSIE). A mesma chave
+serve de ETag: um download repetido custa uma consulta de agregação e a
+leitura do arquivo, sem passar pelo reportlab.
+
+Maior id, e não Processo.id_ultima_movimentacao: esta segue a maior *data*,
+e uma movimentação retroativa não a altera.
+
+O tamanho total da pasta é limitado (TAMANHO_MAXIMO_CACHE_PDF); ao passar
+do limite, saem os arquivos usados há mais tempo (LRU pelo atime, que é
+atualizado explicitamente a cada acerto). O mtime fica sendo o momento da
+geração e vira o Last-Modified da resposta.
+"""
+
+import glob
+import os
+import time
+import uuid
+
+from flask import current_app
+from sqlalchemy import func
+
+from app.ext import db
+from app.models.modelos import Processo, EntradaProcesso, Movimentacao
+from app.processos.dossie import VERSAO_MODELO_DOSSIE
+
+TAMANHO_MAXIMO_CACHE_PDF = 200 * 1024 * 1024  # bytes
+
+
+def pasta_cache_pdf(app=None):
+    """Diretório do cache (criado se necessário)."""
+    app = app or current_app
+    pasta = app.config.get("PASTA_CACHE_PDF") or os.path.join(
+        os.path.dirname(app.root_path), "relatorios_gerados", "cache_pdf"
+    )
+    os.makedirs(pasta, exist_ok=True)
+    return pasta
+
+
+def versao_pdf_processo(id_processo):
+    """
+    Chave de versão do PDF ("<id>-<maior id de movimentação>-v<modelo>"),
+    ou None se o processo não existir.
+    """
+    linha = (
+        db.session.query(Processo.id_processo, func.max(Movimentacao.id_movimentacao))
+        .outerjoin(EntradaProcesso, EntradaProcesso.id_processo == Processo.id_processo)
+        .outerjoin(Movimentacao, Movimentacao.id_entrada == EntradaProcesso.id_entrada)
+        .filter(Processo.id_processo == id_processo)
+        .group_by(Processo.id_processo)
+        .first()
+    )
+    if linha is None:
+        return None
+    return f"{id_processo}-{linha[1] or 0}-v{VERSAO_MODELO_DOSSIE}"
+
+
+def obter_pdf(versao, gerar, pasta=None):
+    """
+    Caminho do PDF da `versao` no cache; se ausente, grava o resultado de
+    `gerar()` (bytes) e aplica o limite de tamanho.
+    """
+    pasta = pasta or pasta_cache_pdf()
+    caminho = os.path.join(pasta, f"processo_{versao}.pdf")
+
+    try:
+        agora = time.time()
+        os.utime(caminho, (agora, os.path.getmtime(caminho)))  # marca o uso, preserva o mtime
+        return caminho
+    except OSError:
+        pass
+
+    conteudo = gerar()
+    temporario = f"{caminho}.{uuid.uuid4().hex}.tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(conteudo)
+    os.replace(temporario, caminho)
+
+    # Versões anteriores do mesmo processo não serão mais pedidas
+    id_processo = versao.split("-", 1)[0]
+    for antigo in glob.glob(os.path.join(pasta, f"processo_{id_processo}-*.pdf")):
+        if antigo != caminho:
+            _remover(antigo)
+
+    limite = current_app.config.get("TAMANHO_MAXIMO_CACHE_PDF", TAMANHO_MAXIMO_CACHE_PDF)
+    podar_cache(pasta, limite)
+    return caminho
+
+
+def remover_pdf_processo(id_processo, pasta=None):
+    """Descarta os PDFs em cache de um processo (ex.: ao excluí-lo)."""
+    for caminho in glob.glob(os.path.join(pasta or pasta_cache_pdf(), f"processo_{id_processo}-*.pdf")):
+        _remover(caminho)
+
+
+def podar_cache(pasta, limite):
+    """Remove os PDFs menos usados até o total caber em `limite` bytes. Retorna quantos saíram."""
+    arquivos = []
+    for caminho in glob.glob(os.path.join(pasta, "processo_*.pdf")):
+        try:
+            info = os.stat(caminho)
+        except OSError:
+            continue
+        arquivos.append((info.st_atime, info.st_size, caminho))
+
+    total = sum(tamanho for _, tamanho, _ in arquivos)
+    removidos = 0
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= limite:
+            break
+        _remover(caminho)
+        total -= tamanho
+        removidos += 1
+    return removidos
+
+
+def _remover(caminho):
+    try:
+        os.remove(caminho)
+    except OSError:
+        pass
@@ -0,0 +1,186 @@
+# app/processos/consultas.py
+"""
+Consultas de listagem do módulo de Processos — CR-NOVACAP.
+
+A consulta unificada monta, em UM comando SQL, uma linha por processo com
+os dados da primeira entrada, a demanda e a data da última movimentação
+(coluna desnormalizada Processo.data_ultima_movimentacao). A exportação de
+tramitações usa junções externas e inclui os processos sem entrada.
+As linhas retornadas são objetos Row simples (somente leitura).
+
+As instruções são lambda_stmt com os filtros de FILTROS_PROCESSOS
+(app/filtros.py): listagem, total, exportações e dossiês compartilham o
+mesmo caminho e a mesma instrução compilada em cache.
+
+O filtro por número usa o índice de trigramas (app/processos/trigramas.py),
+já que LIKE com curinga à esquerda não aproveita índice.
+
+A paginação é por cursor (keyset) sobre id_processo: cada página custa o
+mesmo, independentemente de quantos processos já foram cadastrados. A
+primeira entrada de cada linha vem de uma subconsulta correlacionada
+(índice id_processo, id_entrada), nunca de um GROUP BY sobre todas as
+entradas (ver scripts/benchmark_consulta_processos.py).
+"""
+
+from sqlalchemy import func, select, lambda_stmt
+from sqlalchemy.orm import aliased
+
+from app.ext import db
+from app.filtros import Filtros, texto, inteiro, data, condicao_pronta
+from app.models.modelos import Processo, EntradaProcesso, Demanda
+from app.processos.trigramas import condicao_numero
+
+
+def _primeira_entrada():
+    """
+    Subconsulta correlacionada: menor id_entrada do processo da linha.
+    Resolvida pelo índice (id_processo, id_entrada) só para as linhas da
+    página, sem agrupar toda a tabela de entradas.
+    """
+    outra = aliased(EntradaProcesso)
+    return (
+        select(func.min(outra.id_entrada))
+        .where(outra.id_processo == Processo.id_processo)
+        .correlate(Processo)
+        .scalar_subquery()
+    )
+
+
+def _com_primeira_entrada(stmt, externa=False):
+    """Junta a primeira entrada; `externa` mantém os processos sem entrada."""
+    return stmt.select_from(Processo).join(
+        EntradaProcesso,
+        EntradaProcesso.id_entrada == _primeira_entrada(),
+        isouter=externa
+    )
+
+
+def _colunas_processos():
+    return (
+        Processo.id_processo,
+        Processo.numero_processo,
+        Processo.status_atual,
+        Processo.diretoria_destino,
+        Processo.data_ultima_movimentacao.label('ultima_movimentacao'),
+        EntradaProcesso.ra_origem,
+        EntradaProcesso.data_entrada_novacap,
+        EntradaProcesso.data_documento,
+        Demanda.descricao.label('demanda')
+    )
+
+
+def consulta_processos():
+    """Instrução base da listagem (sem filtros)."""
+    return lambda_stmt(lambda: _com_primeira_entrada(
+        select(*_colunas_processos())
+    ).outerjoin(Demanda, Demanda.id_demanda == EntradaProcesso.id_demanda))
+
+
+def consulta_exportacao():
+    """Instrução base da exportação de tramitações (inclui processos sem entrada)."""
+    return lambda_stmt(lambda: _com_primeira_entrada(
+        select(*_colunas_processos()), externa=True
+    ).outerjoin(Demanda, Demanda.id_demanda == EntradaProcesso.id_demanda))
+
+
+def consulta_contagem():
+    """Instrução base para o total de processos (mesmos filtros, sem colunas extras)."""
+    return lambda_stmt(lambda: _com_primeira_entrada(select(func.count(Processo.id_processo))))
+
+
+def consulta_contagem_exportacao():
+    """Total da exportação de tramitações (inclui processos sem entrada)."""
+    return lambda_stmt(lambda: _com_primeira_entrada(select(func.count(Processo.id_processo)), externa=True))
+
+
+def consulta_ids():
+    """Instrução base só com id_processo (seleção de processos para lotes)."""
+    return lambda_stmt(lambda: _com_primeira_entrada(select(Processo.id_processo)))
+
+
+# ==========================================================
+# 🔎 Filtros da consulta unificada
+# ==========================================================
+def _numero(stmt, fragmento):
+    # A estrutura da condição varia com o fragmento (nº de trigramas)
+    return condicao_pronta(stmt, condicao_numero(fragmento))
+
+
+def _status(stmt, status):
+    return stmt + (lambda s: s.where(Processo.status_atual == status))
+
+
+def _ra(stmt, ra):
+    return stmt + (lambda s: s.where(EntradaProcesso.ra_origem == ra))
+
+
+def _diretoria(stmt, diretoria):
+    return stmt + (lambda s: s.where(Processo.diretoria_destino == diretoria))
+
+
+def _demanda(stmt, id_demanda):
+    return stmt + (lambda s: s.where(EntradaProcesso.id_demanda == id_demanda))
+
+
+def _inicio(stmt, inicio):
+    return stmt + (lambda s: s.where(EntradaProcesso.data_entrada_novacap >= inicio))
+
+
+def _fim(stmt, fim):
+    return stmt + (lambda s: s.where(EntradaProcesso.data_entrada_novacap <= fim))
+
+
+FILTROS_PROCESSOS = Filtros(
+    numero_processo=(texto, _numero),
+    status=(texto, _status),
+    ra=(texto, _ra),
+    diretoria=(texto, _diretoria),
+    demanda=(inteiro, _demanda),
+    inicio=(data, _inicio),
+    fim=(data, _fim),
+)
+
+# Parâmetros da querystring aceitos pela consulta unificada
+CAMPOS_FILTRO = FILTROS_PROCESSOS.nomes
+
+
+def extrair_filtros(args):
+    """Extrai os filtros da consulta unificada a partir da querystring."""
+    return FILTROS_PROCESSOS.extrair(args)
+
+
+def filtrar_processos(stmt, filtros):
+    """Aplica os filtros da consulta unificada (já extraídos)."""
+    return FILTROS_PROCESSOS.aplicar(stmt, filtros)
+
+
+def contar_processos(filtros):
+    """Total de processos que atendem aos filtros."""
+    return db.session.execute(filtrar_processos(consulta_contagem(), filtros)).scalar()
+
+
+def contar_exportacao(filtros):
+    """Total de processos da exportação de tramitações."""
+    return db.session.execute(filtrar_processos(consulta_contagem_exportacao(), filtros)).scalar()
+
+
+# ==========================================================
+# 📄 Paginação por cursor (keyset) sobre id_processo
+# ==========================================================
+def paginar_processos(stmt, apos=None, limite=50):
+    """Retorna até `limite` linhas com id_processo menor que o cursor `apos`."""
+    if apos:
+        stmt = stmt + (lambda s: s.where(Processo.id_processo < apos))
+    stmt = stmt + (lambda s: s.order_by(Processo.id_processo.desc()).limit(limite))
+    return db.session.execute(stmt).all()
+
+
+def iterar_em_lotes(stmt, tamanho_lote=1000):
+    """Percorre toda a consulta em lotes de tamanho fixo (memória constante)."""
+    apos = None
+    while True:
+        lote = paginar_processos(stmt, apos, tamanho_lote)
+        yield from lote
+        if len(lote) < tamanho_lote:
+            return
+        apos = lote[-1].id_processo
@@ -0,0 +1,147 @@
+# app/processos/contadores.py
+"""
+Manutenção da tabela-resumo `processo_contadores` — CR-NOVACAP.
+
+Cada linha guarda quantos processos existem em um balde
+(status_atual × diretoria_destino). As rotas de escrita chamam as
+funções deste módulo ANTES do commit, de modo que contador e processo
+são gravados na mesma transação.
+
+A tabela só é usada depois de semeada por reconstruir_contadores()
+(scripts/criar_tabelas.py ou scripts/recalcular_contadores.py), que marca
+o escopo "contadores" em geracoes_dados. Até lá as escritas não mexem nela
+e o dashboard consulta `processos` direto.
+"""
+
+from sqlalchemy import func
+
+from app.cache_resultados import geracao_atual, nova_geracao
+from app.ext import db
+from app.models.modelos import Processo, ProcessoContador
+
+ESCOPO_CONTADORES = "contadores"
+
+
+def _chave(status, diretoria):
+    """Normaliza a chave do balde (status nulo vira string vazia)."""
+    return (status or '', diretoria or '')
+
+
+def contadores_completos():
+    """True se a tabela-resumo já foi semeada a partir de `processos`."""
+    return geracao_atual(ESCOPO_CONTADORES) > 0
+
+
+# ==========================================================
+# ✏️ Atualização incremental (chamada pelas rotas de escrita)
+# ==========================================================
+def _somar(status, diretoria, delta):
+    """UPDATE atômico do balde (o incremento é feito pelo banco). Retorna as linhas afetadas."""
+    return ProcessoContador.query.filter_by(
+        status_atual=status, diretoria_destino=diretoria
+    ).update(
+        {ProcessoContador.quantidade: ProcessoContador.quantidade + delta},
+        synchronize_session=False
+    )
+
+
+def ajustar_contador(status, diretoria, delta):
+    """
+    Soma `delta` ao balde (status, diretoria) na transação corrente.
+    Decrementos devem ser chamados ANTES de alterar/excluir o processo.
+    """
+    if not contadores_completos():
+        # Tabela ainda não semeada: a reconstrução contará este processo
+        return
+
+    status, diretoria = _chave(status, diretoria)
+    if _somar(status, diretoria, delta):
+        return
+
+    if delta < 0:
+        # Balde ausente para um processo existente: tabela-resumo divergente.
+        # Recria a partir de `processos` (ainda no estado anterior) e reaplica.
+        reconstruir_contadores()
+        db.session.flush()
+        if not _somar(status, diretoria, delta):
+            raise RuntimeError(
+                f"Contador ausente para ({status!r}, {diretoria!r}) mesmo após a reconstrução."
+            )
+    else:
+        db.session.add(ProcessoContador(
+            status_atual=status,
+            diretoria_destino=diretoria,
+            quantidade=delta
+        ))
+
+
+def registrar_transicao(status_anterior, status_novo, diretoria):
+    """Move um processo de um balde de status para outro."""
+    if _chave(status_anterior, diretoria) == _chave(status_novo, diretoria):
+        return
+    ajustar_contador(status_anterior, diretoria, -1)
+    ajustar_contador(status_novo, diretoria, +1)
+
+
+# ==========================================================
+# 📖 Leitura
+# ==========================================================
+def ler_contadores():
+    """Retorna {(status, diretoria): quantidade} lido da tabela-resumo."""
+    linhas = db.session.query(
+        ProcessoContador.status_atual,
+        ProcessoContador.diretoria_destino,
+        ProcessoContador.quantidade
+    ).filter(ProcessoContador.quantidade != 0).all()
+    return {(s, d): q for s, d, q in linhas}
+
+
+def recontar_processos():
+    """Recontagem completa (GROUP BY em `processos`)."""
+    linhas = db.session.query(
+        Processo.status_atual,
+        Processo.diretoria_destino,
+        func.count(Processo.id_processo)
+    ).group_by(Processo.status_atual, Processo.diretoria_destino).all()
+
+    contagem = {}
+    for status, diretoria, quantidade in linhas:
+        chave = _chave(status, diretoria)
+        contagem[chave] = contagem.get(chave, 0) + quantidade
+    return contagem
+
+
+# ==========================================================
+# 🛠 Verificação e reconstrução
+# ==========================================================
+def verificar_contadores():
+    """
+    Compara a tabela-resumo com uma recontagem completa.
+    Retorna a lista de divergências: (status, diretoria, contador, real).
+    """
+    contadores = ler_contadores()
+    reais = recontar_processos()
+
+    divergencias = []
+    for chave in sorted(set(contadores) | set(reais)):
+        contador = contadores.get(chave, 0)
+        real = reais.get(chave, 0)
+        if contador != real:
+            divergencias.append((chave[0], chave[1], contador, real))
+    return divergencias
+
+
+def reconstruir_contadores():
+    """
+    Apaga e recria a tabela-resumo a partir de `processos` e a marca como
+    completa (sem commit).
+    """
+    ProcessoContador.query.delete(synchronize_session=False)
+    for (status, diretoria), quantidade in recontar_processos().items():
+        db.session.add(ProcessoContador(
+            status_atual=status,
+            diretoria_destino=diretoria,
+            quantidade=quantidade
+        ))
+
+    nova_geracao(ESCOPO_CONTADORES)
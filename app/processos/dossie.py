@@ -0,0 +1,263 @@
+# app/processos/dossie.py
+"""
+Dossiês de processos em PDF — CR-NOVACAP.
+
+Os dados de um lote de processos (processo, primeira entrada com a demanda,
+movimentações com o nome do responsável) são carregados em três consultas
+e convertidos em dicionários simples. A renderização é uma função pura
+sobre esses dicionários, o que permite distribuí-la num pool de processos
+e gravar os PDFs num ZIP à medida que ficam prontos.
+
+Folha de estilos, estilos de tabela e o logo (já decodificado) são
+criados uma vez por processo e reaproveitados em todos os PDFs.
+
+Cada worker web tem no máximo um pool, pequeno (PROCESSOS_DOSSIE na
+configuração, padrão 2), criado sob trava no primeiro uso e encerrado na
+saída do worker.
+"""
+
+import atexit
+import os
+import re
+import threading
+from functools import lru_cache
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from flask import current_app
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Flowable
+
+from app.ext import db
+from app.models.modelos import Processo, EntradaProcesso, Movimentacao, Usuario, Demanda
+from app.relatorios.pdf import configurar_reportlab
+
+# Processos carregados por lote (3 consultas por lote)
+TAMANHO_LOTE_DOSSIE = 200
+
+# Dossiês enviados de uma vez a cada processo do pool
+DOSSIES_POR_ENVIO = 8
+
+# Processos do pool por worker web (1 → renderização no próprio worker)
+PROCESSOS_DOSSIE = 2
+
+# Incrementar ao alterar o layout: invalida os PDFs em cache (app/processos/cache_pdf.py)
+VERSAO_MODELO_DOSSIE = 1
+
+CAMINHO_LOGO = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "images", "logo-novacap.png"
+)
+LARGURA_LOGO = 80
+
+_ESTILOS = getSampleStyleSheet()
+
+ESTILO_GRADE = TableStyle([('GRID', (0, 0), (-1, -1), 0.25, colors.grey)])
+
+ESTILO_HISTORICO = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#004A8F")),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+])
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# ==========================================================
+# 📥 Carga em lote
+# ==========================================================
+def carregar_dossies(ids):
+    """Dados dos dossiês (dicts na ordem de `ids`) em três consultas."""
+    processos = {
+        p.id_processo: {
+            "id_processo": p.id_processo,
+            "numero_processo": p.numero_processo,
+            "status_atual": p.status_atual,
+            "diretoria_destino": p.diretoria_destino,
+            "observacoes": p.observacoes,
+            "entrada": None,
+            "movimentacoes": [],
+        }
+        for p in db.session.query(
+            Processo.id_processo, Processo.numero_processo, Processo.status_atual,
+            Processo.diretoria_destino, Processo.observacoes
+        ).filter(Processo.id_processo.in_(ids))
+    }
+
+    # Primeira entrada de cada processo (com a demanda)
+    entradas = (
+        db.session.query(
+            EntradaProcesso.id_entrada, EntradaProcesso.id_processo,
+            EntradaProcesso.ra_origem, EntradaProcesso.data_entrada_novacap,
+            Demanda.descricao.label("demanda")
+        )
+        .outerjoin(Demanda, Demanda.id_demanda == EntradaProcesso.id_demanda)
+        .filter(EntradaProcesso.id_processo.in_(ids))
+        .order_by(EntradaProcesso.id_entrada)
+    )
+    processo_da_entrada = {}
+    for e in entradas:
+        dossie = processos[e.id_processo]
+        if dossie["entrada"] is None:
+            dossie["entrada"] = {
+                "ra_origem": e.ra_origem,
+                "data_entrada": e.data_entrada_novacap.strftime("%d/%m/%Y") if e.data_entrada_novacap else None,
+                "demanda": e.demanda,
+            }
+            processo_da_entrada[e.id_entrada] = e.id_processo
+
+    if processo_da_entrada:
+        movimentacoes = (
+            db.session.query(
+                Movimentacao.id_entrada, Movimentacao.data, Movimentacao.novo_status,
+                Movimentacao.observacao, Usuario.nome
+            )
+            .outerjoin(Usuario, Usuario.id_usuario == Movimentacao.id_usuario)
+            .filter(Movimentacao.id_entrada.in_(list(processo_da_entrada)))
+            .order_by(Movimentacao.data.asc(), Movimentacao.id_movimentacao.asc())
+        )
+        for m in movimentacoes:
+            processos[processo_da_entrada[m.id_entrada]]["movimentacoes"].append((
+                m.data.strftime("%d/%m/%Y") if m.data else "---",
+                m.novo_status or "---",
+                m.nome or "---",
+                m.observacao or "---",
+            ))
+
+    return [processos[i] for i in ids if i in processos]
+
+
+# ==========================================================
+# 🖨 Renderização (função pura: executável em outro processo)
+# ==========================================================
+@lru_cache(maxsize=1)
+def _logo():
+    """Logo decodificado uma única vez por processo (None se o arquivo não existir)."""
+    if not os.path.exists(CAMINHO_LOGO):
+        return None
+    imagem = ImageReader(CAMINHO_LOGO)
+    imagem.getRGBData()  # decodifica agora; o ImageReader guarda os pixels
+    return imagem
+
+
+class _Logo(Flowable):
+    """Desenha o logo em cache direto no canvas (Image exigiria reabrir o arquivo)."""
+
+    def __init__(self, imagem, largura):
+        super().__init__()
+        largura_original, altura_original = imagem.getSize()
+        self.imagem = imagem
+        self.largura = largura
+        self.altura = largura * altura_original / largura_original
+
+    def wrap(self, *args):
+        return self.largura, self.altura
+
+    def draw(self):
+        self.canv.drawImage(self.imagem, 0, 0, self.largura, self.altura, mask='auto')
+
+
+def renderizar_dossie(dossie):
+    """PDF (bytes) do dossiê de um processo."""
+    output = BytesIO()
+    doc = SimpleDocTemplate(output, pagesize=A4)
+    elements = []
+
+    logo = _logo()
+    if logo is not None:
+        elements.append(_Logo(logo, LARGURA_LOGO))
+
+    elements += [
+        Paragraph("<b>Relatório Institucional de Processo</b>", _ESTILOS['Title']),
+        Spacer(1, 12),
+    ]
+
+    table = Table([
+        ["Número do Processo", dossie["numero_processo"]],
+        ["Status Atual", dossie["status_atual"] or "---"],
+        ["Diretoria de Destino", dossie["diretoria_destino"] or "---"],
+        ["Observações", dossie["observacoes"] or "---"],
+    ], colWidths=[160, 370])
+    table.setStyle(ESTILO_GRADE)
+    elements += [table, Spacer(1, 12)]
+
+    entrada = dossie["entrada"]
+    if entrada:
+        t2 = Table([
+            ["RA de Origem", entrada["ra_origem"] or "---"],
+            ["Data de Entrada", entrada["data_entrada"] or "---"],
+            ["Demanda", entrada["demanda"] or "---"],
+        ], colWidths=[200, 330])
+        t2.setStyle(ESTILO_GRADE)
+        elements += [Paragraph("<b>Informações da Entrada</b>", _ESTILOS['Heading2']), t2, Spacer(1, 12)]
+
+    elements.append(Paragraph("<b>Histórico de Movimentações</b>", _ESTILOS['Heading2']))
+    if dossie["movimentacoes"]:
+        t3 = Table(
+            [["Data", "Status", "Responsável", "Observação"]] + [list(m) for m in dossie["movimentacoes"]],
+            repeatRows=1, colWidths=[80, 120, 120, 210]
+        )
+        t3.setStyle(ESTILO_HISTORICO)
+        elements.append(t3)
+    else:
+        elements.append(Paragraph("Nenhuma movimentação registrada.", _ESTILOS['Normal']))
+
+    doc.build(elements)
+    return output.getvalue()
+
+
+def nome_arquivo_dossie(numero_processo):
+    """Nome do PDF do processo (sem caracteres inválidos em arquivos)."""
+    return f"Processo_{re.sub(r'[^0-9A-Za-z._-]', '_', numero_processo)}.pdf"
+
+
+# ==========================================================
+# 🗜 ZIP com vários dossiês
+# ==========================================================
+def _pool_processos():
+    """Pool de processos compartilhado (None → renderização no próprio processo)."""
+    global _pool
+    trabalhadores = current_app.config.get("PROCESSOS_DOSSIE", PROCESSOS_DOSSIE)
+    if trabalhadores <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=trabalhadores, initializer=configurar_reportlab)
+            atexit.register(_encerrar_pool)
+        return _pool
+
+
+def _encerrar_pool():
+    """Encerra o pool na saída do worker (sem esperar renderizações pendentes)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def gerar_zip_dossies(ids_processos, tamanho_lote=TAMANHO_LOTE_DOSSIE):
+    """
+    Renderiza os dossiês dos ids informados e grava cada PDF no ZIP assim
+    que fica pronto. Devolve um arquivo temporário posicionado no início.
+    """
+    pool = _pool_processos()
+
+    arquivo = tempfile.TemporaryFile()
+    with zipfile.ZipFile(arquivo, "w", compression=zipfile.ZIP_DEFLATED) as pacote:
+        for inicio in range(0, len(ids_processos), tamanho_lote):
+            dossies = carregar_dossies(ids_processos[inicio:inicio + tamanho_lote])
+            if pool:
+                pdfs = pool.map(renderizar_dossie, dossies, chunksize=DOSSIES_POR_ENVIO)
+            else:
+                pdfs = map(renderizar_dossie, dossies)
+            for dossie, pdf in zip(dossies, pdfs):
+                pacote.writestr(nome_arquivo_dossie(dossie["numero_processo"]), pdf)
+
+    arquivo.seek(0)
+    return arquivo
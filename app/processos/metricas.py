@@ -0,0 +1,157 @@
+# app/processos/metricas.py
+"""
+Motor de métricas do Painel de Controle de Processos — CR-NOVACAP.
+
+Todos os indicadores do dashboard ficam definidos em uma única tabela
+(INDICADORES_DASHBOARD). Como todos dependem apenas de status_atual e
+diretoria_destino, são avaliados com agregação condicional
+(SUM(CASE WHEN ... END)) sobre a tabela-resumo `processo_contadores` (uma
+linha por balde, ponderada pela quantidade). Enquanto ela não tiver sido
+semeada (contadores_completos), a mesma agregação roda sobre `processos`. As condições são sempre SQL, então
+os dois caminhos seguem a mesma collation (sem diferença de maiúsculas).
+
+A "versão dos dados" (maior id de movimentação + total de processos) muda a
+cada cadastro, alteração ou exclusão e serve de base para o ETag da API.
+"""
+
+from sqlalchemy import case, func
+
+from app.ext import db
+from app.models.modelos import Processo, Movimentacao, ProcessoContador
+from app.processos.contadores import contadores_completos
+
+
+# ==========================================================
+# 📋 Status considerados "em atendimento" na NOVACAP
+# ==========================================================
+STATUS_EM_ATENDIMENTO = (
+    'Enviado à Diretoria das Cidades',
+    'Enviado à Diretoria de Obras',
+    'Enviado à Diretoria de Planejamento e Projetos',
+    'Enviado à Diretoria de Suporte',
+    'Solicitação de urgência',
+    'Solicitação de prazo de execução',
+)
+
+# ==========================================================
+# 🧮 Tabela de indicadores do dashboard
+# ----------------------------------------------------------
+# (chave no template, coluna de Processo, operador, valor)
+# Operadores aceitos: 'igual', 'contem', 'prefixo', 'em'
+# ==========================================================
+INDICADORES_DASHBOARD = (
+    # === Diretoria de Destino ===
+    ('processos_dc', 'diretoria_destino', 'contem', 'Cidades'),
+    ('processos_do', 'diretoria_destino', 'contem', 'Obras'),
+    ('processos_dp', 'diretoria_destino', 'contem', 'Planejamento'),
+    ('processos_ds', 'diretoria_destino', 'contem', 'Suporte'),
+    ('processos_sgia', 'diretoria_destino', 'contem', 'SGIA'),
+    ('processos_ext', 'diretoria_destino', 'contem', 'EXT'),
+
+    # === Situação dos Processos ===
+    ('processos_atendidos', 'status_atual', 'igual', 'Atendido'),
+    ('devolvidos_ra', 'status_atual', 'prefixo', 'Devolvido à RA'),
+    ('processos_improcedentes', 'status_atual', 'prefixo', 'Improcedente'),
+
+    # === Especiais ===
+    ('processos_urgentes', 'status_atual', 'igual', 'Solicitação de urgência'),
+    ('processos_prazo_execucao', 'status_atual', 'igual', 'Solicitação de prazo de execução'),
+    ('processos_ouvidoria', 'status_atual', 'igual', 'Processo oriundo de Ouvidoria'),
+
+    # === Em atendimento (ativos na NOVACAP) ===
+    ('total_em_atendimento', 'status_atual', 'em', STATUS_EM_ATENDIMENTO),
+)
+
+# ==========================================================
+# ➕ Indicadores derivados (soma de outros indicadores)
+# ==========================================================
+INDICADORES_DERIVADOS = {
+    'processos_encerrados': ('processos_atendidos', 'processos_improcedentes', 'devolvidos_ra'),
+}
+
+
+def _condicao(modelo, coluna, operador, valor):
+    """Converte uma linha da tabela de indicadores em expressão SQL."""
+    campo = getattr(modelo, coluna)
+    if operador == 'igual':
+        return campo == valor
+    if operador == 'contem':
+        return campo.like(f"%{valor}%")
+    if operador == 'prefixo':
+        return campo.like(f"{valor}%")
+    if operador == 'em':
+        return campo.in_(valor)
+    raise ValueError(f"Operador de indicador desconhecido: {operador}")
+
+
+def _indicadores(modelo, peso):
+    """Colunas SUM(CASE WHEN ... THEN peso ELSE 0 END), uma por indicador."""
+    return [
+        func.sum(case((_condicao(modelo, coluna, operador, valor), peso), else_=0)).label(chave)
+        for chave, coluna, operador, valor in INDICADORES_DASHBOARD
+    ]
+
+
+def _montar_metricas(linha):
+    metricas = {chave: int(linha[chave] or 0) for chave in linha.keys()}
+    for chave, componentes in INDICADORES_DERIVADOS.items():
+        metricas[chave] = sum(metricas[c] for c in componentes)
+    return metricas
+
+
+def metricas_por_consulta():
+    """Calcula todos os indicadores em uma única consulta sobre `processos`."""
+    linha = db.session.query(
+        func.count(Processo.id_processo).label('total_processos'),
+        *_indicadores(Processo, 1)
+    ).one()._mapping
+    return _montar_metricas(linha)
+
+
+def metricas_por_contadores():
+    """
+    Calcula os indicadores em uma única consulta sobre `processo_contadores`
+    (mesmas condições SQL, ponderadas pela quantidade de cada balde).
+    Retorna None se a tabela-resumo estiver vazia.
+    """
+    linha = db.session.query(
+        func.count(ProcessoContador.id_contador).label('baldes'),
+        func.sum(ProcessoContador.quantidade).label('total_processos'),
+        *_indicadores(ProcessoContador, ProcessoContador.quantidade)
+    ).filter(ProcessoContador.quantidade != 0).one()._mapping
+
+    if not linha['baldes']:
+        return None
+    metricas = _montar_metricas(linha)
+    del metricas['baldes']
+    return metricas
+
+
+def calcular_metricas_dashboard():
+    """Indicadores do dashboard (tabela-resumo; consulta única como reserva)."""
+    metricas = metricas_por_contadores() if contadores_completos() else None
+    if metricas is None:
+        metricas = metricas_por_consulta()
+    return metricas
+
+
+# ==========================================================
+# 🏷 Versão dos dados (base do ETag da API de métricas)
+# ==========================================================
+_ultimo_calculo = {'versao': None, 'metricas': None}
+
+
+def versao_dados():
+    """Retorna 'maior_id_movimentacao-total_processos' em uma única consulta."""
+    ultima_mov = db.session.query(func.max(Movimentacao.id_movimentacao)).scalar_subquery()
+    total = db.session.query(func.count(Processo.id_processo)).scalar_subquery()
+    ultimo_id, quantidade = db.session.query(ultima_mov, total).one()
+    return f"{ultimo_id or 0}-{quantidade or 0}"
+
+
+def metricas_da_versao(versao):
+    """Indicadores da versão informada; recalcula só quando a versão muda."""
+    if _ultimo_calculo['versao'] != versao:
+        _ultimo_calculo['metricas'] = calcular_metricas_dashboard()
+        _ultimo_calculo['versao'] = versao
+    return _ultimo_calculo['metricas']
@@ -0,0 +1,81 @@
+# app/processos/movimentacoes.py
+"""
+Última movimentação desnormalizada em Processo — CR-NOVACAP.
+
+Processo.id_ultima_movimentacao / data_ultima_movimentacao apontam para a
+movimentação de maior (data, id_movimentacao) do processo. O desempate pelo
+id torna o resultado determinístico quando duas movimentações têm a mesma data.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import func, select, update
+
+from app.ext import db
+from app.models.modelos import Processo, EntradaProcesso, Movimentacao
+
+
+def _como_datetime(valor):
+    """Movimentacao.data pode chegar como date (cadastro); normaliza para datetime."""
+    if isinstance(valor, datetime) or valor is None:
+        return valor
+    if isinstance(valor, date):
+        return datetime(valor.year, valor.month, valor.day)
+    return valor
+
+
+# ==========================================================
+# ✏️ Atualização incremental (chamada pelas rotas de escrita)
+# ==========================================================
+def registrar_ultima_movimentacao(processo, movimentacao):
+    """
+    Atualiza a última movimentação do processo se `movimentacao` for mais
+    recente que a atual. A movimentação já deve ter id (após flush).
+    """
+    nova = (_como_datetime(movimentacao.data), movimentacao.id_movimentacao)
+    atual = (processo.data_ultima_movimentacao, processo.id_ultima_movimentacao)
+
+    if atual[0] is None or nova > (_como_datetime(atual[0]), atual[1] or 0):
+        processo.data_ultima_movimentacao = nova[0]
+        processo.id_ultima_movimentacao = nova[1]
+
+
+# ==========================================================
+# 🛠 Backfill completo
+# ==========================================================
+def recalcular_ultimas_movimentacoes(tamanho_lote=1000):
+    """Recalcula as colunas para todos os processos (sem commit). Retorna o total."""
+    ordem = func.row_number().over(
+        partition_by=EntradaProcesso.id_processo,
+        order_by=(Movimentacao.data.desc(), Movimentacao.id_movimentacao.desc())
+    ).label('ordem')
+
+    movs = (
+        select(
+            EntradaProcesso.id_processo,
+            Movimentacao.id_movimentacao,
+            Movimentacao.data,
+            ordem
+        )
+        .join(EntradaProcesso, EntradaProcesso.id_entrada == Movimentacao.id_entrada)
+        .subquery()
+    )
+    ultimas = db.session.execute(
+        select(movs.c.id_processo, movs.c.id_movimentacao, movs.c.data)
+        .where(movs.c.ordem == 1)
+    ).all()
+
+    # UPDATE em lote por chave primária
+    total = 0
+    for inicio in range(0, len(ultimas), tamanho_lote):
+        lote = [
+            {
+                'id_processo': id_processo,
+                'id_ultima_movimentacao': id_movimentacao,
+                'data_ultima_movimentacao': data,
+            }
+            for id_processo, id_movimentacao, data in ultimas[inicio:inicio + tamanho_lote]
+        ]
+        db.session.execute(update(Processo), lote)
+        total += len(lote)
+    return total
@@ -9,29 +9,56 @@ Atualizado em 2025-11-05:
  - Comentários e padronização de código
 """
 
-import os
 from datetime import datetime
-from io import BytesIO
-import pandas as pd
 
 from flask import (
     render_template, request, redirect, url_for, flash,
-    send_file, jsonify, current_app
+    send_file, jsonify, current_app, abort, Response, stream_with_context
 )
 from flask_login import login_required
 
 from app.ext import db, csrf
-from app.models.modelos import (
-    Processo, EntradaProcesso, Demanda, RegiaoAdministrativa,
-    Status, Usuario, Movimentacao, Diretoria, Alerta
-)
+from app.cache_resultados import em_cache, nova_geracao
+from app.catalogo import catalogo, status_por_descricao, nomes_diretorias
+from app.models.modelos import Processo, EntradaProcesso, Movimentacao, Alerta
 from app.processos import processos_bp
+from app.processos.metricas import calcular_metricas_dashboard, versao_dados, metricas_da_versao
+from app.processos.contadores import ajustar_contador, registrar_transicao
+from app.processos.movimentacoes import registrar_ultima_movimentacao
+from app.processos.trigramas import indexar_processo, remover_processo, autocompletar_numero
+from app.processos.busca_textual import (
+    indexar_texto_processo, indexar_texto_movimentacao, remover_texto_processo, buscar
+)
+from app.processos.dossie import (
+    carregar_dossies, renderizar_dossie, nome_arquivo_dossie, gerar_zip_dossies
+)
+from app.processos.cache_pdf import versao_pdf_processo, obter_pdf, remover_pdf_processo
+from app.processos.consultas import (
+    consulta_processos, consulta_exportacao, consulta_ids, contar_processos,
+    filtrar_processos, extrair_filtros, paginar_processos, iterar_em_lotes
+)
+from app.relatorios.exportacao import (
+    COLUNAS_TRAMITACOES, MIMETYPE_XLSX, FORMATOS_COLUNARES,
+    linhas_tramitacoes, gerar_csv, gerar_xlsx, gerar_colunar
+)
+from app.relatorios.pdf import gerar_pdf
+
+# Paginação da consulta unificada
+POR_PAGINA_PADRAO = 50
+POR_PAGINA_MAXIMO = 200
+
+# Quantidade máxima de números por chamada de verificação em lote
+LIMITE_VERIFICACAO_LOTE = 500
+
+# Sugestões do autocompletar de número de processo
+LIMITE_AUTOCOMPLETAR = 10
+LIMITE_AUTOCOMPLETAR_MAXIMO = 50
 
-# Bibliotecas para PDF
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
+# Resultados por página da busca textual
+POR_PAGINA_BUSCA = 20
+
+# Máximo de dossiês por ZIP (acima disso, refinar os filtros)
+LIMITE_DOSSIES = 1000
 
 
 # ==========================================================
@@ -41,61 +68,27 @@ from reportlab.lib.styles import getSampleStyleSheet
 @login_required
 def dashboard_processos():
     """Painel de Controle — Processos SEI tramitando pela CR/NOVACAP"""
+    # Todos os indicadores em uma única consulta (ver app/processos/metricas.py)
+    metricas = calcular_metricas_dashboard()
+    return render_template('dashboard_processos.html', **metricas)
 
-    # === Totais Gerais ===
-    total_processos = Processo.query.count()
-
-    # === Diretoria de Destino ===
-    processos_dc = Processo.query.filter(Processo.diretoria_destino.like('%Cidades%')).count()
-    processos_do = Processo.query.filter(Processo.diretoria_destino.like('%Obras%')).count()
-    processos_dp = Processo.query.filter(Processo.diretoria_destino.like('%Planejamento%')).count()
-    processos_ds = Processo.query.filter(Processo.diretoria_destino.like('%Suporte%')).count()
-    processos_sgia = Processo.query.filter(Processo.diretoria_destino.like('%SGIA%')).count()
-    processos_ext = Processo.query.filter(Processo.diretoria_destino.like('%EXT%')).count()
-
-    # === Situação dos Processos ===
-    processos_atendidos = Processo.query.filter_by(status_atual='Atendido').count()
-    devolvidos_ra = Processo.query.filter(Processo.status_atual.like('Devolvido à RA%')).count()
-    processos_improcedentes = Processo.query.filter(Processo.status_atual.like('Improcedente%')).count()
-
-    # === Especiais ===
-    processos_urgentes = Processo.query.filter_by(status_atual='Solicitação de urgência').count()
-    processos_prazo_execucao = Processo.query.filter_by(status_atual='Solicitação de prazo de execução').count()
-    processos_ouvidoria = Processo.query.filter_by(status_atual='Processo oriundo de Ouvidoria').count()
-
-    # === Em atendimento (ativos na NOVACAP) ===
-    processos_em_atendimento = Processo.query.filter(
-        Processo.status_atual.in_([
-            'Enviado à Diretoria das Cidades',
-            'Enviado à Diretoria de Obras',
-            'Enviado à Diretoria de Planejamento e Projetos',
-            'Enviado à Diretoria de Suporte',
-            'Solicitação de urgência',
-            'Solicitação de prazo de execução'
-        ])
-    ).count()
-
-    # === Encerrados (resultado final) ===
-    processos_encerrados = processos_atendidos + processos_improcedentes + devolvidos_ra
 
-    return render_template(
-        'dashboard_processos.html',
-        total_processos=total_processos,
-        total_em_atendimento=processos_em_atendimento,
-        processos_dc=processos_dc,
-        processos_do=processos_do,
-        processos_dp=processos_dp,
-        processos_ds=processos_ds,
-        processos_sgia=processos_sgia,
-        processos_ext=processos_ext,
-        processos_atendidos=processos_atendidos,
-        devolvidos_ra=devolvidos_ra,
-        processos_improcedentes=processos_improcedentes,
-        processos_encerrados=processos_encerrados,
-        processos_urgentes=processos_urgentes,
-        processos_prazo_execucao=processos_prazo_execucao,
-        processos_ouvidoria=processos_ouvidoria
-    )
+@processos_bp.route('/api/metricas')
+@login_required
+def api_metricas():
+    """Indicadores do dashboard em JSON, com ETag forte e GET condicional"""
+    versao = versao_dados()
+    etag = f"metricas-{versao}"
+
+    # Nada mudou desde a última leitura do cliente: responde 304 sem recalcular
+    if request.if_none_match.contains(etag):
+        resposta = current_app.response_class(status=304)
+    else:
+        resposta = jsonify({'versao': versao, 'metricas': metricas_da_versao(versao)})
+
+    resposta.set_etag(etag)
+    resposta.headers['Cache-Control'] = 'private, no-cache'
+    return resposta
 
 
 # ==========================================================
@@ -108,10 +101,13 @@ def cadastro_processo():
     if request.method == 'POST':
         numero = request.form.get('numero_processo', '').strip().replace(' ', '').replace('\u200b', '')
 
-        # Verifica duplicidade
-        existente = Processo.query.filter(
-            db.func.replace(Processo.numero_processo, ' ', '') == numero
-        ).first()
+        # Verifica duplicidade (busca indexada pela chave somente-dígitos)
+        numero_normalizado = Processo.normalizar_numero(numero)
+        if not numero_normalizado:
+            flash("❌ Informe um número de processo válido.", "danger")
+            return redirect(url_for('processos_bp.cadastro_processo'))
+
+        existente = Processo.query.filter_by(numero_normalizado=numero_normalizado).first()
 
         if existente:
             flash(f"⚠ O processo {numero} já está cadastrado no sistema.", "warning")
@@ -130,6 +126,9 @@ def cadastro_processo():
             )
             db.session.add(novo)
             db.session.flush()
+            ajustar_contador(novo.status_atual, novo.diretoria_destino, +1)
+            indexar_processo(novo)
+            indexar_texto_processo(novo)
 
             entrada = EntradaProcesso(
                 id_processo=novo.id_processo,
@@ -152,6 +151,10 @@ def cadastro_processo():
                 data=data_documento
             )
             db.session.add(primeira_mov)
+            db.session.flush()
+            registrar_ultima_movimentacao(novo, primeira_mov)
+            indexar_texto_movimentacao(novo.id_processo, primeira_mov)
+            nova_geracao()
             db.session.commit()
 
             flash(f"✅ Processo {numero} cadastrado com sucesso!", "success")
@@ -162,19 +165,15 @@ def cadastro_processo():
             flash(f"❌ Erro ao cadastrar processo: {str(e)}", "danger")
             return redirect(url_for('processos_bp.cadastro_processo'))
 
-    regioes = RegiaoAdministrativa.query.order_by(RegiaoAdministrativa.descricao_ra.asc()).all()
-    demandas = Demanda.query.order_by(Demanda.descricao.asc()).all()
-    status = Status.query.order_by(Status.descricao.asc()).all()
-    usuarios = Usuario.query.filter_by(aprovado=True, bloqueado=False).order_by(Usuario.usuario.asc()).all()
-    diretorias = Diretoria.query.order_by(Diretoria.nome_completo.asc()).all()
+    cat = catalogo()
 
     return render_template(
         'cadastro_processo.html',
-        regioes=regioes,
-        demandas=demandas,
-        status=status,
-        usuarios=usuarios,
-        diretorias=[d.nome_completo for d in diretorias]
+        regioes=cat.ras,
+        demandas=cat.demandas,
+        status=status_por_descricao(cat),
+        usuarios=cat.usuarios_aprovados,
+        diretorias=nomes_diretorias(cat)
     )
 
 
@@ -203,7 +202,12 @@ def alterar_processo(id_processo):
                 data=data_movimentacao
             )
             db.session.add(nova_mov)
+            db.session.flush()
+            registrar_ultima_movimentacao(processo, nova_mov)
+            indexar_texto_movimentacao(processo.id_processo, nova_mov)
+            registrar_transicao(processo.status_atual, novo_status, processo.diretoria_destino)
             processo.status_atual = novo_status
+            nova_geracao()
             db.session.commit()
 
             flash("✅ Movimentação registrada com sucesso!", "success")
@@ -214,14 +218,13 @@ def alterar_processo(id_processo):
             flash(f"❌ Erro ao atualizar processo: {str(e)}", "danger")
             return redirect(url_for('processos_bp.alterar_processo', id_processo=id_processo))
 
-    usuarios = Usuario.query.filter_by(aprovado=True, bloqueado=False).order_by(Usuario.usuario.asc()).all()
-    status = Status.query.order_by(Status.descricao.asc()).all()
+    cat = catalogo()
 
     return render_template(
         'alterar_processo.html',
         processo=processo,
-        usuarios=usuarios,
-        status=status
+        usuarios=cat.usuarios_aprovados,
+        status=status_por_descricao(cat)
     )
 
 
@@ -243,7 +246,12 @@ def excluir_processo(id_processo):
             db.session.delete(entrada)
 
         numero_processo = processo.numero_processo
+        ajustar_contador(processo.status_atual, processo.diretoria_destino, -1)
+        remover_processo(id_processo)
+        remover_texto_processo(id_processo)
+        remover_pdf_processo(id_processo)
         db.session.delete(processo)
+        nova_geracao()
         db.session.commit()
 
         flash(f"✅ Processo {numero_processo} excluído com sucesso!", "success")
@@ -261,63 +269,92 @@ def excluir_processo(id_processo):
 @processos_bp.route('/consultar', methods=['GET'])
 @login_required
 def consultar_processos():
-    """Consulta unificada de processos"""
-    numero = request.args.get('numero_processo', '').strip()
-    status_filtro = request.args.get('status')
-    ra = request.args.get('ra')
-    diretoria = request.args.get('diretoria')
-    demanda = request.args.get('demanda')
-    inicio = request.args.get('inicio')
-    fim = request.args.get('fim')
-
-    query = db.session.query(Processo).join(EntradaProcesso)
-
-    if numero:
-        query = query.filter(Processo.numero_processo.like(f"%{numero}%"))
-    if status_filtro:
-        query = query.filter(Processo.status_atual == status_filtro)
-    if ra:
-        query = query.filter(EntradaProcesso.ra_origem == ra)
-    if diretoria:
-        query = query.filter(Processo.diretoria_destino == diretoria)
-    if demanda:
-        query = query.filter(EntradaProcesso.id_demanda == demanda)
-    if inicio and fim:
-        inicio_dt = datetime.strptime(inicio, "%Y-%m-%d")
-        fim_dt = datetime.strptime(fim, "%Y-%m-%d")
-        query = query.filter(EntradaProcesso.data_entrada_novacap.between(inicio_dt, fim_dt))
-    elif inicio:
-        inicio_dt = datetime.strptime(inicio, "%Y-%m-%d")
-        query = query.filter(EntradaProcesso.data_entrada_novacap >= inicio_dt)
-    elif fim:
-        fim_dt = datetime.strptime(fim, "%Y-%m-%d")
-        query = query.filter(EntradaProcesso.data_entrada_novacap <= fim_dt)
-
-    processos = query.order_by(Processo.id_processo.desc()).all()
-
-    if not processos:
+    """Consulta unificada de processos (paginada por cursor)"""
+    filtros = extrair_filtros(request.args)
+    apos = request.args.get('apos', type=int)
+    por_pagina = min(max(request.args.get('por_pagina', POR_PAGINA_PADRAO, type=int), 1), POR_PAGINA_MAXIMO)
+
+    # Uma única consulta: entrada, demanda e última movimentação por processo
+    query = filtrar_processos(consulta_processos(), filtros)
+
+    # Busca um item a mais para saber se existe próxima página
+    processos = em_cache(
+        "processos_pagina", filtros, lambda: paginar_processos(query, apos, por_pagina + 1),
+        apos=apos, por_pagina=por_pagina
+    )
+    proximo_cursor = None
+    if len(processos) > por_pagina:
+        processos = processos[:por_pagina]
+        proximo_cursor = processos[-1].id_processo
+
+    if not processos and not apos:
         flash("Nenhum processo encontrado com os filtros aplicados.", "warning")
 
-    for p in processos:
-        entrada = EntradaProcesso.query.filter_by(id_processo=p.id_processo).first()
-        p.entrada = entrada
-        if entrada:
-            entrada.demanda = Demanda.query.get(entrada.id_demanda)
-            ultima_mov = Movimentacao.query.filter_by(id_entrada=entrada.id_entrada).order_by(Movimentacao.data.desc()).first()
-            p.ultima_data = ultima_mov.data if ultima_mov else entrada.data_documento
+    # Filtros atuais (sem o cursor) para montar os links de navegação
+    args_navegacao = {k: v for k, v in request.args.items() if k not in ('apos', 'csrf_token')}
 
-    todas_ras = RegiaoAdministrativa.query.order_by(RegiaoAdministrativa.descricao_ra).all()
-    todos_status = Status.query.order_by(Status.ordem_exibicao).all()
-    demandas = Demanda.query.order_by(Demanda.descricao.asc()).all()
-    diretorias = [d.nome_completo for d in Diretoria.query.order_by(Diretoria.nome_completo.asc()).all()]
+    cat = catalogo()
 
     return render_template(
         "consultar_processos.html",
         processos=processos,
-        todas_ras=todas_ras,
-        todos_status=todos_status,
-        demandas=demandas,
-        diretorias=diretorias
+        todas_ras=cat.ras,
+        todos_status=cat.status,
+        demandas=cat.demandas,
+        diretorias=nomes_diretorias(cat),
+        proximo_cursor=proximo_cursor,
+        pagina_inicial=not apos,
+        args_navegacao=args_navegacao
+    )
+
+
+@processos_bp.route('/consultar/total', methods=['GET'])
+@login_required
+def consultar_processos_total():
+    """Total de processos para os filtros da consulta (carregado sob demanda)"""
+    filtros = extrair_filtros(request.args)
+    total = em_cache("processos_total", filtros, lambda: contar_processos(filtros))
+    return jsonify({"total": total})
+
+
+@processos_bp.route('/autocompletar', methods=['GET'])
+@login_required
+def autocompletar_processos():
+    """Sugestões de número de processo a partir de um fragmento (type-ahead)"""
+    fragmento = (request.args.get('q') or '').strip()
+    limite = min(max(request.args.get('limite', LIMITE_AUTOCOMPLETAR, type=int), 1), LIMITE_AUTOCOMPLETAR_MAXIMO)
+
+    sugestoes = autocompletar_numero(fragmento, limite) if fragmento else []
+    return jsonify([
+        {
+            "id_processo": s.id_processo,
+            "numero_processo": s.numero_processo,
+            "status_atual": s.status_atual,
+        }
+        for s in sugestoes
+    ])
+
+
+# ==========================================================
+# 🔎 BUSCA TEXTUAL NAS OBSERVAÇÕES
+# ==========================================================
+@processos_bp.route('/busca', methods=['GET'])
+@login_required
+def busca_textual():
+    """Busca ranqueada nas observações de processos e movimentações"""
+    consulta = (request.args.get('q') or '').strip()
+    pagina = max(request.args.get('pagina', 1, type=int), 1)
+
+    resultados, total = buscar(consulta, pagina, POR_PAGINA_BUSCA) if consulta else ([], 0)
+    total_paginas = max((total + POR_PAGINA_BUSCA - 1) // POR_PAGINA_BUSCA, 1)
+
+    return render_template(
+        'busca_textual.html',
+        consulta=consulta,
+        resultados=resultados,
+        total=total,
+        pagina=pagina,
+        total_paginas=total_paginas
     )
 
 
@@ -327,76 +364,58 @@ def consultar_processos():
 @processos_bp.route('/exportar-processo/<int:id_processo>')
 @login_required
 def exportar_processo_pdf(id_processo):
-    """Gera PDF institucional com os dados completos do processo"""
-    processo = Processo.query.get_or_404(id_processo)
-    entrada = EntradaProcesso.query.filter_by(id_processo=id_processo).first()
-    movimentacoes = Movimentacao.query.filter_by(id_entrada=entrada.id_entrada).order_by(Movimentacao.data.asc()).all() if entrada else []
+    """Gera PDF institucional com os dados completos do processo (com cache em disco)"""
+    versao = versao_pdf_processo(id_processo)
+    if versao is None:
+        abort(404)
+    etag = f"processo-{versao}"
+
+    # Cliente já tem esta versão: 304 sem ler dados nem arquivo
+    if request.if_none_match.contains(etag):
+        resposta = current_app.response_class(status=304)
+        resposta.set_etag(etag)
+        resposta.headers['Cache-Control'] = 'private, no-cache'
+        return resposta
+
+    numero_processo = db.session.query(Processo.numero_processo).filter_by(id_processo=id_processo).scalar()
+    resposta = send_file(
+        obter_pdf(versao, lambda: renderizar_dossie(carregar_dossies([id_processo])[0])),
+        as_attachment=True,
+        download_name=nome_arquivo_dossie(numero_processo),
+        mimetype='application/pdf',
+        etag=etag,
+        conditional=True
+    )
+    resposta.headers['Cache-Control'] = 'private, no-cache'
+    return resposta
 
-    output = BytesIO()
-    doc = SimpleDocTemplate(output, pagesize=A4)
-    elements = []
-    styles = getSampleStyleSheet()
 
-    logo_path = os.path.join(current_app.root_path, "static", "images", "ico-logo-gdf.svg")
-    if os.path.exists(logo_path):
-        try:
-            elements.append(Image(logo_path, width=80, height=60))
-        except Exception:
-            pass
-
-    elements.append(Paragraph("<b>Relatório Institucional de Processo</b>", styles['Title']))
-    elements.append(Spacer(1, 12))
-
-    info_table = [
-        ["Número do Processo", processo.numero_processo],
-        ["Status Atual", processo.status_atual or "---"],
-        ["Diretoria de Destino", processo.diretoria_destino or "---"],
-        ["Observações", processo.observacoes or "---"],
+# ==========================================================
+# 🗜 EXPORTAR DOSSIÊS EM LOTE (ZIP)
+# ==========================================================
+@processos_bp.route('/exportar-dossies', methods=['GET'])
+@login_required
+def exportar_dossies():
+    """ZIP com o PDF de cada processo que atende aos filtros da consulta"""
+    filtros = extrair_filtros(request.args)
+    ids = [
+        linha.id_processo
+        for linha in paginar_processos(filtrar_processos(consulta_ids(), filtros), None, LIMITE_DOSSIES + 1)
     ]
-    table = Table(info_table, colWidths=[160, 370])
-    table.setStyle(TableStyle([
-        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
-    ]))
-    elements.append(table)
-    elements.append(Spacer(1, 12))
-
-    if entrada:
-        entrada_table = [
-            ["RA de Origem", entrada.ra_origem or "---"],
-            ["Data de Entrada", entrada.data_entrada_novacap.strftime("%d/%m/%Y") if entrada.data_entrada_novacap else "---"],
-            ["Demanda", entrada.demanda.descricao if entrada.demanda else "---"],
-        ]
-        elements.append(Paragraph("<b>Informações da Entrada</b>", styles['Heading2']))
-        t2 = Table(entrada_table, colWidths=[200, 330])
-        t2.setStyle(TableStyle([('GRID', (0, 0), (-1, -1), 0.25, colors.grey)]))
-        elements.append(t2)
-        elements.append(Spacer(1, 12))
-
-    elements.append(Paragraph("<b>Histórico de Movimentações</b>", styles['Heading2']))
-    if movimentacoes:
-        mov_table = [["Data", "Status", "Responsável", "Observação"]]
-        for m in movimentacoes:
-            usuario = Usuario.query.get(m.id_usuario)
-            mov_table.append([
-                m.data.strftime("%d/%m/%Y") if m.data else "---",
-                m.novo_status or "---",
-                usuario.nome if usuario else "---",
-                m.observacao or "---"
-            ])
-        t3 = Table(mov_table, repeatRows=1, colWidths=[80, 120, 120, 210])
-        t3.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#004A8F")),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
-        ]))
-        elements.append(t3)
-    else:
-        elements.append(Paragraph("Nenhuma movimentação registrada.", styles['Normal']))
 
-    doc.build(elements)
-    output.seek(0)
-    nome_arquivo = f"Processo_{processo.numero_processo.replace('/', '_')}.pdf"
-    return send_file(output, as_attachment=True, download_name=nome_arquivo, mimetype='application/pdf')
+    if not ids:
+        flash("Nenhum processo encontrado para exportação.", "warning")
+        return redirect(url_for('processos_bp.consultar_processos', **request.args))
+    if len(ids) > LIMITE_DOSSIES:
+        flash(f"Mais de {LIMITE_DOSSIES} processos selecionados. Refine os filtros para gerar os dossiês.", "warning")
+        return redirect(url_for('processos_bp.consultar_processos', **request.args))
+
+    return send_file(
+        gerar_zip_dossies(ids),
+        as_attachment=True,
+        download_name=f"Dossies_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+        mimetype='application/zip'
+    )
 
 
 # ==========================================================
@@ -406,18 +425,45 @@ def exportar_processo_pdf(id_processo):
 @processos_bp.route("/verificar-processo", methods=["POST"])
 @login_required
 def verificar_processo():
-    """Verifica se um número de processo SEI já existe (AJAX)"""
-    data = request.get_json()
-    numero = data.get("numero_processo", "").strip()
-    if not numero:
+    """
+    Verifica se um número de processo SEI já existe (AJAX).
+    Aceita {"numero_processo": "..."} ou {"numeros_processo": ["...", ...]}.
+    """
+    data = request.get_json(silent=True) or {}
+
+    # Lote de números: uma única consulta IN sobre a chave normalizada
+    if "numeros_processo" in data:
+        numeros = data.get("numeros_processo") or []
+        if not isinstance(numeros, list) or len(numeros) > LIMITE_VERIFICACAO_LOTE:
+            return jsonify({"erro": f"Envie uma lista com até {LIMITE_VERIFICACAO_LOTE} números."}), 400
+
+        normalizados = {str(n): Processo.normalizar_numero(str(n)) for n in numeros}
+        chaves = {c for c in normalizados.values() if c}
+        encontrados = dict(
+            db.session.query(Processo.numero_normalizado, Processo.id_processo)
+            .filter(Processo.numero_normalizado.in_(chaves))
+            .all()
+        ) if chaves else {}
+
+        return jsonify({"resultados": [
+            {
+                "numero_processo": numero,
+                "existe": chave in encontrados,
+                "id": encontrados.get(chave)
+            }
+            for numero, chave in normalizados.items()
+        ]})
+
+    numero = (data.get("numero_processo") or "").strip()
+    numero_normalizado = Processo.normalizar_numero(numero)
+    if not numero_normalizado:
         return jsonify({"erro": "Número do processo não informado."}), 400
 
-    numero_limpo = ''.join(filter(str.isdigit, numero))
-    processos = Processo.query.all()
-    for p in processos:
-        existente = ''.join(filter(str.isdigit, p.numero_processo or ''))
-        if existente == numero_limpo:
-            return jsonify({"existe": True, "id": p.id_processo})
+    existente = db.session.query(Processo.id_processo).filter_by(
+        numero_normalizado=numero_normalizado
+    ).scalar()
+    if existente:
+        return jsonify({"existe": True, "id": existente})
     return jsonify({"existe": False})
 
 
@@ -427,91 +473,48 @@ def verificar_processo():
 @processos_bp.route('/exportar-tramitacoes', methods=['GET'])
 @login_required
 def exportar_tramitacoes():
-    """Exporta lista de processos filtrados (CSV, XLSX ou PDF)"""
+    """Exporta lista de processos filtrados (CSV, XLSX, PDF, Parquet ou Arrow)"""
     formato = request.args.get('formato', 'csv')
-    status = request.args.get('status')
-    ra = request.args.get('ra')
-    diretoria = request.args.get('diretoria')
-    demanda = request.args.get('demanda')
-    inicio = request.args.get('inicio')
-    fim = request.args.get('fim')
-
-    query = Processo.query.join(EntradaProcesso, isouter=True)
-
-    if status:
-        query = query.filter(Processo.status_atual == status)
-    if ra:
-        query = query.filter(EntradaProcesso.ra_origem == ra)
-    if diretoria:
-        query = query.filter(Processo.diretoria_destino == diretoria)
-    if demanda:
-        query = query.filter(EntradaProcesso.id_demanda == demanda)
-    if inicio and fim:
-        try:
-            inicio_dt = datetime.strptime(inicio, "%Y-%m-%d")
-            fim_dt = datetime.strptime(fim, "%Y-%m-%d")
-            query = query.filter(EntradaProcesso.data_entrada_novacap.between(inicio_dt, fim_dt))
-        except Exception:
-            pass
-
-    processos = query.order_by(Processo.id_processo.desc()).all()
-    if not processos:
+    filtros = extrair_filtros(request.args)
+
+    query = filtrar_processos(consulta_exportacao(), filtros)
+    if not paginar_processos(query, None, 1):
         flash("Nenhum processo encontrado para exportação.", "warning")
         return redirect(url_for('processos_bp.consultar_processos'))
 
-    dados = []
-    for p in processos:
-        entrada = EntradaProcesso.query.filter_by(id_processo=p.id_processo).first()
-        dados.append({
-            "Número do Processo": p.numero_processo,
-            "Status Atual": p.status_atual,
-            "Diretoria de Destino": p.diretoria_destino,
-            "RA de Origem": entrada.ra_origem if entrada else "---",
-            "Data de Entrada": entrada.data_entrada_novacap.strftime("%d/%m/%Y") if entrada and entrada.data_entrada_novacap else "---",
-        })
-
-    df = pd.DataFrame(dados)
+    # Percorre o resultado em lotes por cursor, sem carregar tudo de uma vez
+    linhas = linhas_tramitacoes(iterar_em_lotes(query))
 
     if formato == 'xlsx':
-        output = BytesIO()
-        df.to_excel(output, index=False)
-        output.seek(0)
+        arquivo = gerar_xlsx(linhas, COLUNAS_TRAMITACOES, "Processos")
         return send_file(
-            output,
+            arquivo,
             as_attachment=True,
             download_name='processos.xlsx',
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            mimetype=MIMETYPE_XLSX
+        )
+
+    if formato in FORMATOS_COLUNARES:
+        extensao, mimetype = FORMATOS_COLUNARES[formato]
+        return send_file(
+            gerar_colunar(linhas, COLUNAS_TRAMITACOES, formato),
+            as_attachment=True,
+            download_name=f'processos.{extensao}',
+            mimetype=mimetype
         )
 
     if formato == 'pdf':
-        output = BytesIO()
-        doc = SimpleDocTemplate(output, pagesize=A4)
-        elements = []
-        styles = getSampleStyleSheet()
-        elements.append(Paragraph("<b>Relatório de Processos</b>", styles['Title']))
-        elements.append(Spacer(1, 12))
-        tabela = Table([df.columns.to_list()] + df.values.tolist(), repeatRows=1)
-        tabela.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#004A8F")),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
-        ]))
-        elements.append(tabela)
-        doc.build(elements)
-        output.seek(0)
         return send_file(
-            output,
+            gerar_pdf(linhas, COLUNAS_TRAMITACOES, "Relatório de Processos"),
             as_attachment=True,
             download_name='processos.pdf',
             mimetype='application/pdf'
         )
 
-    output = BytesIO()
-    df.to_csv(output, index=False, sep=';', encoding='utf-8-sig')
-    output.seek(0)
-    return send_file(
-        output,
-        as_attachment=True,
-        download_name='processos.csv',
+    # CSV em streaming: as linhas saem do cursor direto para a resposta
+    response = Response(
+        stream_with_context(gerar_csv(linhas, COLUNAS_TRAMITACOES)),
         mimetype='text/csv'
-    )
\ No newline at end of file
+    )
+    response.headers['Content-Disposition'] = 'attachment; filename=processos.csv'
+    return response
\ No newline at end of file
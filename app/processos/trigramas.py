@@ -0,0 +1,181 @@
+# app/processos/trigramas.py
+"""
+Índice de trigramas do número de processo — CR-NOVACAP.
+
+`LIKE '%fragmento%'` nunca usa índice B-tree. Aqui cada processo é
+decomposto nos trigramas (3 dígitos consecutivos) do seu numero_normalizado,
+gravados em `processo_trigramas`. Um fragmento só pode estar nos processos
+que possuem todos os seus trigramas, mas trigramas comuns nos números SEI
+("000", "202", "025") têm listas de ocorrência do tamanho da tabela. Por
+isso a busca conta (com limite) a lista de cada trigrama do fragmento e
+parte dos TRIGRAMAS_POR_BUSCA mais raros, intersectados por junção na chave
+primária; o LIKE final confirma a ordem dos dígitos sobre os candidatos.
+candidatos_trigramas() serve a qualquer índice de trigramas com as colunas
+(trigrama, <id>), como o da busca de usuários (app/admin/busca_usuarios.py).
+
+Se até a lista mais rara atinge o limite da contagem, o fragmento é comum
+e os candidatos seriam quase a tabela toda: condicao_numero usa só o LIKE,
+conferido linha a linha na ordem da listagem (id decrescente), que logo
+completa uma página. O autocompletar percorre a lista do trigrama mais raro
+do maior id para o menor, com o limite dentro da consulta, e o LIKE
+confirma cada processo, sem materializar candidatos.
+"""
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import aliased
+
+from app.ext import db
+from app.models.modelos import Processo, ProcessoTrigrama
+
+TAMANHO_NGRAMA = 3
+TRIGRAMAS_POR_BUSCA = 2          # trigramas mais raros que conduzem a busca
+LIMITE_CONTAGEM_TRIGRAMA = 1000  # contagem de cada lista para a escolha dos mais raros
+
+
+def gerar_trigramas(digitos):
+    """Conjunto de trigramas de uma sequência de dígitos."""
+    digitos = digitos or ''
+    return {
+        digitos[i:i + TAMANHO_NGRAMA]
+        for i in range(len(digitos) - TAMANHO_NGRAMA + 1)
+    }
+
+
+# ==========================================================
+# ✏️ Manutenção incremental (chamada pelas rotas de escrita)
+# ==========================================================
+def indexar_processo(processo):
+    """Grava os trigramas do processo (o processo já deve ter id)."""
+    for trigrama in gerar_trigramas(processo.numero_normalizado):
+        db.session.add(ProcessoTrigrama(trigrama=trigrama, id_processo=processo.id_processo))
+
+
+def remover_processo(id_processo):
+    """Remove os trigramas de um processo."""
+    ProcessoTrigrama.query.filter_by(id_processo=id_processo).delete(synchronize_session=False)
+
+
+def reconstruir_indice(tamanho_lote=1000):
+    """Recria todo o índice a partir de `processos` (sem commit). Retorna o total."""
+    ProcessoTrigrama.query.delete(synchronize_session=False)
+
+    total = 0
+    ultimo_id = 0
+    while True:
+        lote = (
+            db.session.query(Processo.id_processo, Processo.numero_normalizado)
+            .filter(Processo.id_processo > ultimo_id)
+            .order_by(Processo.id_processo)
+            .limit(tamanho_lote)
+            .all()
+        )
+        if not lote:
+            return total
+        db.session.execute(ProcessoTrigrama.__table__.insert(), [
+            {'trigrama': trigrama, 'id_processo': id_processo}
+            for id_processo, numero in lote
+            for trigrama in gerar_trigramas(numero)
+        ])
+        total += len(lote)
+        ultimo_id = lote[-1].id_processo
+
+
+# ==========================================================
+# 🔍 Busca
+# ==========================================================
+def contar_ocorrencias(modelo, trigramas):
+    """
+    [(ocorrências, trigrama)] em ordem crescente, numa consulta. Cada
+    contagem para em LIMITE_CONTAGEM_TRIGRAMA: o custo não cresce com a tabela.
+    """
+    trigramas = sorted(trigramas)
+    contagens = db.session.execute(select(*[
+        select(func.count()).select_from(
+            select(modelo.trigrama)
+            .where(modelo.trigrama == trigrama)
+            .limit(LIMITE_CONTAGEM_TRIGRAMA)
+            .subquery()
+        ).scalar_subquery()
+        for trigrama in trigramas
+    ])).one()
+    return sorted(zip(contagens, trigramas))
+
+
+def trigramas_mais_raros(modelo, trigramas, quantidade=TRIGRAMAS_POR_BUSCA):
+    """Os `quantidade` trigramas com as menores listas de ocorrência no índice."""
+    if len(trigramas) <= quantidade:
+        return sorted(trigramas)
+    return [trigrama for _, trigrama in contar_ocorrencias(modelo, trigramas)[:quantidade]]
+
+
+def _juncao_trigramas(modelo, coluna_id, raros):
+    """SELECT dos ids que possuem todos os trigramas de `raros`."""
+    base = aliased(modelo)
+    ids = getattr(base, coluna_id)
+
+    stmt = select(ids).where(base.trigrama == raros[0])
+    for trigrama in raros[1:]:
+        outro = aliased(modelo)
+        stmt = stmt.join(outro, and_(getattr(outro, coluna_id) == ids, outro.trigrama == trigrama))
+    return stmt
+
+
+def candidatos_trigramas(modelo, coluna_id, trigramas):
+    """SELECT dos ids que possuem os trigramas mais raros do conjunto."""
+    return _juncao_trigramas(modelo, coluna_id, trigramas_mais_raros(modelo, trigramas))
+
+
+def condicao_numero(fragmento):
+    """Expressão SQL para 'número do processo contém o fragmento'."""
+    digitos = Processo.normalizar_numero(fragmento)
+    if not digitos:
+        return Processo.numero_processo.like(f"%{fragmento}%")
+
+    trigramas = gerar_trigramas(digitos)
+    if not trigramas:
+        # Fragmento curto demais para trigramas (1–2 dígitos)
+        return Processo.numero_normalizado.like(f"%{digitos}%")
+
+    contem = Processo.numero_normalizado.like(f"%{digitos}%")
+    ocorrencias = contar_ocorrencias(ProcessoTrigrama, trigramas)
+    if ocorrencias[0][0] >= LIMITE_CONTAGEM_TRIGRAMA:
+        # Fragmento comum: os candidatos seriam quase a tabela toda
+        return contem
+
+    raros = [trigrama for _, trigrama in ocorrencias[:TRIGRAMAS_POR_BUSCA]]
+    return and_(
+        Processo.id_processo.in_(_juncao_trigramas(ProcessoTrigrama, 'id_processo', raros)),
+        contem
+    )
+
+
+def autocompletar_numero(fragmento, limite=10):
+    """Até `limite` processos cujo número contém o fragmento (mais recentes primeiro)."""
+    digitos = Processo.normalizar_numero(fragmento)
+    if not digitos:
+        return []
+
+    colunas = (Processo.id_processo, Processo.numero_processo, Processo.status_atual)
+    if len(digitos) < TAMANHO_NGRAMA:
+        # Poucos dígitos: prefixo, que usa o índice de numero_normalizado
+        stmt = (
+            select(*colunas)
+            .where(Processo.numero_normalizado.like(f"{digitos}%"))
+            .order_by(Processo.id_processo.desc())
+        )
+    else:
+        # Lista do trigrama mais raro, do maior id para o menor (chave primária
+        # do índice); o LIKE confirma cada processo até completar o limite
+        raro = trigramas_mais_raros(ProcessoTrigrama, gerar_trigramas(digitos), 1)[0]
+        stmt = (
+            select(*colunas)
+            .select_from(ProcessoTrigrama)
+            .join(Processo, Processo.id_processo == ProcessoTrigrama.id_processo)
+            .where(
+                ProcessoTrigrama.trigrama == raro,
+                Processo.numero_normalizado.like(f"%{digitos}%")
+            )
+            .order_by(ProcessoTrigrama.id_processo.desc())
+        )
+
+    return db.session.execute(stmt.limit(limite)).all()
@@ -0,0 +1,281 @@
+# app/relatorios/consultas.py
+"""
+Consulta dos relatórios avançados — CR-NOVACAP.
+
+Uma movimentação por linha, com dados do usuário, entrada, processo,
+demanda, departamento e diretoria. Usada pela tela, pelas exportações
+síncronas e pelas tarefas de exportação em segundo plano (que recebem os
+filtros como dicionário simples).
+
+As instruções são lambda_stmt com os filtros de FILTROS_RELATORIO
+(app/filtros.py). A diretoria é filtrada pelo id (índice em
+departamentos.id_diretoria), não mais por ILIKE parcial na descrição. Links
+antigos, com o texto da diretoria, são convertidos para o id pelo catálogo;
+texto que não identifica uma única diretoria é rejeitado (ValueError).
+
+Os gráficos e totais da tela vêm de consultas agregadas (GROUP BY no
+banco) e o detalhamento é lido em páginas por cursor (pagina_relatorio):
+a página não recebe mais o conjunto completo de linhas.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import func, select, distinct, extract, tuple_, lambda_stmt
+
+from app.catalogo import catalogo
+from app.ext import db
+from app.filtros import Filtros, texto, inteiro, data, condicao_pronta
+from app.models.modelos import (
+    Movimentacao, Usuario, EntradaProcesso, Processo,
+    Demanda, Departamento, Diretoria
+)
+
+
+def _selecao_relatorio(*extras):
+    """Colunas exibidas, na ordem de COLUNAS_RELATORIO (+ extras no fim)."""
+    return select(
+        Movimentacao.data,
+        Processo.numero_processo,
+        EntradaProcesso.ra_origem,
+        Movimentacao.novo_status,
+        Diretoria.descricao_exibicao,
+        Departamento.nome,
+        Demanda.descricao,
+        Usuario.usuario,
+        Movimentacao.observacao,
+        *extras
+    )
+
+
+def _com_juncoes(stmt):
+    """Junções do relatório, partindo de movimentações."""
+    return (
+        stmt
+        .outerjoin(Usuario, Movimentacao.id_usuario == Usuario.id_usuario)
+        .outerjoin(EntradaProcesso, Movimentacao.id_entrada == EntradaProcesso.id_entrada)
+        .outerjoin(Processo, EntradaProcesso.id_processo == Processo.id_processo)
+        .outerjoin(Demanda, EntradaProcesso.id_demanda == Demanda.id_demanda)
+        .outerjoin(Departamento, Demanda.id_departamento == Departamento.id_departamento)
+        .outerjoin(Diretoria, Departamento.id_diretoria == Diretoria.id_diretoria)
+    )
+
+
+# ==========================================================
+# 🔎 Filtros do relatório
+# ==========================================================
+def id_diretoria(valor):
+    """
+    Id da diretoria. Aceita também o texto dos links antigos (sigla, nome,
+    descrição ou trecho dela, como no antigo ILIKE) se ele identifica uma
+    única diretoria; caso contrário None (inválido).
+    """
+    numero = inteiro(valor)
+    if numero is not None:
+        return numero
+    termo = (texto(valor) or "").casefold()
+    if not termo:
+        return None
+
+    diretorias = catalogo().diretorias
+    encontradas = [
+        d for d in diretorias
+        if termo in {(d.sigla or "").casefold(), (d.nome_completo or "").casefold(),
+                     (d.descricao_exibicao or "").casefold()}
+    ] or [d for d in diretorias if termo in (d.descricao_exibicao or "").casefold()]
+    return encontradas[0].id_diretoria if len(encontradas) == 1 else None
+
+
+def _diretoria(stmt, id_diretoria):
+    return stmt + (lambda s: s.where(Departamento.id_diretoria == id_diretoria))
+
+
+def _departamento(stmt, departamento):
+    return stmt + (lambda s: s.where(Departamento.nome == departamento))
+
+
+def _servico(stmt, servico):
+    return stmt + (lambda s: s.where(Demanda.descricao == servico))
+
+
+def _ra(stmt, ra):
+    return stmt + (lambda s: s.where(EntradaProcesso.ra_origem == ra))
+
+
+def _status(stmt, status):
+    return stmt + (lambda s: s.where(Movimentacao.novo_status == status))
+
+
+def _inicio(stmt, inicio):
+    return stmt + (lambda s: s.where(Movimentacao.data >= inicio))
+
+
+def _fim(stmt, fim):
+    return stmt + (lambda s: s.where(Movimentacao.data <= fim))
+
+
+FILTROS_RELATORIO = Filtros(
+    diretoria=(id_diretoria, _diretoria),
+    departamento=(texto, _departamento),
+    servico=(texto, _servico),
+    ra=(texto, _ra),
+    status=(texto, _status),
+    inicio=(data, _inicio),
+    fim=(data, _fim),
+)
+
+CAMPOS_FILTRO_RELATORIO = FILTROS_RELATORIO.nomes
+
+
+def extrair_filtros_relatorio(args):
+    """
+    Filtros do relatório a partir da querystring/formulário.
+    ValueError se a diretoria informada não for reconhecida.
+    """
+    if "diretoria" in FILTROS_RELATORIO.invalidos(args):
+        raise ValueError(f"Diretoria não encontrada: {args.get('diretoria')}")
+    return FILTROS_RELATORIO.extrair(args)
+
+
+def consulta_relatorio(filtros, ordenar=False):
+    """
+    Instrução do relatório avançado com os filtros aplicados (mais recentes
+    primeiro se `ordenar`). Seleciona só as colunas exibidas, na ordem de
+    COLUNAS_RELATORIO: as linhas são tuplas simples, sem entidades ORM.
+    """
+    stmt = lambda_stmt(lambda: _com_juncoes(_selecao_relatorio()))
+    stmt = FILTROS_RELATORIO.aplicar(stmt, filtros)
+    if ordenar:
+        stmt = stmt + (lambda s: s.order_by(Movimentacao.data.desc()))
+    return stmt
+
+
+# ==========================================================
+# 📄 Detalhamento paginado por cursor (keyset)
+# ==========================================================
+# Ordenações aceitas: nome → (coluna indexada, posição na linha)
+ORDENACOES_RELATORIO = {
+    "data": (Movimentacao.data, 0),
+    "status": (Movimentacao.novo_status, 3),
+    "ra": (EntradaProcesso.ra_origem, 2),
+}
+
+
+def _codificar_cursor(valor, id_movimentacao):
+    """Cursor opaco com a chave de ordenação da última linha entregue."""
+    if isinstance(valor, datetime):
+        valor = valor.isoformat()
+    bruto = json.dumps([valor, id_movimentacao]).encode()
+    return base64.urlsafe_b64encode(bruto).decode()
+
+
+def _decodificar_cursor(cursor, ordem):
+    """(valor, id_movimentacao) do cursor; ValueError se estiver malformado."""
+    try:
+        valor, id_movimentacao = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if ordem == "data" and valor is not None:
+            valor = datetime.fromisoformat(valor)
+        return valor, int(id_movimentacao)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Cursor inválido.") from e
+
+
+def pagina_relatorio(filtros, ordem="data", decrescente=True, apos=None, limite=100):
+    """
+    Uma página do detalhamento ordenada por (coluna, id_movimentacao).
+    Retorna (linhas, cursor da próxima página ou None); as linhas têm as
+    colunas de COLUNAS_RELATORIO. `apos` é o cursor da página anterior.
+    """
+    coluna, posicao = ORDENACOES_RELATORIO[ordem]
+    chave = tuple_(coluna, Movimentacao.id_movimentacao)
+
+    stmt = lambda_stmt(lambda: _com_juncoes(_selecao_relatorio(Movimentacao.id_movimentacao)))
+    stmt = FILTROS_RELATORIO.aplicar(stmt, filtros)
+
+    if apos:
+        limite_chave = tuple_(*_decodificar_cursor(apos, ordem))
+        stmt = condicao_pronta(stmt, chave < limite_chave if decrescente else chave > limite_chave)
+
+    if decrescente:
+        ordenacao = [coluna.desc(), Movimentacao.id_movimentacao.desc()]
+    else:
+        ordenacao = [coluna.asc(), Movimentacao.id_movimentacao.asc()]
+    stmt = stmt.add_criteria(lambda s: s.order_by(*ordenacao), track_on=ordenacao)
+    stmt = stmt + (lambda s: s.limit(limite))
+
+    registros = db.session.execute(stmt).all()
+    linhas = [registro[:-1] for registro in registros]
+    proximo = None
+    if len(registros) == limite:
+        ultimo = registros[-1]
+        proximo = _codificar_cursor(ultimo[posicao], ultimo[-1])
+    return linhas, proximo
+
+
+def contar_relatorio(filtros):
+    """Total de linhas do relatório para os filtros."""
+    stmt = lambda_stmt(lambda: _com_juncoes(select(func.count(Movimentacao.id_movimentacao))))
+    return db.session.execute(FILTROS_RELATORIO.aplicar(stmt, filtros)).scalar()
+
+
+# ==========================================================
+# 📊 Agregações (cards e gráficos da tela)
+# ==========================================================
+ROTULO_AUSENTE = "Não informado"
+
+# Séries agrupadas por uma coluna: nome → coluna
+DIMENSOES_RELATORIO = {
+    "status": Movimentacao.novo_status,
+    "ra": EntradaProcesso.ra_origem,
+    "diretoria": Diretoria.descricao_exibicao,
+    "departamento": Departamento.nome,
+    "servico": Demanda.descricao,
+}
+
+# Série mensal (ano/mês da movimentação), além das dimensões acima
+SERIES_RELATORIO = (*DIMENSOES_RELATORIO, "mes")
+
+
+def totais_relatorio(filtros):
+    """Total de linhas, RAs distintas e serviços distintos, em uma consulta."""
+    stmt = lambda_stmt(lambda: _com_juncoes(select(
+        func.count(Movimentacao.id_movimentacao),
+        func.count(distinct(EntradaProcesso.ra_origem)),
+        func.count(distinct(Demanda.descricao)),
+    )))
+    total, ras, demandas = db.session.execute(FILTROS_RELATORIO.aplicar(stmt, filtros)).one()
+    return {"total_resultados": total, "total_ras": ras, "total_demandas": demandas}
+
+
+def _serie_dimensao(filtros, coluna):
+    """Contagem por valor da coluna, da maior para a menor."""
+    stmt = lambda_stmt(
+        lambda: _com_juncoes(select(coluna, func.count(Movimentacao.id_movimentacao))).group_by(coluna),
+        track_on=[coluna]
+    )
+    linhas = db.session.execute(FILTROS_RELATORIO.aplicar(stmt, filtros)).all()
+    serie = [{"rotulo": valor or ROTULO_AUSENTE, "total": total} for valor, total in linhas]
+    return sorted(serie, key=lambda item: (-item["total"], item["rotulo"]))
+
+
+def _serie_mensal(filtros):
+    """Contagem por mês da movimentação, em ordem cronológica (rótulo MM/AAAA)."""
+    stmt = lambda_stmt(lambda: _com_juncoes(select(
+        extract("year", Movimentacao.data).label("ano"),
+        extract("month", Movimentacao.data).label("mes"),
+        func.count(Movimentacao.id_movimentacao),
+    )).group_by("ano", "mes").order_by("ano", "mes"))
+    linhas = db.session.execute(FILTROS_RELATORIO.aplicar(stmt, filtros)).all()
+    return [
+        {"rotulo": f"{int(mes):02d}/{int(ano)}" if ano else ROTULO_AUSENTE, "total": total}
+        for ano, mes, total in linhas
+    ]
+
+
+def agregar_relatorio(filtros, series=SERIES_RELATORIO):
+    """Séries pré-agregadas dos gráficos: nome → [{"rotulo", "total"}]."""
+    return {
+        nome: _serie_mensal(filtros) if nome == "mes" else _serie_dimensao(filtros, DIMENSOES_RELATORIO[nome])
+        for nome in series
+    }
@@ -0,0 +1,264 @@
+# app/relatorios/exportacao.py
+"""
+Exportação de relatórios e listagens — CR-NOVACAP.
+
+As linhas são lidas do banco em lotes (yield_per → cursor do lado do
+servidor) e escritas conforme chegam; nenhum formato monta o conjunto
+completo em memória.
+
+Cada exportação descreve suas colunas como (nome, formato Excel, largura).
+O CSV usa apenas o nome; o XLSX aplica formato e largura; Parquet/Arrow
+derivam do formato o tipo da coluna (datas tipadas, demais como texto e
+as colunas de CATEGORIAS codificadas como dicionário).
+"""
+
+import csv
+import tempfile
+from datetime import date, datetime
+from io import StringIO
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+from app.ext import db
+
+# Linhas lidas do cursor por ida ao banco
+TAMANHO_LOTE_EXPORTACAO = 1000
+
+# Formatos de célula (XLSX)
+FORMATO_TEXTO = "@"
+FORMATO_DATA = "DD/MM/YYYY"
+FORMATO_DATA_HORA = "DD/MM/YYYY HH:MM"
+
+MIMETYPE_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Formatos colunares: formato → (extensão, mimetype)
+FORMATOS_COLUNARES = {
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "arrow": ("arrows", "application/vnd.apache.arrow.stream"),
+}
+
+# Colunas de baixa cardinalidade (dictionary-encoded em Parquet/Arrow)
+CATEGORIAS = {
+    "RA", "Status", "Diretoria", "Departamento", "Serviço", "Responsável",
+    "Status Atual", "Diretoria de Destino", "RA de Origem",
+}
+
+# Marcadores de "sem valor" usados nas exportações textuais (viram nulos)
+VALORES_AUSENTES = {"", "—", "---", "Não informado"}
+
+COLUNAS_RELATORIO = (
+    ("Data", FORMATO_DATA_HORA, 17),
+    ("Número do Processo", FORMATO_TEXTO, 24),
+    ("RA", None, 28),
+    ("Status", None, 40),
+    ("Diretoria", None, 32),
+    ("Departamento", None, 28),
+    ("Serviço", None, 30),
+    ("Responsável", None, 18),
+    ("Observação", None, 60),
+)
+
+# Exportação de tramitações (consulta unificada de processos)
+COLUNAS_TRAMITACOES = (
+    ("Número do Processo", FORMATO_TEXTO, 24),
+    ("Status Atual", None, 40),
+    ("Diretoria de Destino", None, 36),
+    ("RA de Origem", None, 30),
+    ("Data de Entrada", FORMATO_DATA, 14),
+)
+
+
+def linha_relatorio(registro):
+    """Valores de uma linha de consulta_relatorio com os marcadores de ausência."""
+    data, numero, ra, status, diretoria, departamento, servico, responsavel, observacao = registro
+    return (
+        data or "—",
+        numero or "—",
+        ra or "—",
+        status,
+        diretoria or "Não informado",
+        departamento or "Não informado",
+        servico or "—",
+        responsavel or "—",
+        observacao or "",
+    )
+
+
+def iterar_linhas(stmt, tamanho_lote=TAMANHO_LOTE_EXPORTACAO):
+    """Percorre a consulta do relatório em lotes, sem materializar o resultado."""
+    resultado = db.session.execute(stmt, execution_options={"yield_per": tamanho_lote})
+    for registro in resultado:
+        yield linha_relatorio(registro)
+
+
+def linhas_tramitacoes(processos):
+    """Linhas da exportação de tramitações na ordem de COLUNAS_TRAMITACOES."""
+    for p in processos:
+        yield (
+            p.numero_processo,
+            p.status_atual,
+            p.diretoria_destino,
+            p.ra_origem or "---",
+            p.data_entrada_novacap or "---",
+        )
+
+
+def formatar_valor(valor):
+    """Representação textual (CSV/PDF) de um valor exportado."""
+    if isinstance(valor, datetime):
+        return valor.strftime("%d/%m/%Y %H:%M")
+    if isinstance(valor, date):
+        return valor.strftime("%d/%m/%Y")
+    return "" if valor is None else valor
+
+
+# ==========================================================
+# 📄 CSV em streaming (';' e UTF-8 com BOM, compatível com o Excel)
+# ==========================================================
+def gerar_csv(linhas, colunas=COLUNAS_RELATORIO, linhas_por_bloco=TAMANHO_LOTE_EXPORTACAO):
+    """Gerador de blocos de texto CSV para uma resposta em streaming."""
+    buffer = StringIO()
+    escritor = csv.writer(buffer, delimiter=";", lineterminator="\n")
+
+    buffer.write("\ufeff")  # BOM
+    escritor.writerow([nome for nome, _, _ in colunas])
+
+    for i, linha in enumerate(linhas, start=1):
+        escritor.writerow([formatar_valor(valor) for valor in linha])
+        if i % linhas_por_bloco == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+# ==========================================================
+# 📊 XLSX em modo write-only (memória constante)
+# ==========================================================
+def gerar_xlsx(linhas, colunas=COLUNAS_RELATORIO, titulo="Relatório", destino=None):
+    """
+    Escreve as linhas num workbook write-only (cada linha vai direto para
+    o arquivo temporário da planilha). Sem `destino`, devolve o .xlsx num
+    arquivo temporário posicionado no início, pronto para send_file.
+    """
+    workbook = Workbook(write_only=True)
+    planilha = workbook.create_sheet(titulo)
+
+    for indice, (_, _, largura) in enumerate(colunas, start=1):
+        if largura:
+            planilha.column_dimensions[get_column_letter(indice)].width = largura
+
+    negrito = Font(bold=True)
+    cabecalho = []
+    for nome, _, _ in colunas:
+        celula = WriteOnlyCell(planilha, value=nome)
+        celula.font = negrito
+        cabecalho.append(celula)
+    planilha.append(cabecalho)
+
+    formatos = [formato for _, formato, _ in colunas]
+    for linha in linhas:
+        planilha.append([
+            _celula(planilha, valor, formato) if formato else valor
+            for valor, formato in zip(linha, formatos)
+        ])
+
+    if destino:
+        workbook.save(destino)
+        return destino
+
+    arquivo = tempfile.TemporaryFile()
+    workbook.save(arquivo)
+    arquivo.seek(0)
+    return arquivo
+
+
+def _celula(planilha, valor, formato):
+    """Célula write-only com formato numérico/texto."""
+    celula = WriteOnlyCell(planilha, value=valor)
+    celula.number_format = formato
+    return celula
+
+
+# ==========================================================
+# 🏹 Parquet / Arrow IPC em lotes (record batches)
+# ==========================================================
+def esquema_arrow(colunas):
+    """Esquema Arrow a partir da especificação de colunas."""
+    campos = []
+    for nome, formato, _ in colunas:
+        if formato == FORMATO_DATA_HORA:
+            tipo = pa.timestamp("s")
+        elif formato == FORMATO_DATA:
+            tipo = pa.date32()
+        elif nome in CATEGORIAS:
+            tipo = pa.dictionary(pa.int32(), pa.string())
+        else:
+            tipo = pa.string()
+        campos.append(pa.field(nome, tipo))
+    return pa.schema(campos)
+
+
+def _valor_arrow(valor, tipo):
+    if valor is None or (isinstance(valor, str) and valor in VALORES_AUSENTES):
+        return None
+    if pa.types.is_date32(tipo) and isinstance(valor, datetime):
+        return valor.date()
+    if pa.types.is_temporal(tipo) and not isinstance(valor, date):
+        return None
+    return valor
+
+
+def _lotes_arrow(linhas, esquema, tamanho_lote=TAMANHO_LOTE_EXPORTACAO):
+    """Agrupa as linhas em record batches de até `tamanho_lote` linhas."""
+    tipos = [campo.type for campo in esquema]
+
+    def _montar(colunas):
+        arrays = []
+        for valores, tipo in zip(colunas, tipos):
+            if pa.types.is_dictionary(tipo):
+                arrays.append(pa.array(valores, type=tipo.value_type).dictionary_encode())
+            else:
+                arrays.append(pa.array(valores, type=tipo))
+        return pa.record_batch(arrays, schema=esquema)
+
+    colunas = [[] for _ in tipos]
+    for linha in linhas:
+        for valores, valor, tipo in zip(colunas, linha, tipos):
+            valores.append(_valor_arrow(valor, tipo))
+        if len(colunas[0]) >= tamanho_lote:
+            yield _montar(colunas)
+            colunas = [[] for _ in tipos]
+    if colunas[0]:
+        yield _montar(colunas)
+
+
+def gerar_colunar(linhas, colunas, formato, destino=None):
+    """
+    Escreve as linhas em Parquet ou Arrow IPC (stream), lote a lote.
+    Sem `destino`, devolve um arquivo temporário posicionado no início.
+    """
+    esquema = esquema_arrow(colunas)
+    arquivo = destino or tempfile.TemporaryFile()
+
+    if formato == "parquet":
+        with pq.ParquetWriter(arquivo, esquema, compression="zstd") as escritor:
+            for lote in _lotes_arrow(linhas, esquema):
+                escritor.write_batch(lote)
+    elif formato == "arrow":
+        with pa.ipc.new_stream(arquivo, esquema) as escritor:
+            for lote in _lotes_arrow(linhas, esquema):
+                escritor.write_batch(lote)
+    else:
+        raise ValueError(f"Formato colunar inválido: {formato}")
+
+    if destino:
+        return destino
+    arquivo.seek(0)
+    return arquivo
@@ -0,0 +1,147 @@
+# app/relatorios/pdf.py
+"""
+PDF de listagens (exportação de tramitações) — CR-NOVACAP.
+
+O layout de uma única Table do reportlab com milhares de linhas é
+superlinear: a cada quebra de página o restante da tabela é medido de
+novo. Aqui as linhas são divididas em tabelas do tamanho de uma página,
+cada uma com o próprio cabeçalho, e o tempo passa a crescer linearmente
+com o número de linhas. Quantas linhas cabem é calculado a partir da
+altura útil da página (retrato ou paisagem) e da altura medida de uma
+linha da tabela. O rodapé "Página X de Y" é escrito por
+CanvasNumerado ao final da montagem.
+"""
+
+import tempfile
+from datetime import datetime
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from app.relatorios.exportacao import formatar_valor
+
+# Acima deste número de colunas a página fica em paisagem
+COLUNAS_RETRATO = 6
+
+MARGEM = 1.5 * cm
+
+
+def configurar_reportlab():
+    """
+    Configuração global do reportlab para todos os PDFs do sistema, aplicada
+    por create_app() e pelo inicializador do pool de dossiês: streams
+    (páginas e imagens) só com zlib, sem a codificação ASCII85 em Python
+    puro, que aumenta o arquivo e o tempo de geração.
+    """
+    rl_config.useA85 = 0
+
+
+ESTILO_TABELA = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#004A8F")),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 7),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+_ESTILOS = getSampleStyleSheet()
+
+
+class CanvasNumerado(canvas.Canvas):
+    """Canvas que adia a gravação das páginas para escrever 'Página X de Y'."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._paginas = []
+
+    def showPage(self):
+        self._paginas.append(dict(self.__dict__))
+        self._startPage()
+
+    def save(self):
+        total = len(self._paginas)
+        for estado in self._paginas:
+            self.__dict__.update(estado)
+            self._rodape(total)
+            super().showPage()
+        super().save()
+
+    def _rodape(self, total):
+        largura, _ = self._pagesize
+        self.setFont("Helvetica", 7)
+        self.setFillColor(colors.grey)
+        self.drawString(MARGEM, MARGEM / 2, f"Gerado em {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+        self.drawRightString(largura - MARGEM, MARGEM / 2, f"Página {self._pageNumber} de {total}")
+
+
+def _larguras(colunas, largura_util):
+    """Larguras proporcionais às larguras declaradas na especificação das colunas."""
+    pesos = [largura or 15 for _, _, largura in colunas]
+    return [largura_util * peso / sum(pesos) for peso in pesos]
+
+
+def _linhas_por_tabela(cabecalho, larguras, altura):
+    """Quantas linhas de dados (além do cabeçalho) cabem em `altura` pontos."""
+    amostra = Table([cabecalho], colWidths=larguras)
+    amostra.setStyle(ESTILO_TABELA)
+    _, altura_linha = amostra.wrap(sum(larguras), altura)
+    return max(int(altura // altura_linha) - 1, 1)
+
+
+def _blocos(linhas, primeiro, demais):
+    """Blocos de linhas formatadas: o primeiro com `primeiro` linhas, os outros com `demais`."""
+    bloco = []
+    tamanho = primeiro
+    for linha in linhas:
+        bloco.append([formatar_valor(valor) for valor in linha])
+        if len(bloco) == tamanho:
+            yield bloco
+            bloco = []
+            tamanho = demais
+    if bloco:
+        yield bloco
+
+
+def gerar_pdf(linhas, colunas, titulo, destino=None):
+    """
+    Escreve as linhas em tabelas de uma página cada (cabeçalho repetido)
+    e devolve o destino, ou um arquivo temporário posicionado no início.
+    """
+    tamanho_pagina = landscape(A4) if len(colunas) > COLUNAS_RETRATO else A4
+    arquivo = destino or tempfile.TemporaryFile()
+    doc = SimpleDocTemplate(
+        arquivo, pagesize=tamanho_pagina, title=titulo,
+        leftMargin=MARGEM, rightMargin=MARGEM, topMargin=MARGEM, bottomMargin=MARGEM
+    )
+
+    cabecalho = [nome for nome, _, _ in colunas]
+    larguras = _larguras(colunas, tamanho_pagina[0] - 2 * MARGEM)
+
+    elementos = [Paragraph(f"<b>{titulo}</b>", _ESTILOS['Title']), Spacer(1, 8)]
+
+    # Altura da moldura (margens e o recuo interno de 6 pt de cada lado);
+    # na primeira página o título ocupa parte dela
+    altura_util = doc.height - 12
+    altura_titulo = sum(e.wrap(doc.width, altura_util)[1] + e.getSpaceAfter() for e in elementos)
+    primeiro = _linhas_por_tabela(cabecalho, larguras, altura_util - altura_titulo)
+    demais = _linhas_por_tabela(cabecalho, larguras, altura_util)
+
+    for bloco in _blocos(linhas, primeiro, demais):
+        tabela = Table([cabecalho] + bloco, colWidths=larguras, repeatRows=1)
+        tabela.setStyle(ESTILO_TABELA)
+        elementos.append(tabela)
+    if len(elementos) == 2:
+        elementos.append(Paragraph("Nenhum registro encontrado.", _ESTILOS['Normal']))
+
+    doc.build(elementos, canvasmaker=CanvasNumerado)
+
+    if destino:
+        return destino
+    arquivo.seek(0)
+    return arquivo
@@ -1,28 +1,40 @@
 # app/relatorios/routes.py
 from datetime import datetime
-from io import BytesIO
-import pandas as pd
 
 from flask import (
-    render_template, request, redirect, url_for, flash, session,
-    send_file, make_response
+    render_template, request, url_for, flash, abort,
+    send_file, Response, stream_with_context, jsonify
 )
 from flask_login import login_required
 
-from app.ext import db
-from app.models.modelos import (
-    Movimentacao,
-    Usuario,
-    EntradaProcesso,
-    Processo,
-    Demanda,
-    Status,
-    RegiaoAdministrativa,
-    Diretoria,
-    Departamento
+from app.cache_resultados import em_cache
+from app.catalogo import catalogo
+from app.relatorios import relatorios_bp
+from app.relatorios.consultas import (
+    FILTROS_RELATORIO, SERIES_RELATORIO, ORDENACOES_RELATORIO, extrair_filtros_relatorio,
+    consulta_relatorio, totais_relatorio, agregar_relatorio, pagina_relatorio
+)
+from app.relatorios.tarefas import (
+    FORMATOS, submeter_exportacao, ler_tarefa, caminho_artefato
+)
+from app.relatorios.exportacao import (
+    COLUNAS_RELATORIO, MIMETYPE_XLSX, FORMATOS_COLUNARES,
+    iterar_linhas, linha_relatorio, formatar_valor, gerar_csv, gerar_xlsx, gerar_colunar
 )
 
-from app.relatorios import relatorios_bp
+
+# Linhas por página do detalhamento (padrão e máximo aceito em ?limite=)
+TAMANHO_PAGINA_RELATORIO = 200
+LIMITE_PAGINA_RELATORIO = 500
+
+# Exportações até este total de linhas são guardadas no cache de resultados;
+# acima disso, as linhas seguem em streaming direto do cursor
+LINHAS_EXPORTACAO_EM_CACHE = 5000
+
+
+def _totais(filtros):
+    """Totais do relatório (cache compartilhado por tela, gráficos e exportação)."""
+    return em_cache("relatorio_totais", filtros, lambda: totais_relatorio(filtros))
 
 
 # ==========================================================
@@ -31,216 +43,196 @@ from app.relatorios import relatorios_bp
 @relatorios_bp.route('/avancados')
 @login_required
 def relatorios_avancados():
-    todos_status = Status.query.order_by(Status.ordem_exibicao).all()
-    todas_ras = RegiaoAdministrativa.query.order_by(RegiaoAdministrativa.descricao_ra).all()
-    todas_demandas = Demanda.query.order_by(Demanda.descricao.asc()).all()
-    todas_diretorias = Diretoria.query.order_by(Diretoria.descricao_exibicao).all()
-    todos_departamentos = Departamento.query.order_by(Departamento.nome).all()
-
-    status_sel = request.args.get("status")
-    ra_sel = request.args.get("ra")
-    diretoria_sel = request.args.get("diretoria")
-    departamento_sel = request.args.get("departamento")
-    demanda_sel = request.args.get("servico")
-    inicio = request.args.get("inicio")
-    fim = request.args.get("fim")
-
-    query = (
-        db.session.query(
-            Movimentacao,
-            Usuario,
-            EntradaProcesso,
-            Processo,
-            Demanda,
-            Departamento,
-            Diretoria
-        )
-        .outerjoin(Usuario, Movimentacao.id_usuario == Usuario.id_usuario)
-        .outerjoin(EntradaProcesso, Movimentacao.id_entrada == EntradaProcesso.id_entrada)
-        .outerjoin(Processo, EntradaProcesso.id_processo == Processo.id_processo)
-        .outerjoin(Demanda, EntradaProcesso.id_demanda == Demanda.id_demanda)
-        .outerjoin(Departamento, Demanda.id_departamento == Departamento.id_departamento)
-        .outerjoin(Diretoria, Departamento.id_diretoria == Diretoria.id_diretoria)
-    )
-
-    if diretoria_sel:
-        query = query.filter(Diretoria.descricao_exibicao.ilike(f"%{diretoria_sel}%"))  # ILIKE + PARCIAL
+    cat = catalogo()
 
-    if departamento_sel:
-        query = query.filter(Departamento.nome == departamento_sel)
+    try:
+        filtros = extrair_filtros_relatorio(request.args)
+    except ValueError as e:
+        abort(400, description=str(e))
 
-    if demanda_sel:
-        query = query.filter(Demanda.descricao == demanda_sel)
+    if {"inicio", "fim"} & set(FILTROS_RELATORIO.invalidos(request.args)):
+        flash("Formato de data inválido. Use AAAA-MM-DD.", "warning")
 
-    if ra_sel:
-        query = query.filter(EntradaProcesso.ra_origem == ra_sel)
-
-    if status_sel:
-        query = query.filter(Movimentacao.novo_status == status_sel)
-
-    if inicio and fim:
-        try:
-            dt_inicio = datetime.strptime(inicio, "%Y-%m-%d")
-            dt_fim = datetime.strptime(fim, "%Y-%m-%d")
-            query = query.filter(Movimentacao.data.between(dt_inicio, dt_fim))
-        except ValueError:
-            flash("Formato de data inválido. Use AAAA-MM-DD.", "warning")
-
-    resultados = query.order_by(Movimentacao.data.desc()).all()
-
-    dados = []
-    ras_distintas = set()
-    demandas_distintas = set()
-
-    for mov, user, entrada, processo, demanda, departamento, diretoria in resultados:
-        dados.append({
-            "Data": mov.data.strftime("%d/%m/%Y %H:%M") if mov.data else "—",
-            "Número do Processo": processo.numero_processo if processo else "—",
-            "RA": entrada.ra_origem if entrada else "—",
-            "Status": mov.novo_status if mov else "—",
-            "Diretoria": diretoria.descricao_exibicao if diretoria else "Não informado",
-            "Departamento": departamento.nome if departamento else "Não informado",
-            "Serviço": demanda.descricao if demanda else "—",
-            "Responsável": user.usuario if user else "—",
-            "Observação": mov.observacao if mov else ""
-        })
-
-        if entrada and entrada.ra_origem:
-            ras_distintas.add(entrada.ra_origem)
-        if demanda and demanda.descricao:
-            demandas_distintas.add(demanda.descricao)
-
-    df = pd.DataFrame(dados)
-    dados_relatorio = df.to_dict(orient="records")  # PASSA DIRETO PRO TEMPLATE
-
-    total_resultados = len(df)
-    total_ras = len(ras_distintas)
-    total_demandas = len(demandas_distintas)
+    # Só os totais; os gráficos buscam as séries agregadas em
+    # /avancados/agregados e a tabela pagina por /avancados/linhas
+    totais = _totais(filtros)
 
     demandas_mapeadas = [
         {
             "descricao": d.descricao,
             "departamento": d.departamento.nome if d.departamento else "",
-            "diretoria": (
-                d.departamento.diretoria.descricao_exibicao
-                if d.departamento and d.departamento.diretoria else ""
-            )
+            "diretoria": str(d.departamento.id_diretoria) if d.departamento else ""
         }
-        for d in todas_demandas
+        for d in cat.demandas
     ]
 
-    print("\n=== DEBUG RELATÓRIOS AVANÇADOS ===")
-    print(f"URL acessada: {request.url}")
-    print(f"Filtros recebidos: {dict(request.args)}")
-    print(f"Diretoria selecionada (raw): '{diretoria_sel}'")
-    if todas_diretorias:
-        print(f"Exemplo de diretoria no banco: '{todas_diretorias[0].descricao_exibicao}'")
-    print(f"Resultados encontrados na query: {len(resultados)}")
-    print(f"Total registros no DF: {total_resultados}")
-    print(f"Total RAs distintas: {total_ras}")
-    print(f"Total demandas distintas: {total_demandas}")
-    print(f"Itens para gráficos (dados_relatorio): {len(dados_relatorio)}")
-    print(f"Mapa demandas mapeadas: {len(demandas_mapeadas)} entradas")
-    if len(resultados) == 0:
-        print("QUERY RETORNOU 0 - VERIFIQUE JOINS E DADOS")
-    print("==================================\n")
-
     return render_template(
         "relatorios_avancados.html",
-        todos_status=todos_status,
-        todas_ras=todas_ras,
-        todas_demandas=todas_demandas,
-        todas_diretorias=todas_diretorias,
-        todos_departamentos=todos_departamentos,
-        resultados=resultados,
-        total_resultados=total_resultados,
-        total_ras=total_ras,
-        total_demandas=total_demandas,
+        todos_status=cat.status,
+        todas_ras=cat.ras,
+        todas_demandas=cat.demandas,
+        todas_diretorias=cat.diretorias,
+        todos_departamentos=cat.departamentos,
         demandas_mapeadas=demandas_mapeadas,
-        dados_relatorio=dados_relatorio
+        tamanho_pagina=TAMANHO_PAGINA_RELATORIO,
+        **totais
     )
 
 
+@relatorios_bp.route('/avancados/agregados')
+@login_required
+def agregados_relatorio():
+    """
+    Totais e séries dos gráficos para os filtros da querystring.
+    `series` (opcional, separadas por vírgula) limita as séries calculadas.
+    """
+    try:
+        filtros = extrair_filtros_relatorio(request.args)
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    pedidas = [s for s in request.args.get("series", "").split(",") if s]
+    desconhecidas = set(pedidas) - set(SERIES_RELATORIO)
+    if desconhecidas:
+        return jsonify({"erro": f"Série(s) inválida(s): {', '.join(sorted(desconhecidas))}."}), 400
+
+    series = tuple(pedidas) or SERIES_RELATORIO
+    return jsonify({
+        "totais": _totais(filtros),
+        "series": em_cache("relatorio_series", filtros, lambda: agregar_relatorio(filtros, series), series=series),
+    })
+
+
+@relatorios_bp.route('/avancados/linhas')
+@login_required
+def linhas_relatorio():
+    """
+    Página do detalhamento (JSON) para os filtros da querystring.
+    ordem: data | status | ra; direcao: asc | desc; apos: cursor devolvido
+    em "proximo" pela página anterior.
+    """
+    try:
+        filtros = extrair_filtros_relatorio(request.args)
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    ordem = request.args.get("ordem", "data")
+    if ordem not in ORDENACOES_RELATORIO:
+        return jsonify({"erro": "Ordenação inválida."}), 400
+    decrescente = request.args.get("direcao", "desc") != "asc"
+    limite = request.args.get("limite", TAMANHO_PAGINA_RELATORIO, type=int)
+    limite = min(max(limite or TAMANHO_PAGINA_RELATORIO, 1), LIMITE_PAGINA_RELATORIO)
+
+    apos = request.args.get("apos")
+
+    def calcular():
+        linhas, proximo = pagina_relatorio(filtros, ordem, decrescente, apos, limite)
+        return {
+            "linhas": [[formatar_valor(v) for v in linha_relatorio(linha)] for linha in linhas],
+            "proximo": proximo,
+        }
+
+    try:
+        pagina = em_cache(
+            "relatorio_pagina", filtros, calcular,
+            ordem=ordem, decrescente=decrescente, apos=apos, limite=limite
+        )
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    return jsonify(pagina)
+
+
 # ==========================================================
 # 📄 EXPORTAÇÃO CSV / XLSX
 # ==========================================================
 @relatorios_bp.route('/exportar')
 @login_required
 def exportar_relatorios():
-    status_sel = request.args.get("status")
-    ra_sel = request.args.get("ra")
-    diretoria_sel = request.args.get("diretoria")
-    departamento_sel = request.args.get("departamento")
-    demanda_sel = request.args.get("servico")
-    inicio = request.args.get("inicio")
-    fim = request.args.get("fim")
-
-    query = (
-        db.session.query(
-            Movimentacao,
-            Usuario,
-            EntradaProcesso,
-            Processo,
-            Demanda,
-            Departamento,
-            Diretoria
-        )
-        .outerjoin(Usuario, Movimentacao.id_usuario == Usuario.id_usuario)
-        .outerjoin(EntradaProcesso, Movimentacao.id_entrada == EntradaProcesso.id_entrada)
-        .outerjoin(Processo, EntradaProcesso.id_processo == Processo.id_processo)
-        .outerjoin(Demanda, EntradaProcesso.id_demanda == Demanda.id_demanda)
-        .outerjoin(Departamento, Demanda.id_departamento == Departamento.id_departamento)
-        .outerjoin(Diretoria, Departamento.id_diretoria == Diretoria.id_diretoria)
-    )
-
-    if diretoria_sel:
-        query = query.filter(Diretoria.descricao_exibicao.ilike(f"%{diretoria_sel}%"))
-    if departamento_sel:
-        query = query.filter(Departamento.nome == departamento_sel)
-    if demanda_sel:
-        query = query.filter(Demanda.descricao == demanda_sel)
-    if ra_sel:
-        query = query.filter(EntradaProcesso.ra_origem == ra_sel)
-    if status_sel:
-        query = query.filter(Movimentacao.novo_status == status_sel)
-    if inicio and fim:
-        try:
-            dt_inicio = datetime.strptime(inicio, "%Y-%m-%d")
-            dt_fim = datetime.strptime(fim, "%Y-%m-%d")
-            query = query.filter(Movimentacao.data.between(dt_inicio, dt_fim))
-        except ValueError:
-            pass
-
-    resultados = query.all()
-
-    dados = []
-    for mov, user, entrada, processo, demanda, departamento, diretoria in resultados:
-        dados.append({
-            "Data": mov.data.strftime("%d/%m/%Y %H:%M") if mov.data else "—",
-            "Número do Processo": processo.numero_processo if processo else "—",
-            "RA": entrada.ra_origem if entrada else "—",
-            "Status": mov.novo_status if mov else "—",
-            "Diretoria": diretoria.descricao_exibicao if diretoria else "Não informado",
-            "Departamento": departamento.nome if departamento else "Não informado",
-            "Serviço": demanda.descricao if demanda else "—",
-            "Responsável": user.usuario if user else "—",
-            "Observação": mov.observacao or ""
-        })
-
-    df = pd.DataFrame(dados)
+    try:
+        filtros = extrair_filtros_relatorio(request.args)
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    stmt = consulta_relatorio(filtros)
+
+    # Resultados pequenos (os filtros do dia a dia) vêm do cache de resultados
+    if _totais(filtros)["total_resultados"] <= LINHAS_EXPORTACAO_EM_CACHE:
+        linhas = em_cache("relatorio_linhas", filtros, lambda: list(iterar_linhas(stmt)))
+    else:
+        linhas = iterar_linhas(stmt)
 
     formato = request.args.get("formato", "csv").lower()
     nome = f"Relatorio_Avancado_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
     if formato == "xlsx":
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="Relatório")
-        output.seek(0)
-        return send_file(output, as_attachment=True, download_name=f"{nome}.xlsx", mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-
-    csv = df.to_csv(index=False, sep=";", encoding="utf-8-sig")
-    response = make_response(csv)
+        arquivo = gerar_xlsx(linhas, COLUNAS_RELATORIO, "Relatório")
+        return send_file(arquivo, as_attachment=True, download_name=f"{nome}.xlsx", mimetype=MIMETYPE_XLSX)
+
+    if formato in FORMATOS_COLUNARES:
+        extensao, mimetype = FORMATOS_COLUNARES[formato]
+        arquivo = gerar_colunar(linhas, COLUNAS_RELATORIO, formato)
+        return send_file(arquivo, as_attachment=True, download_name=f"{nome}.{extensao}", mimetype=mimetype)
+
+    # CSV em streaming: as linhas saem do cursor (ou do cache) direto para a resposta
+    response = Response(
+        stream_with_context(gerar_csv(linhas)),
+        mimetype="text/csv"
+    )
     response.headers["Content-Disposition"] = f"attachment; filename={nome}.csv"
-    response.headers["Content-Type"] = "text/csv"
     return response
+
+
+# ==========================================================
+# ⏳ EXPORTAÇÕES EM SEGUNDO PLANO
+# ==========================================================
+@relatorios_bp.route('/exportacoes', methods=['POST'])
+@login_required
+def criar_exportacao():
+    """Cria (ou reaproveita) uma tarefa de exportação e devolve seu id"""
+    tipo = request.form.get("tipo", "relatorio")
+    formato = request.form.get("formato", "csv").lower()
+    try:
+        if tipo == "relatorio":
+            extrair_filtros_relatorio(request.form)  # diretoria não reconhecida → 400
+        estado = submeter_exportacao(tipo, formato, request.form)
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    return jsonify(_resumo_tarefa(estado)), 202
+
+
+@relatorios_bp.route('/exportacoes/<id_tarefa>')
+@login_required
+def status_exportacao(id_tarefa):
+    """Andamento da tarefa (consultado periodicamente pela tela)"""
+    estado = ler_tarefa(id_tarefa)
+    if not estado:
+        return jsonify({"erro": "Tarefa não encontrada ou expirada."}), 404
+    return jsonify(_resumo_tarefa(estado))
+
+
+@relatorios_bp.route('/exportacoes/<id_tarefa>/download')
+@login_required
+def baixar_exportacao(id_tarefa):
+    """Download do arquivo gerado pela tarefa"""
+    estado = ler_tarefa(id_tarefa)
+    caminho = caminho_artefato(estado) if estado else None
+    if not caminho:
+        return jsonify({"erro": "Arquivo indisponível."}), 404
+    try:
+        return send_file(
+            caminho,
+            as_attachment=True,
+            download_name=estado["nome_download"],
+            mimetype=FORMATOS[estado["formato"]][1]
+        )
+    except FileNotFoundError:
+        return jsonify({"erro": "Arquivo expirado."}), 410
+
+
+def _resumo_tarefa(estado):
+    """Campos públicos do estado da tarefa + URLs de acompanhamento."""
+    resumo = {
+        campo: estado.get(campo)
+        for campo in ("id", "tipo", "formato", "status", "progresso", "total", "erro")
+    }
+    resumo["url_status"] = url_for("relatorios_bp.status_exportacao", id_tarefa=estado["id"])
+    if estado["status"] == "concluida":
+        resumo["url_download"] = url_for("relatorios_bp.baixar_exportacao", id_tarefa=estado["id"])
+    return resumo
@@ -0,0 +1,312 @@
+# app/relatorios/tarefas.py
+"""
+Tarefas de exportação em segundo plano — CR-NOVACAP.
+
+O pedido (tipo, formato e filtros) vira uma tarefa executada por um pool
+de threads local; a requisição devolve apenas o id. O estado de cada
+tarefa fica num JSON ao lado do artefato, em relatorios_gerados/exportacoes/,
+de modo que qualquer worker do servidor consegue informar o andamento.
+
+Pedidos idênticos em andamento compartilham a mesma tarefa: o primeiro
+cria de forma exclusiva um arquivo de trava `<chave>.lock` com o id da
+tarefa; os seguintes leem a trava e recebem o mesmo id.
+Artefatos e estados expiram após TEMPO_EXPIRACAO e são removidos por
+limpar_expiradas() (chamada a cada novo pedido e por
+scripts/limpar_exportacoes.py).
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask import current_app
+
+from app.processos.consultas import (
+    CAMPOS_FILTRO, consulta_exportacao, contar_exportacao,
+    extrair_filtros, filtrar_processos, iterar_em_lotes
+)
+from app.relatorios.consultas import (
+    CAMPOS_FILTRO_RELATORIO, consulta_relatorio, contar_relatorio, extrair_filtros_relatorio
+)
+from app.relatorios.exportacao import (
+    COLUNAS_RELATORIO, COLUNAS_TRAMITACOES, MIMETYPE_XLSX, FORMATOS_COLUNARES,
+    iterar_linhas, linhas_tramitacoes, gerar_csv, gerar_xlsx, gerar_colunar
+)
+from app.relatorios.pdf import gerar_pdf
+
+TRABALHADORES_EXPORTACAO = 2
+TEMPO_EXPIRACAO = 2 * 60 * 60          # segundos após a conclusão
+TEMPO_MAXIMO_SEM_PROGRESSO = 15 * 60   # tarefa "executando" sem atualização é considerada perdida
+INTERVALO_PROGRESSO = 1000             # linhas entre gravações do progresso
+
+STATUS_EM_ANDAMENTO = ("pendente", "executando")
+
+_ID_TAREFA = re.compile(r"^[0-9a-f]{32}$")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+# ==========================================================
+# 📦 Tipos de exportação e formatos
+# ==========================================================
+def _exportacao_relatorio(filtros):
+    filtros = extrair_filtros_relatorio(filtros)
+    total = contar_relatorio(filtros)
+    return total, iterar_linhas(consulta_relatorio(filtros)), COLUNAS_RELATORIO, "Relatorio_Avancado", "Relatório"
+
+
+def _exportacao_tramitacoes(filtros):
+    filtros = extrair_filtros(filtros)
+    query = filtrar_processos(consulta_exportacao(), filtros)
+    total = contar_exportacao(filtros)
+    return total, linhas_tramitacoes(iterar_em_lotes(query)), COLUNAS_TRAMITACOES, "processos", "Processos"
+
+
+# tipo → (campos de filtro aceitos, função que monta a exportação)
+EXPORTACOES = {
+    "relatorio": (CAMPOS_FILTRO_RELATORIO, _exportacao_relatorio),
+    "tramitacoes": (CAMPOS_FILTRO, _exportacao_tramitacoes),
+}
+
+
+def _escrever_csv(linhas, colunas, titulo, destino):
+    with open(destino, "w", encoding="utf-8", newline="") as arquivo:
+        for bloco in gerar_csv(linhas, colunas):
+            arquivo.write(bloco)
+
+
+def _escrever_xlsx(linhas, colunas, titulo, destino):
+    gerar_xlsx(linhas, colunas, titulo, destino)
+
+
+def _escrever_pdf(linhas, colunas, titulo, destino):
+    gerar_pdf(linhas, colunas, titulo, destino)
+
+
+def _escrever_colunar(formato):
+    def escrever(linhas, colunas, titulo, destino):
+        gerar_colunar(linhas, colunas, formato, destino)
+    return escrever
+
+
+# formato → (extensão, mimetype, função de escrita)
+FORMATOS = {
+    "csv": ("csv", "text/csv", _escrever_csv),
+    "xlsx": ("xlsx", MIMETYPE_XLSX, _escrever_xlsx),
+    "pdf": ("pdf", "application/pdf", _escrever_pdf),
+    **{
+        formato: (extensao, mimetype, _escrever_colunar(formato))
+        for formato, (extensao, mimetype) in FORMATOS_COLUNARES.items()
+    },
+}
+
+
+# ==========================================================
+# 🗂 Estado das tarefas (JSON em disco)
+# ==========================================================
+def pasta_exportacoes(app=None):
+    """Diretório dos artefatos e estados (criado se necessário)."""
+    app = app or current_app
+    pasta = app.config.get("PASTA_EXPORTACOES") or os.path.join(
+        os.path.dirname(app.root_path), "relatorios_gerados", "exportacoes"
+    )
+    os.makedirs(pasta, exist_ok=True)
+    return pasta
+
+
+def _salvar_estado(pasta, estado):
+    """Grava o estado de forma atômica (arquivo temporário + replace)."""
+    estado["atualizada_em"] = time.time()
+    destino = os.path.join(pasta, f"{estado['id']}.json")
+    temporario = f"{destino}.{uuid.uuid4().hex}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(estado, arquivo, ensure_ascii=False)
+    os.replace(temporario, destino)
+
+
+def ler_tarefa(id_tarefa, pasta=None):
+    """Estado da tarefa ou None (id inválido, inexistente ou expirado)."""
+    if not id_tarefa or not _ID_TAREFA.match(id_tarefa):
+        return None
+    caminho = os.path.join(pasta or pasta_exportacoes(), f"{id_tarefa}.json")
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+
+def caminho_artefato(estado, pasta=None):
+    """Caminho do arquivo gerado (None se a tarefa não terminou)."""
+    if estado.get("status") != "concluida" or not estado.get("arquivo"):
+        return None
+    return os.path.join(pasta or pasta_exportacoes(), estado["arquivo"])
+
+
+def chave_tarefa(tipo, formato, filtros):
+    """Identifica pedidos idênticos (mesmo tipo, formato e filtros)."""
+    conteudo = json.dumps([tipo, formato, sorted(filtros.items())], ensure_ascii=False)
+    return hashlib.sha1(conteudo.encode("utf-8")).hexdigest()
+
+
+def _em_andamento(estado):
+    return (
+        estado is not None
+        and estado["status"] in STATUS_EM_ANDAMENTO
+        and time.time() - estado["atualizada_em"] < TEMPO_MAXIMO_SEM_PROGRESSO
+    )
+
+
+# ==========================================================
+# 🚀 Submissão e execução
+# ==========================================================
+def _pool(app):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get("TRABALHADORES_EXPORTACAO", TRABALHADORES_EXPORTACAO),
+                thread_name_prefix="exportacao"
+            )
+        return _executor
+
+
+def submeter_exportacao(tipo, formato, args):
+    """
+    Cria (ou reaproveita, se houver uma idêntica em andamento) a tarefa de
+    exportação e devolve seu estado. ValueError para tipo/formato inválidos.
+    """
+    if tipo not in EXPORTACOES:
+        raise ValueError(f"Tipo de exportação inválido: {tipo}")
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação inválido: {formato}")
+
+    app = current_app._get_current_object()
+    pasta = pasta_exportacoes(app)
+    limpar_expiradas(pasta)
+
+    campos, _ = EXPORTACOES[tipo]
+    filtros = {campo: args.get(campo) for campo in campos if args.get(campo)}
+    trava = os.path.join(pasta, f"{chave_tarefa(tipo, formato, filtros)}.lock")
+
+    estado = {
+        "id": uuid.uuid4().hex,
+        "tipo": tipo,
+        "formato": formato,
+        "filtros": filtros,
+        "status": "pendente",
+        "progresso": 0,
+        "total": None,
+        "criada_em": time.time(),
+        "concluida_em": None,
+        "arquivo": None,
+        "nome_download": None,
+        "erro": None,
+    }
+    _salvar_estado(pasta, estado)
+
+    # Trava criada já com o conteúdo: link() falha se o arquivo existir
+    temporario = f"{trava}.{estado['id']}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        arquivo.write(estado["id"])
+    try:
+        for _ in range(2):
+            try:
+                os.link(temporario, trava)
+                break
+            except FileExistsError:
+                existente = ler_tarefa(_ler_trava(trava), pasta)
+                if _em_andamento(existente):
+                    _remover(os.path.join(pasta, f"{estado['id']}.json"))
+                    return existente
+                _remover(trava)  # trava órfã (tarefa terminada ou perdida)
+        else:
+            raise RuntimeError("Não foi possível registrar a tarefa de exportação.")
+    finally:
+        _remover(temporario)
+
+    _pool(app).submit(_executar, app, pasta, estado, trava)
+    return estado
+
+
+def _executar(app, pasta, estado, trava):
+    """Gera o artefato da tarefa (executa numa thread do pool)."""
+    with app.app_context():
+        try:
+            estado["status"] = "executando"
+            _salvar_estado(pasta, estado)
+
+            _, montar = EXPORTACOES[estado["tipo"]]
+            total, linhas, colunas, prefixo, titulo = montar(estado["filtros"])
+            estado["total"] = total
+            _salvar_estado(pasta, estado)
+
+            extensao, _, escrever = FORMATOS[estado["formato"]]
+            arquivo = f"{estado['id']}.{extensao}"
+            escrever(_com_progresso(linhas, pasta, estado), colunas, titulo, os.path.join(pasta, arquivo))
+
+            estado.update(
+                status="concluida",
+                arquivo=arquivo,
+                nome_download=f"{prefixo}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extensao}",
+                concluida_em=time.time(),
+            )
+        except Exception as e:
+            app.logger.exception("Falha na exportação %s", estado["id"])
+            estado.update(status="erro", erro=str(e))
+        finally:
+            _salvar_estado(pasta, estado)
+            if _ler_trava(trava) == estado["id"]:
+                _remover(trava)
+
+
+def _com_progresso(linhas, pasta, estado):
+    """Repassa as linhas gravando o progresso a cada INTERVALO_PROGRESSO."""
+    processadas = 0
+    for processadas, linha in enumerate(linhas, start=1):
+        yield linha
+        if processadas % INTERVALO_PROGRESSO == 0:
+            estado["progresso"] = processadas
+            _salvar_estado(pasta, estado)
+    estado["progresso"] = processadas
+
+
+# ==========================================================
+# 🧹 Expiração
+# ==========================================================
+def limpar_expiradas(pasta=None):
+    """Remove artefatos, estados e travas mais antigos que TEMPO_EXPIRACAO. Retorna o total."""
+    pasta = pasta or pasta_exportacoes()
+    limite = time.time() - TEMPO_EXPIRACAO
+    removidos = 0
+    for nome in os.listdir(pasta):
+        caminho = os.path.join(pasta, nome)
+        try:
+            if os.path.getmtime(caminho) < limite:
+                os.remove(caminho)
+                removidos += 1
+        except OSError:
+            pass
+    return removidos
+
+
+def _ler_trava(trava):
+    try:
+        with open(trava, encoding="utf-8") as arquivo:
+            return arquivo.read().strip()
+    except OSError:
+        return None
+
+
+def _remover(caminho):
+    try:
+        os.remove(caminho)
+    except OSError:
+        pass
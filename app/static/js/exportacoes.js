@@ -0,0 +1,64 @@
+/*
+ * Exportações em segundo plano — CR-NOVACAP
+ * Botões com [data-exportacao-tipo] e [data-exportacao-formato] criam a
+ * tarefa (POST /relatorios/exportacoes) com os filtros da página atual,
+ * acompanham o andamento e iniciam o download ao concluir.
+ */
+(function () {
+  const INTERVALO_MS = 1500;
+
+  function mostrar(botao, texto) {
+    const alvo = document.getElementById(botao.dataset.exportacaoStatus);
+    if (alvo) alvo.textContent = texto;
+  }
+
+  function acompanhar(botao, url) {
+    fetch(url, { credentials: 'same-origin' })
+      .then(function (resp) { return resp.json(); })
+      .then(function (tarefa) {
+        if (tarefa.status === 'concluida') {
+          mostrar(botao, 'Arquivo pronto.');
+          botao.disabled = false;
+          window.location.href = tarefa.url_download;
+        } else if (tarefa.status === 'erro' || tarefa.erro) {
+          mostrar(botao, 'Falha na exportação: ' + (tarefa.erro || 'erro desconhecido'));
+          botao.disabled = false;
+        } else {
+          const total = tarefa.total ? ' de ' + tarefa.total : '';
+          mostrar(botao, 'Gerando… ' + tarefa.progresso + total + ' linha(s)');
+          setTimeout(function () { acompanhar(botao, url); }, INTERVALO_MS);
+        }
+      })
+      .catch(function () {
+        mostrar(botao, 'Não foi possível acompanhar a exportação.');
+        botao.disabled = false;
+      });
+  }
+
+  document.querySelectorAll('[data-exportacao-tipo]').forEach(function (botao) {
+    botao.addEventListener('click', function (ev) {
+      ev.preventDefault();
+      const dados = new URLSearchParams(window.location.search);
+      dados.set('tipo', botao.dataset.exportacaoTipo);
+      dados.set('formato', botao.dataset.exportacaoFormato);
+
+      botao.disabled = true;
+      mostrar(botao, 'Exportação enviada…');
+      fetch(botao.dataset.url, {
+        method: 'POST',
+        credentials: 'same-origin',
+        headers: { 'X-CSRFToken': botao.dataset.csrf },
+        body: dados
+      })
+        .then(function (resp) { return resp.json(); })
+        .then(function (tarefa) {
+          if (tarefa.erro) throw new Error(tarefa.erro);
+          acompanhar(botao, tarefa.url_status);
+        })
+        .catch(function (erro) {
+          mostrar(botao, 'Falha ao criar a exportação. ' + (erro.message || ''));
+          botao.disabled = false;
+        });
+    });
+  });
+})();
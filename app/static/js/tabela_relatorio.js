@@ -0,0 +1,136 @@
+/*
+ * Detalhamento do relatório avançado com rolagem virtual — CR-NOVACAP
+ * As linhas vêm em páginas de GET /relatorios/avancados/linhas (cursor em
+ * "proximo") conforme a rolagem avança. Só as linhas visíveis ficam no
+ * DOM; espaçadores acima e abaixo ocupam a altura das demais, então a
+ * barra de rolagem já reflete o total de registros.
+ * Cabeçalhos com [data-ordem] alternam a ordenação (feita no servidor).
+ */
+(function () {
+  const ALTURA_LINHA = 38;  // px — mesma altura de .tabela-virtual td
+  const MARGEM = 20;        // linhas desenhadas além da área visível
+
+  const area = document.getElementById('tabela-relatorio');
+  if (!area) return;
+
+  const corpo = area.querySelector('tbody');
+  const cabecalhos = area.querySelectorAll('th[data-ordem]');
+  const colunas = area.querySelectorAll('thead th').length;
+  const total = parseInt(area.dataset.total, 10) || 0;
+  const tamanhoPagina = parseInt(area.dataset.tamanhoPagina, 10) || 200;
+
+  let linhas = [];
+  let proximo = null;
+  let completo = false;     // todas as páginas já carregadas
+  let carregando = false;
+  let ordem = 'data';
+  let direcao = 'desc';
+  let geracao = 0;          // descarta respostas de uma ordenação anterior
+  let agendado = false;
+
+  function mostrar(texto) {
+    const alvo = document.getElementById('tabela-relatorio-status');
+    if (alvo) alvo.textContent = texto;
+  }
+
+  function linhaUnica(altura, texto) {
+    const tr = document.createElement('tr');
+    tr.className = 'espacador';
+    const td = document.createElement('td');
+    td.colSpan = colunas;
+    td.style.height = altura + 'px';
+    if (texto) td.textContent = texto;
+    tr.appendChild(td);
+    return tr;
+  }
+
+  function renderizar() {
+    agendado = false;
+    if (!total) {
+      corpo.replaceChildren(linhaUnica(ALTURA_LINHA, 'Nenhum registro encontrado com os filtros selecionados.'));
+      return;
+    }
+
+    const inicio = Math.max(0, Math.floor(area.scrollTop / ALTURA_LINHA) - MARGEM);
+    const quantidade = Math.ceil(area.clientHeight / ALTURA_LINHA) + 2 * MARGEM;
+    const fim = Math.min(linhas.length, inicio + quantidade);
+
+    const fragmento = document.createDocumentFragment();
+    fragmento.appendChild(linhaUnica(inicio * ALTURA_LINHA));
+    for (let i = inicio; i < fim; i++) {
+      const tr = document.createElement('tr');
+      if (i % 2) tr.className = 'par';
+      linhas[i].forEach(function (valor) {
+        const td = document.createElement('td');
+        td.textContent = valor;
+        td.title = valor;
+        tr.appendChild(td);
+      });
+      fragmento.appendChild(tr);
+    }
+    fragmento.appendChild(linhaUnica(Math.max(0, total - Math.max(fim, inicio)) * ALTURA_LINHA));
+    corpo.replaceChildren(fragmento);
+
+    // Área visível além do que já chegou: busca a próxima página
+    if (!completo && inicio + quantidade > linhas.length) carregar();
+  }
+
+  function agendar() {
+    if (agendado) return;
+    agendado = true;
+    window.requestAnimationFrame(renderizar);
+  }
+
+  function carregar() {
+    if (carregando || completo) return;
+    carregando = true;
+
+    const params = new URLSearchParams(window.location.search);
+    params.set('ordem', ordem);
+    params.set('direcao', direcao);
+    params.set('limite', tamanhoPagina);
+    if (proximo) params.set('apos', proximo);
+
+    const minhaGeracao = geracao;
+    fetch(area.dataset.url + '?' + params.toString(), { credentials: 'same-origin' })
+      .then(function (resp) { return resp.json(); })
+      .then(function (pagina) {
+        if (minhaGeracao !== geracao) return;
+        if (pagina.erro) throw new Error(pagina.erro);
+        Array.prototype.push.apply(linhas, pagina.linhas);
+        proximo = pagina.proximo;
+        completo = !proximo;
+        carregando = false;
+        agendar();
+      })
+      .catch(function (erro) {
+        if (minhaGeracao !== geracao) return;
+        completo = true;
+        carregando = false;
+        mostrar('Não foi possível carregar as linhas. ' + (erro.message || ''));
+      });
+  }
+
+  function ordenar(novaOrdem) {
+    direcao = (novaOrdem === ordem && direcao === 'desc') ? 'asc' : 'desc';
+    ordem = novaOrdem;
+    cabecalhos.forEach(function (th) {
+      th.classList.remove('ordem-asc', 'ordem-desc');
+      if (th.dataset.ordem === ordem) th.classList.add('ordem-' + direcao);
+    });
+
+    geracao += 1;
+    linhas = [];
+    proximo = null;
+    completo = false;
+    carregando = false;
+    area.scrollTop = 0;
+    renderizar();
+  }
+
+  cabecalhos.forEach(function (th) {
+    th.addEventListener('click', function () { ordenar(th.dataset.ordem); });
+  });
+  area.addEventListener('scroll', agendar);
+  renderizar();
+})();
@@ -87,6 +87,27 @@ def carregar_dados():
     return tratar_dados(df)
 
 
+@st.cache_data(ttl=60)
+def carregar_contadores():
+    """Lê a tabela-resumo processo_contadores (uma linha por status × diretoria)."""
+    engine = conectar_banco()
+
+    query = """
+        SELECT
+            status_atual,
+            diretoria_destino,
+            quantidade
+        FROM processo_contadores
+        WHERE quantidade <> 0
+    """
+
+    try:
+        return pd.read_sql(query, engine)
+    except Exception:
+        # Tabela ainda não criada: os KPIs voltam a ser calculados sobre a base
+        return None
+
+
 def tratar_dados(df):
     if df.empty:
         return df
@@ -2,8 +2,8 @@
 
 import streamlit as st
 
-from consultas import carregar_dados
-from filtros import aplicar_filtros_sidebar
+from consultas import carregar_dados, carregar_contadores
+from filtros import aplicar_filtros_sidebar, filtros_cobrem_base
 from indicadores import exibir_kpis, adicionar_categoria_status
 from graficos import (
     grafico_evolucao_mensal,
@@ -56,7 +56,10 @@ renderizar_titulo_painel(
 
 
 st.subheader("Indicadores gerais")
-exibir_kpis(dados)
+
+# Sem recortes, os KPIs vêm direto da tabela-resumo (O(nº de baldes))
+contadores = carregar_contadores() if filtros_cobrem_base(df, filtros) else None
+exibir_kpis(dados, contadores)
 
 
 st.divider()
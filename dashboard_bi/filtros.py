@@ -77,6 +77,26 @@ def gerar_rotulo_periodo(data_inicio, data_fim):
     return "Período personalizado"
 
 
+def filtros_cobrem_base(df, filtros):
+    """Indica se os filtros aplicados mantêm a base inteira (sem recortes)."""
+    if any(filtros[chave] for chave in ["ras", "diretorias", "grupos_demanda", "demandas", "status"]):
+        return False
+
+    if df.empty or "data_entrada_novacap" not in df.columns:
+        return False
+
+    menor_data = df["data_entrada_novacap"].min()
+    maior_data = df["data_entrada_novacap"].max()
+
+    if pd.isna(menor_data) or pd.isna(maior_data):
+        return False
+
+    return (
+        filtros["data_inicio"] <= menor_data.date()
+        and filtros["data_fim"] >= maior_data.date()
+    )
+
+
 def aplicar_filtros_sidebar(df):
     st.sidebar.title("🔎 Filtros da análise")
     st.sidebar.caption("Os filtros são aplicados em cascata.")
@@ -56,6 +56,17 @@ def adicionar_categoria_status(df):
     return df
 
 
+KPIS_POR_CATEGORIA = {
+    "atendidos": "Atendidos",
+    "em_tramitacao": "Em tramitação",
+    "devolvidos": "Devolvidos à RA",
+    "encerrados_ra": "Encerrados pela RA",
+    "improcedentes": "Improcedentes",
+    "ouvidoria": "Ouvidoria",
+    "outros": "Outros",
+}
+
+
 def contar_categoria(df, categoria):
     return df.loc[
         df["categoria_status"] == categoria,
@@ -63,35 +74,48 @@ def contar_categoria(df, categoria):
     ].nunique()
 
 
+def kpis_zerados():
+    return {"total_processos": 0, **{chave: 0 for chave in KPIS_POR_CATEGORIA}}
+
+
 def calcular_kpis(df):
     if df.empty:
-        return {
-            "total_processos": 0,
-            "atendidos": 0,
-            "em_tramitacao": 0,
-            "devolvidos": 0,
-            "encerrados_ra": 0,
-            "improcedentes": 0,
-            "ouvidoria": 0,
-            "outros": 0,
-        }
+        return kpis_zerados()
 
     df = adicionar_categoria_status(df)
 
     return {
         "total_processos": df["id_processo"].nunique(),
-        "atendidos": contar_categoria(df, "Atendidos"),
-        "em_tramitacao": contar_categoria(df, "Em tramitação"),
-        "devolvidos": contar_categoria(df, "Devolvidos à RA"),
-        "encerrados_ra": contar_categoria(df, "Encerrados pela RA"),
-        "improcedentes": contar_categoria(df, "Improcedentes"),
-        "ouvidoria": contar_categoria(df, "Ouvidoria"),
-        "outros": contar_categoria(df, "Outros"),
+        **{
+            chave: contar_categoria(df, categoria)
+            for chave, categoria in KPIS_POR_CATEGORIA.items()
+        },
+    }
+
+
+def calcular_kpis_contadores(contadores):
+    """KPIs a partir da tabela-resumo processo_contadores (O(nº de baldes))."""
+    if contadores is None or contadores.empty:
+        return kpis_zerados()
+
+    status = contadores["status_atual"]
+    categorias = status.mask(status == "").apply(classificar_status)
+    soma = contadores.groupby(categorias)["quantidade"].sum()
+
+    return {
+        "total_processos": int(contadores["quantidade"].sum()),
+        **{
+            chave: int(soma.get(categoria, 0))
+            for chave, categoria in KPIS_POR_CATEGORIA.items()
+        },
     }
 
 
-def exibir_kpis(df):
-    indicadores = calcular_kpis(df)
+def exibir_kpis(df, contadores=None):
+    if contadores is not None and not contadores.empty:
+        indicadores = calcular_kpis_contadores(contadores)
+    else:
+        indicadores = calcular_kpis(df)
 
     col1, col2, col3, col4 = st.columns(4)
 
@@ -5,6 +5,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from app import create_app
 from app.ext import db
 from app.models.modelos import Usuario
+from app.principais import nova_versao_usuarios
 
 app = create_app()
 
@@ -24,5 +25,6 @@ with app.app_context():
                 print(f"🛡️ Usuário {usuario.usuario} agora é administrador.")
             else:
                 print(f"⏭️ Usuário {usuario.usuario} mantido sem privilégios de admin.")
+        nova_versao_usuarios()
         db.session.commit()
         print("\n✔️ Processo de atribuição de admin concluído.")
@@ -0,0 +1,31 @@
+"""
+Backfill de Processo.id_ultima_movimentacao / data_ultima_movimentacao.
+
+Cria as colunas se ainda não existirem e recalcula a última movimentação
+de todos os processos (maior data; empate resolvido pelo maior id).
+Uso:
+    python scripts/atualizar_ultima_movimentacao.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.ext import db
+from app.models.modelos import Processo
+from app.models.migracoes import adicionar_colunas_ausentes
+from app.processos.movimentacoes import recalcular_ultimas_movimentacoes
+
+app = create_app()
+
+with app.app_context():
+    adicionadas = adicionar_colunas_ausentes(
+        Processo, 'id_ultima_movimentacao', 'data_ultima_movimentacao'
+    )
+    if adicionadas:
+        print(f"🧱 Colunas criadas em processos: {', '.join(adicionadas)}")
+
+    total = recalcular_ultimas_movimentacoes()
+    db.session.commit()
+    print(f"✅ Última movimentação atualizada em {total} processo(s).")
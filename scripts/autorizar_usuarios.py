@@ -5,6 +5,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from app import create_app
 from app.ext import db
 from app.models.modelos import Usuario
+from app.principais import nova_versao_usuarios
+from app.catalogo import nova_versao_catalogo
 
 app = create_app()
 
@@ -23,5 +25,7 @@ with app.app_context():
                 print(f"✅ Usuário {usuario.usuario} aprovado.")
             else:
                 print(f"⏭️ Usuário {usuario.usuario} não aprovado.")
+        nova_versao_catalogo()
+        nova_versao_usuarios()
         db.session.commit()
         print("\n✔️ Processo de aprovação concluído.")
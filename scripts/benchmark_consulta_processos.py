@@ -0,0 +1,138 @@
+"""
+Benchmark da consulta unificada de processos (app/processos/consultas.py).
+
+Popula um banco SQLite em memória com processos sintéticos (uma ou duas
+entradas cada) e, para cada tamanho, mostra:
+  - o plano da primeira página: não pode haver GROUP BY nem varredura
+    completa de entradas_processo;
+  - o tempo mediano da primeira página, de uma página no meio da tabela e
+    de um lote de exportação: deve ficar estável entre os tamanhos.
+Termina com código 1 se o plano ou o tempo crescerem com a tabela.
+
+Uso:
+    python scripts/benchmark_consulta_processos.py
+    python scripts/benchmark_consulta_processos.py --processos 10000 100000 --repeticoes 20
+"""
+
+import sys
+import os
+import argparse
+import statistics
+import time
+from datetime import date
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Banco isolado em memória: o benchmark não toca o banco configurado
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from sqlalchemy import insert, text
+
+from app import create_app
+from app.ext import db
+from app.models.modelos import Processo, EntradaProcesso, Demanda, Diretoria, Departamento, Usuario, Status
+from app.processos.consultas import consulta_exportacao, consulta_processos, paginar_processos
+
+TAMANHO_PAGINA = 51
+TAMANHO_LOTE = 1000
+# Página 10x maior pode custar no máximo isto vezes mais
+CRESCIMENTO_MAXIMO = 3
+
+
+def popular(total_processos):
+    """Apaga e recria os dados sintéticos com `total_processos` processos."""
+    db.drop_all()
+    db.create_all()
+    diretoria = Diretoria(nome_completo="Diretoria das Cidades", sigla="DC", descricao_exibicao="DC - Diretoria das Cidades")
+    db.session.add_all([diretoria, Status(descricao="Atendido", ordem_exibicao=1)])
+    db.session.flush()
+    departamento = Departamento(nome="Departamento de Vias", id_diretoria=diretoria.id_diretoria)
+    db.session.add(departamento)
+    db.session.flush()
+    demanda = Demanda(descricao="Tapa-buraco", id_diretoria=diretoria.id_diretoria, id_departamento=departamento.id_departamento)
+    usuario = Usuario(nome="Servidor", usuario="servidor", email="servidor@novacap.df.gov.br", senha_hash="x", aprovado=True)
+    db.session.add_all([demanda, usuario])
+    db.session.flush()
+
+    db.session.execute(insert(Processo), [
+        {"id_processo": i, "numero_processo": f"00110-{i:08d}/2025-00",
+         "status_atual": "Atendido", "diretoria_destino": "Diretoria das Cidades"}
+        for i in range(1, total_processos + 1)
+    ])
+    # Um em cada cinco processos tem uma segunda entrada
+    entradas = [
+        (i, "Plano Piloto (RA I)") for i in range(1, total_processos + 1)
+    ] + [
+        (i, "Gama (RA II)") for i in range(1, total_processos + 1, 5)
+    ]
+    db.session.execute(insert(EntradaProcesso), [
+        {"id_processo": id_processo, "data_criacao_ra": date(2025, 1, 1),
+         "data_entrada_novacap": date(2025, 1, 2), "data_documento": date(2025, 1, 1),
+         "ra_origem": ra, "id_demanda": demanda.id_demanda,
+         "usuario_responsavel": usuario.id_usuario, "status_inicial": "Atendido"}
+        for id_processo, ra in entradas
+    ])
+    db.session.commit()
+
+
+def plano(stmt):
+    """Linhas do EXPLAIN QUERY PLAN da instrução compilada."""
+    compilado = stmt.compile(db.engine, compile_kwargs={"literal_binds": True})
+    return [linha[-1] for linha in db.session.execute(text(f"EXPLAIN QUERY PLAN {compilado}"))]
+
+
+def mediana_ms(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--processos", type=int, nargs=2, default=[10000, 100000])
+parser.add_argument("--repeticoes", type=int, default=20)
+args = parser.parse_args()
+
+app = create_app()
+falhas = []
+with app.app_context():
+    resultados = {}
+    for total in args.processos:
+        popular(total)
+        listagem = consulta_processos()
+        exportacao = consulta_exportacao()
+
+        # A instrução da página, como paginar_processos a monta
+        pagina = listagem + (lambda s: s.order_by(Processo.id_processo.desc()).limit(TAMANHO_PAGINA))
+        passos = plano(pagina)
+        print(f"\n{total} processos — plano da página:")
+        for passo in passos:
+            print(f"  {passo}")
+        if any("GROUP BY" in p or p.startswith("SCAN entradas_processo") or "MATERIALIZE" in p for p in passos):
+            falhas.append(f"{total}: plano agrupa ou varre entradas_processo")
+
+        # A primeira entrada é a de menor id (processos com duas entradas)
+        linha = paginar_processos(listagem, 2, 1)[0]
+        if linha.ra_origem != "Plano Piloto (RA I)":
+            falhas.append(f"{total}: primeira entrada incorreta")
+
+        meio = total // 2
+        resultados[total] = {
+            "primeira página": mediana_ms(lambda: paginar_processos(listagem, None, TAMANHO_PAGINA), args.repeticoes),
+            "página do meio": mediana_ms(lambda: paginar_processos(listagem, meio, TAMANHO_PAGINA), args.repeticoes),
+            "lote exportação": mediana_ms(lambda: paginar_processos(exportacao, meio, TAMANHO_LOTE), args.repeticoes),
+        }
+
+    menor, maior = args.processos
+    print(f"\n{'Caminho':<16} | {menor:>10} | {maior:>10} | {'Razão':>6}")
+    for caminho in resultados[menor]:
+        antes, depois = resultados[menor][caminho], resultados[maior][caminho]
+        print(f"{caminho:<16} | {antes:>8.2f}ms | {depois:>8.2f}ms | {depois / antes:>5.1f}x")
+        if depois > antes * CRESCIMENTO_MAXIMO:
+            falhas.append(f"{caminho}: {antes:.2f} ms → {depois:.2f} ms")
+
+if falhas:
+    print("\n❌ " + "\n❌ ".join(falhas))
+    sys.exit(1)
+print("\n✔️ Custo por página estável entre os tamanhos.")
@@ -0,0 +1,171 @@
+"""
+Benchmark do PDF institucional de um processo (exportar_processo_pdf).
+
+Cria processos sintéticos com 10, 100 e 1000 movimentações num banco
+SQLite em memória e mede, por tamanho, a latência da montagem anterior
+(Usuario.query.get por movimentação, folha de estilos e logo recriados a
+cada PDF) e a do renderizador atual (app/processos/dossie.py: histórico e
+usuários numa consulta, estilos e logo em cache). Mostra a mediana de
+--repeticoes execuções e o número de consultas SQL por PDF.
+
+Uso:
+    python scripts/benchmark_pdf_processo.py
+    python scripts/benchmark_pdf_processo.py --tamanhos 10 100 1000 --repeticoes 5
+"""
+
+import sys
+import os
+import argparse
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from io import BytesIO
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Banco isolado em memória: o benchmark não toca o banco configurado
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from sqlalchemy import event
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+
+from app import create_app
+from app.ext import db
+from app.models.modelos import Processo, EntradaProcesso, Movimentacao, Usuario, Demanda
+from app.processos.dossie import CAMINHO_LOGO, carregar_dossies, renderizar_dossie
+
+
+def criar_processo(quantidade, ids_usuarios, id_demanda):
+    processo = Processo(
+        numero_processo=f"00110-{quantidade:08d}/2025-00",
+        status_atual="Enviado à Diretoria das Cidades",
+        diretoria_destino="Diretoria das Cidades",
+        observacoes="Processo sintético para benchmark",
+    )
+    db.session.add(processo)
+    db.session.flush()
+    entrada = EntradaProcesso(
+        id_processo=processo.id_processo, data_criacao_ra=date(2025, 1, 1),
+        data_entrada_novacap=date(2025, 1, 2), data_documento=date(2025, 1, 1),
+        ra_origem="Plano Piloto (RA I)", id_demanda=id_demanda,
+        usuario_responsavel=ids_usuarios[0], status_inicial=processo.status_atual,
+    )
+    db.session.add(entrada)
+    db.session.flush()
+    db.session.add_all(
+        Movimentacao(
+            id_entrada=entrada.id_entrada, id_usuario=ids_usuarios[i % len(ids_usuarios)],
+            novo_status=processo.status_atual, observacao=f"Movimentação {i}",
+            data=datetime(2025, 1, 3) + timedelta(hours=i),
+        )
+        for i in range(quantidade)
+    )
+    db.session.commit()
+    return processo.id_processo
+
+
+def pdf_anterior(id_processo):
+    """Montagem anterior, reproduzida para comparação."""
+    processo = Processo.query.get(id_processo)
+    entrada = EntradaProcesso.query.filter_by(id_processo=id_processo).first()
+    movimentacoes = Movimentacao.query.filter_by(id_entrada=entrada.id_entrada).order_by(Movimentacao.data.asc()).all()
+    demanda = Demanda.query.get(entrada.id_demanda) if entrada.id_demanda else None
+
+    output = BytesIO()
+    doc = SimpleDocTemplate(output, pagesize=A4)
+    styles = getSampleStyleSheet()
+    elements = [Image(CAMINHO_LOGO, width=80, height=25)]
+    elements.append(Paragraph("<b>Relatório Institucional de Processo</b>", styles['Title']))
+    elements.append(Spacer(1, 12))
+
+    table = Table([
+        ["Número do Processo", processo.numero_processo],
+        ["Status Atual", processo.status_atual or "---"],
+        ["Diretoria de Destino", processo.diretoria_destino or "---"],
+        ["Observações", processo.observacoes or "---"],
+    ], colWidths=[160, 370])
+    table.setStyle(TableStyle([('GRID', (0, 0), (-1, -1), 0.25, colors.grey)]))
+    elements += [table, Spacer(1, 12)]
+
+    t2 = Table([
+        ["RA de Origem", entrada.ra_origem or "---"],
+        ["Data de Entrada", entrada.data_entrada_novacap.strftime("%d/%m/%Y")],
+        ["Demanda", demanda.descricao if demanda else "---"],
+    ], colWidths=[200, 330])
+    t2.setStyle(TableStyle([('GRID', (0, 0), (-1, -1), 0.25, colors.grey)]))
+    elements += [Paragraph("<b>Informações da Entrada</b>", styles['Heading2']), t2, Spacer(1, 12)]
+
+    elements.append(Paragraph("<b>Histórico de Movimentações</b>", styles['Heading2']))
+    mov_table = [["Data", "Status", "Responsável", "Observação"]]
+    for m in movimentacoes:
+        usuario = Usuario.query.get(m.id_usuario)
+        mov_table.append([
+            m.data.strftime("%d/%m/%Y") if m.data else "---",
+            m.novo_status or "---",
+            usuario.nome if usuario else "---",
+            m.observacao or "---",
+        ])
+    t3 = Table(mov_table, repeatRows=1, colWidths=[80, 120, 120, 210])
+    t3.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#004A8F")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ]))
+    elements.append(t3)
+
+    doc.build(elements)
+    return output.getvalue()
+
+
+def pdf_atual(id_processo):
+    return renderizar_dossie(carregar_dossies([id_processo])[0])
+
+
+def medir(funcao, id_processo, repeticoes, consultas):
+    tempos = []
+    for _ in range(repeticoes):
+        # Sessão limpa: o mapa de identidade não pode servir de cache entre execuções
+        db.session.expunge_all()
+        consultas["total"] = 0
+        inicio = time.perf_counter()
+        funcao(id_processo)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000, consultas["total"]
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--tamanhos", type=int, nargs="+", default=[10, 100, 1000])
+parser.add_argument("--repeticoes", type=int, default=5)
+parser.add_argument("--usuarios", type=int, default=20)
+args = parser.parse_args()
+
+app = create_app()
+with app.app_context():
+    db.create_all()
+    usuarios = [
+        Usuario(nome=f"Servidor {i}", usuario=f"servidor{i}", email=f"servidor{i}@novacap.df.gov.br",
+                senha_hash="-", aprovado=True)
+        for i in range(args.usuarios)
+    ]
+    demanda = Demanda(descricao="Tapa-buraco")
+    db.session.add_all(usuarios + [demanda])
+    db.session.commit()
+    ids_usuarios = [usuario.id_usuario for usuario in usuarios]
+    id_demanda = demanda.id_demanda
+
+    consultas = {"total": 0}
+
+    @event.listens_for(db.engine, "before_cursor_execute")
+    def contar_consulta(*_):
+        consultas["total"] += 1
+
+    pdf_atual(criar_processo(1, ids_usuarios, id_demanda))  # aquece os caches do renderizador
+
+    print(f"{'Movimentações':>13} | {'Anterior (ms)':>13} | {'Consultas':>9} | {'Atual (ms)':>10} | {'Consultas':>9}")
+    for quantidade in args.tamanhos:
+        id_processo = criar_processo(quantidade, ids_usuarios, id_demanda)
+        anterior_ms, anterior_consultas = medir(pdf_anterior, id_processo, args.repeticoes, consultas)
+        atual_ms, atual_consultas = medir(pdf_atual, id_processo, args.repeticoes, consultas)
+        print(f"{quantidade:>13} | {anterior_ms:>13.1f} | {anterior_consultas:>9} | {atual_ms:>10.1f} | {atual_consultas:>9}")
@@ -0,0 +1,78 @@
+"""
+Benchmark do PDF da exportação de tramitações (dados sintéticos, sem banco).
+
+Compara a montagem em tabelas de uma página (app/relatorios/pdf.py) com a
+tabela única usada anteriormente. A tabela única só é medida até
+--limite-legado linhas, pois seu tempo cresce de forma superlinear.
+
+Uso:
+    python scripts/benchmark_pdf_tramitacoes.py
+    python scripts/benchmark_pdf_tramitacoes.py --tamanhos 1000 10000 50000 --limite-legado 10000
+"""
+
+import sys
+import os
+import argparse
+import time
+from datetime import date, timedelta
+from io import BytesIO
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+
+from app.relatorios.exportacao import COLUNAS_TRAMITACOES, formatar_valor
+from app.relatorios.pdf import gerar_pdf
+
+STATUS = ("Enviado à Diretoria das Cidades", "Atendido", "Devolvido à RA de origem – implantação")
+
+
+def linhas_sinteticas(quantidade):
+    for i in range(quantidade):
+        yield (
+            f"00110-{i:08d}/2025-{i % 100:02d}",
+            STATUS[i % len(STATUS)],
+            "Diretoria das Cidades",
+            "Plano Piloto (RA I)",
+            date(2025, 1, 1) + timedelta(days=i % 365),
+        )
+
+
+def pdf_tabela_unica(linhas):
+    """Montagem anterior: uma única Table com todas as linhas."""
+    output = BytesIO()
+    doc = SimpleDocTemplate(output, pagesize=A4)
+    dados = [[nome for nome, _, _ in COLUNAS_TRAMITACOES]]
+    dados += [[formatar_valor(valor) for valor in linha] for linha in linhas]
+    tabela = Table(dados, repeatRows=1)
+    tabela.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#004A8F")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ]))
+    doc.build([tabela])
+    return output
+
+
+def medir(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 10000, 50000])
+parser.add_argument("--limite-legado", type=int, default=10000)
+args = parser.parse_args()
+
+print(f"{'Linhas':>8} | {'Paginado (s)':>12} | {'Tamanho KB':>10} | {'Tabela única (s)':>16}")
+for quantidade in args.tamanhos:
+    segundos, arquivo = medir(gerar_pdf, linhas_sinteticas(quantidade), COLUNAS_TRAMITACOES, "Benchmark")
+    tamanho_kb = len(arquivo.read()) // 1024
+
+    legado = "—"
+    if quantidade <= args.limite_legado:
+        legado = f"{medir(pdf_tabela_unica, linhas_sinteticas(quantidade))[0]:.2f}"
+
+    print(f"{quantidade:>8} | {segundos:>12.2f} | {tamanho_kb:>10} | {legado:>16}")
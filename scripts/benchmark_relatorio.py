@@ -0,0 +1,193 @@
+"""
+Benchmark da consulta do relatório avançado (linhas por segundo).
+
+Popula um banco SQLite em memória com movimentações sintéticas e compara,
+para a tela e para a exportação:
+  - anterior: SELECT das 7 entidades ORM (Movimentacao, Usuario, ...) e
+    formatação da data linha a linha;
+  - atual: SELECT só das 9 colunas exibidas (app/relatorios/consultas.py) e
+    formatação por coluna num DataFrame (quadro_relatorio, abaixo).
+
+Uso:
+    python scripts/benchmark_relatorio.py
+    python scripts/benchmark_relatorio.py --movimentacoes 20000 100000 --repeticoes 3
+"""
+
+import sys
+import os
+import argparse
+import statistics
+import time
+from datetime import date, datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Banco isolado em memória: o benchmark não toca o banco configurado
+os.environ["DATABASE_URL"] = "sqlite://"
+
+import pandas as pd
+from sqlalchemy import select, insert
+
+from app import create_app
+from app.ext import db
+from app.models.modelos import (
+    Movimentacao, Usuario, EntradaProcesso, Processo,
+    Demanda, Departamento, Diretoria
+)
+from app.relatorios.consultas import consulta_relatorio
+from app.relatorios.exportacao import COLUNAS_RELATORIO, iterar_linhas
+
+MOVIMENTACOES_POR_PROCESSO = 5
+STATUS = ("Enviado à Diretoria das Cidades", "Atendido", "Devolvido à RA de origem – implantação")
+
+
+def popular(total_movimentacoes):
+    """Apaga e recria os dados sintéticos com `total_movimentacoes` movimentações."""
+    db.drop_all()
+    db.create_all()
+    diretoria = Diretoria(nome_completo="Diretoria das Cidades", sigla="DC", descricao_exibicao="DC - Diretoria das Cidades")
+    db.session.add(diretoria)
+    db.session.flush()
+    departamento = Departamento(nome="Departamento de Vias", id_diretoria=diretoria.id_diretoria)
+    db.session.add(departamento)
+    db.session.flush()
+    demanda = Demanda(descricao="Tapa-buraco", id_diretoria=diretoria.id_diretoria, id_departamento=departamento.id_departamento)
+    usuario = Usuario(nome="Servidor", usuario="servidor", email="servidor@novacap.df.gov.br", senha_hash="x" * 160, aprovado=True)
+    db.session.add_all([demanda, usuario])
+    db.session.flush()
+
+    processos = total_movimentacoes // MOVIMENTACOES_POR_PROCESSO
+    db.session.execute(insert(Processo), [
+        {
+            "id_processo": i, "numero_processo": f"00110-{i:08d}/2025-00",
+            "status_atual": STATUS[i % len(STATUS)], "diretoria_destino": "Diretoria das Cidades",
+            "observacoes": "Observação longa do processo " * 10,
+        }
+        for i in range(1, processos + 1)
+    ])
+    db.session.execute(insert(EntradaProcesso), [
+        {
+            "id_entrada": i, "id_processo": i, "data_criacao_ra": date(2025, 1, 1),
+            "data_entrada_novacap": date(2025, 1, 2), "data_documento": date(2025, 1, 1),
+            "ra_origem": "Plano Piloto (RA I)", "id_demanda": demanda.id_demanda,
+            "usuario_responsavel": usuario.id_usuario, "status_inicial": STATUS[0],
+        }
+        for i in range(1, processos + 1)
+    ])
+    db.session.execute(insert(Movimentacao), [
+        {
+            "id_entrada": i // MOVIMENTACOES_POR_PROCESSO + 1, "id_usuario": usuario.id_usuario,
+            "novo_status": STATUS[i % len(STATUS)], "observacao": f"Movimentação {i}",
+            "data": datetime(2025, 1, 3) + timedelta(hours=i),
+        }
+        for i in range(processos * MOVIMENTACOES_POR_PROCESSO)
+    ])
+    db.session.commit()
+
+
+def tela_anterior():
+    """Montagem anterior da tela: entidades ORM e um dict por linha."""
+    stmt = (
+        select(Movimentacao, Usuario, EntradaProcesso, Processo, Demanda, Departamento, Diretoria)
+        .outerjoin(Usuario, Movimentacao.id_usuario == Usuario.id_usuario)
+        .outerjoin(EntradaProcesso, Movimentacao.id_entrada == EntradaProcesso.id_entrada)
+        .outerjoin(Processo, EntradaProcesso.id_processo == Processo.id_processo)
+        .outerjoin(Demanda, EntradaProcesso.id_demanda == Demanda.id_demanda)
+        .outerjoin(Departamento, Demanda.id_departamento == Departamento.id_departamento)
+        .outerjoin(Diretoria, Departamento.id_diretoria == Diretoria.id_diretoria)
+        .order_by(Movimentacao.data.desc())
+    )
+    dados = []
+    for mov, user, entrada, processo, demanda, departamento, diretoria in db.session.execute(stmt):
+        dados.append({
+            "Data": mov.data.strftime("%d/%m/%Y %H:%M") if mov.data else "—",
+            "Número do Processo": processo.numero_processo if processo else "—",
+            "RA": entrada.ra_origem if entrada else "—",
+            "Status": mov.novo_status if mov else "—",
+            "Diretoria": diretoria.descricao_exibicao if diretoria else "Não informado",
+            "Departamento": departamento.nome if departamento else "Não informado",
+            "Serviço": demanda.descricao if demanda else "—",
+            "Responsável": user.usuario if user else "—",
+            "Observação": mov.observacao if mov else "",
+        })
+    return len(pd.DataFrame(dados).to_dict(orient="records"))
+
+
+def quadro_relatorio(registros):
+    """
+    DataFrame da tela do relatório a partir das linhas de consulta_relatorio.
+    Datas e marcadores de ausência são tratados por coluna, de uma vez.
+    """
+    nomes = [nome for nome, _, _ in COLUNAS_RELATORIO]
+    quadro = pd.DataFrame.from_records(registros, columns=nomes)
+
+    quadro["Data"] = pd.to_datetime(quadro["Data"]).dt.strftime("%d/%m/%Y %H:%M")
+    return quadro.fillna({
+        "Data": "—",
+        "Número do Processo": "—",
+        "RA": "—",
+        "Diretoria": "Não informado",
+        "Departamento": "Não informado",
+        "Serviço": "—",
+        "Responsável": "—",
+        "Observação": "",
+    })
+
+
+def tela_atual():
+    resultados = db.session.execute(consulta_relatorio({}, ordenar=True)).all()
+    return len(quadro_relatorio(resultados).to_dict(orient="records"))
+
+
+def exportacao_anterior():
+    """Leitura anterior da exportação: entidades ORM em lotes (yield_per)."""
+    stmt = (
+        select(Movimentacao, Usuario, EntradaProcesso, Processo, Demanda, Departamento, Diretoria)
+        .outerjoin(Usuario, Movimentacao.id_usuario == Usuario.id_usuario)
+        .outerjoin(EntradaProcesso, Movimentacao.id_entrada == EntradaProcesso.id_entrada)
+        .outerjoin(Processo, EntradaProcesso.id_processo == Processo.id_processo)
+        .outerjoin(Demanda, EntradaProcesso.id_demanda == Demanda.id_demanda)
+        .outerjoin(Departamento, Demanda.id_departamento == Departamento.id_departamento)
+        .outerjoin(Diretoria, Departamento.id_diretoria == Diretoria.id_diretoria)
+    )
+    total = 0
+    for mov, user, entrada, processo, demanda, departamento, diretoria in db.session.execute(
+        stmt, execution_options={"yield_per": 1000}
+    ):
+        (mov.data, processo.numero_processo, entrada.ra_origem, mov.novo_status,
+         diretoria.descricao_exibicao, departamento.nome, demanda.descricao, user.usuario, mov.observacao)
+        total += 1
+    return total
+
+
+def exportacao_atual():
+    return sum(1 for _ in iterar_linhas(consulta_relatorio({})))
+
+
+def linhas_por_segundo(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        # Sessão limpa: o mapa de identidade não pode servir de cache entre execuções
+        db.session.expunge_all()
+        inicio = time.perf_counter()
+        linhas = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return linhas / statistics.median(tempos)
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--movimentacoes", type=int, nargs="+", default=[20000, 100000])
+parser.add_argument("--repeticoes", type=int, default=3)
+args = parser.parse_args()
+
+app = create_app()
+with app.app_context():
+    print(f"{'Linhas':>8} | {'Caminho':<10} | {'Anterior (linhas/s)':>19} | {'Atual (linhas/s)':>16} | {'Ganho':>6}")
+    for total in args.movimentacoes:
+        popular(total)
+        for caminho, anterior, atual in (
+            ("tela", tela_anterior, tela_atual),
+            ("exportação", exportacao_anterior, exportacao_atual),
+        ):
+            antes = linhas_por_segundo(anterior, args.repeticoes)
+            depois = linhas_por_segundo(atual, args.repeticoes)
+            print(f"{total:>8} | {caminho:<10} | {antes:>19,.0f} | {depois:>16,.0f} | {depois / antes:>5.1f}x")
@@ -5,6 +5,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from app import create_app
 from app.ext import db
 from app.models.modelos import Usuario
+from app.principais import nova_versao_usuarios
+from app.catalogo import nova_versao_catalogo
 
 app = create_app()
 
@@ -14,8 +16,7 @@ with app.app_context():
     if not ativos:
         print("✅ Nenhum usuário ativo disponível para bloqueio.")
     else:
-        print("Usuários ativos:
-")
+        print("Usuários ativos:\n")
         for usuario in ativos:
             print(f"ID: {usuario.id_usuario} | Nome: {usuario.nome} | Usuário: {usuario.usuario} | Email: {usuario.email}")
             escolha = input("Deseja bloquear este usuário? (s/n): ").strip().lower()
@@ -24,5 +25,7 @@ with app.app_context():
                 print(f"⛔ Usuário {usuario.usuario} bloqueado.")
             else:
                 print(f"⏭️ Usuário {usuario.usuario} mantido ativo.")
+        nova_versao_catalogo()
+        nova_versao_usuarios()
         db.session.commit()
         print("\n✔️ Processo de bloqueio concluído.")
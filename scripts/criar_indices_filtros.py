@@ -0,0 +1,26 @@
+"""
+Cria os índices usados pelos filtros dos relatórios (app/filtros.py) que
+ainda não existem no banco: departamentos.id_diretoria (filtro por
+diretoria do relatório avançado) e as chaves de ordenação do detalhamento
+(movimentacoes.data, movimentacoes.novo_status, entradas_processo.ra_origem)
+e a busca da primeira entrada de cada processo (entradas_processo.id_processo,
+id_entrada), usada pela consulta unificada de processos.
+
+Uso:
+    python scripts/criar_indices_filtros.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.models.modelos import Departamento, Movimentacao, EntradaProcesso
+from app.models.migracoes import criar_indices_ausentes
+
+app = create_app()
+
+with app.app_context():
+    for modelo in (Departamento, Movimentacao, EntradaProcesso):
+        criar_indices_ausentes(modelo)
+    print("✔️ Índices dos filtros verificados/criados.")
@@ -17,10 +17,9 @@ print("🔍 URI ativa:", app.config['SQLALCHEMY_DATABASE_URI'])
 
 # 📦 Importa extensões e modelos necessários para a criação
 from app.ext import db
-from app.models.modelos import (
-    Status, TipoDemanda, RegiaoAdministrativa, Demanda,
-    ProtocoloAtendimento, InteracaoAtendimento
-)
+from app.models.modelos import Status, TipoDemanda, RegiaoAdministrativa, Demanda
+from app.catalogo import nova_versao_catalogo
+from app.processos.contadores import contadores_completos, reconstruir_contadores
 
 with app.app_context():
     # ✅ Cria apenas as tabelas que ainda não existem
@@ -115,6 +114,14 @@ with app.app_context():
         if not Demanda.query.filter_by(descricao=d).first():
             db.session.add(Demanda(descricao=d))
 
-    # 💾 Finaliza a transação
+    # ------------------
+    # CONTADORES DO DASHBOARD
+    # ------------------
+    # Semeia a tabela-resumo junto com a criação (processos já existentes)
+    if not contadores_completos():
+        reconstruir_contadores()
+
+    # 💾 Finaliza a transação (com nova versão do catálogo em memória)
+    nova_versao_catalogo()
     db.session.commit()
     print("✅ Tabelas criadas (se necessário) e dados essenciais inseridos com sucesso!")
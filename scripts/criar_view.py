@@ -33,16 +33,12 @@ with app.app_context():
 
     FROM processos p
     LEFT JOIN entradas_processo ep ON ep.id_processo = p.id_processo
-    LEFT JOIN (
-        SELECT m1.*
-        FROM movimentacoes m1
-        INNER JOIN (
-            SELECT id_entrada, MAX(data) AS max_data
-            FROM movimentacoes
-            GROUP BY id_entrada
-        ) m2
-        ON m1.id_entrada = m2.id_entrada AND m1.data = m2.max_data
-    ) m ON m.id_entrada = ep.id_entrada;
+    -- Última movimentação desnormalizada em processos (sem duplicar quando duas
+    -- movimentações têm a mesma data). Só a linha da entrada dona dessa
+    -- movimentação a recebe; as demais entradas do processo ficam com NULL
+    LEFT JOIN movimentacoes m
+        ON m.id_movimentacao = p.id_ultima_movimentacao
+       AND m.id_entrada = ep.id_entrada;
     """
     db.session.execute(text(comando_view))
     db.session.commit()
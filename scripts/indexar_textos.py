@@ -0,0 +1,26 @@
+"""
+Cria / reconstrói o índice textual das observações (`indice_textual`),
+usado pela busca em /processos/busca.
+
+Uso:
+    python scripts/indexar_textos.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.ext import db
+from app.models.modelos import IndiceTextual
+from app.processos.busca_textual import reconstruir_indice
+
+app = create_app()
+
+with app.app_context():
+    # ✅ Cria a tabela do índice caso ainda não exista
+    IndiceTextual.__table__.create(db.engine, checkfirst=True)
+
+    total = reconstruir_indice()
+    db.session.commit()
+    print(f"✔️ Índice textual reconstruído ({total} documento(s)).")
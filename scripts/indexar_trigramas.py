@@ -0,0 +1,26 @@
+"""
+Cria / reconstrói o índice de trigramas do número de processo
+(`processo_trigramas`), usado na busca por fragmento e no autocompletar.
+
+Uso:
+    python scripts/indexar_trigramas.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.ext import db
+from app.models.modelos import ProcessoTrigrama
+from app.processos.trigramas import reconstruir_indice
+
+app = create_app()
+
+with app.app_context():
+    # ✅ Cria a tabela do índice caso ainda não exista
+    ProcessoTrigrama.__table__.create(db.engine, checkfirst=True)
+
+    total = reconstruir_indice()
+    db.session.commit()
+    print(f"✔️ Índice de trigramas reconstruído para {total} processo(s).")
@@ -0,0 +1,65 @@
+"""
+Prepara a busca de usuários do painel administrativo
+(app/admin/busca_usuarios.py).
+
+Cria a coluna Usuario.busca_normalizada se ainda não existir, preenche
+todos os usuários em lotes, reconstrói o índice de trigramas
+(`usuario_trigramas`) e cria os índices declarados no modelo.
+Rodar de novo após inserir ou alterar usuários diretamente no banco.
+
+Uso:
+    python scripts/indexar_usuarios.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import update
+
+from app import create_app
+from app.ext import db
+from app.models.modelos import Usuario, UsuarioTrigrama
+from app.models.migracoes import adicionar_colunas_ausentes, criar_indices_ausentes
+from app.admin.busca_usuarios import reconstruir_indice
+
+TAMANHO_LOTE = 1000
+
+app = create_app()
+
+with app.app_context():
+    if adicionar_colunas_ausentes(Usuario, 'busca_normalizada'):
+        print("🧱 Coluna busca_normalizada criada em usuarios.")
+
+    # ✏️ Preenche em lotes por cursor (id_usuario)
+    total = 0
+    ultimo_id = 0
+    while True:
+        lote = (
+            db.session.query(Usuario.id_usuario, Usuario.nome, Usuario.usuario, Usuario.email)
+            .filter(Usuario.id_usuario > ultimo_id)
+            .order_by(Usuario.id_usuario)
+            .limit(TAMANHO_LOTE)
+            .all()
+        )
+        if not lote:
+            break
+        db.session.execute(update(Usuario), [
+            {'id_usuario': id_usuario, 'busca_normalizada': Usuario.normalizar_busca(nome, usuario, email)}
+            for id_usuario, nome, usuario, email in lote
+        ])
+        db.session.commit()
+        total += len(lote)
+        ultimo_id = lote[-1].id_usuario
+
+    print(f"✅ {total} usuário(s) normalizado(s).")
+
+    # ✅ Cria a tabela do índice caso ainda não exista
+    UsuarioTrigrama.__table__.create(db.engine, checkfirst=True)
+
+    indexados = reconstruir_indice()
+    db.session.commit()
+    print(f"✔️ Índice de trigramas reconstruído para {indexados} usuário(s).")
+
+    criar_indices_ausentes(Usuario)
+    print("✔️ Índice de ordenação de usuários disponível.")
@@ -0,0 +1,32 @@
+"""
+Publica uma nova versão do catálogo de referência (app/catalogo.py).
+
+Usar depois de alterar status, RAs, diretorias, departamentos, demandas
+ou usuários diretamente no banco (SQL manual, migrações): os workers em
+execução recarregam o catálogo na requisição seguinte. Como a hierarquia
+Diretoria → Departamento → Demanda também entra nas junções dos
+relatórios, o cache de resultados é invalidado junto, assim como os
+usuários autenticados em cache (app/principais.py).
+
+Uso:
+    python scripts/invalidar_catalogo.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.ext import db
+from app.cache_resultados import nova_geracao
+from app.catalogo import nova_versao_catalogo
+from app.principais import nova_versao_usuarios
+
+app = create_app()
+
+with app.app_context():
+    nova_versao_catalogo()
+    nova_geracao()
+    nova_versao_usuarios()
+    db.session.commit()
+    print("✔️ Nova versão do catálogo publicada (caches de resultados e de usuários invalidados).")
@@ -0,0 +1,21 @@
+"""
+Remove artefatos de exportação expirados de relatorios_gerados/exportacoes/.
+As limpezas também ocorrem a cada nova exportação; este script permite
+agendar a remoção (cron / Agendador de Tarefas).
+
+Uso:
+    python scripts/limpar_exportacoes.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.relatorios.tarefas import limpar_expiradas
+
+app = create_app()
+
+with app.app_context():
+    removidos = limpar_expiradas()
+    print(f"🧹 {removidos} arquivo(s) de exportação expirado(s) removido(s).")
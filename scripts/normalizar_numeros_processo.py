@@ -0,0 +1,67 @@
+"""
+Backfill de Processo.numero_normalizado (número SEI somente com dígitos).
+
+Cria a coluna se ainda não existir, preenche todos os processos em lotes e,
+se não houver números duplicados, cria o índice único.
+Uso:
+    python scripts/normalizar_numeros_processo.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import func, update
+
+from app import create_app
+from app.ext import db
+from app.models.modelos import Processo
+from app.models.migracoes import adicionar_colunas_ausentes, criar_indices_ausentes
+
+TAMANHO_LOTE = 1000
+
+app = create_app()
+
+with app.app_context():
+    if adicionar_colunas_ausentes(Processo, 'numero_normalizado'):
+        print("🧱 Coluna numero_normalizado criada em processos.")
+
+    # ✏️ Preenche em lotes por cursor (id_processo)
+    total = 0
+    ultimo_id = 0
+    while True:
+        lote = (
+            db.session.query(Processo.id_processo, Processo.numero_processo)
+            .filter(Processo.id_processo > ultimo_id)
+            .order_by(Processo.id_processo)
+            .limit(TAMANHO_LOTE)
+            .all()
+        )
+        if not lote:
+            break
+        db.session.execute(update(Processo), [
+            {'id_processo': id_processo, 'numero_normalizado': Processo.normalizar_numero(numero)}
+            for id_processo, numero in lote
+        ])
+        db.session.commit()
+        total += len(lote)
+        ultimo_id = lote[-1].id_processo
+
+    print(f"✅ {total} processo(s) normalizado(s).")
+
+    # 🔍 Duplicidades impedem o índice único
+    duplicados = (
+        db.session.query(Processo.numero_normalizado, func.count(Processo.id_processo))
+        .filter(Processo.numero_normalizado.isnot(None))
+        .group_by(Processo.numero_normalizado)
+        .having(func.count(Processo.id_processo) > 1)
+        .all()
+    )
+    if duplicados:
+        print("\n⚠️ Números duplicados encontrados — índice único NÃO criado:")
+        for numero, quantidade in duplicados:
+            print(f"Número: {numero} | Ocorrências: {quantidade}")
+        sys.exit(1)
+
+    criar_indices_ausentes(Processo)
+    print("✔️ Índice único de numero_normalizado disponível.")
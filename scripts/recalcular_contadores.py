@@ -0,0 +1,38 @@
+"""
+Verifica / reconstrói a tabela-resumo `processo_contadores`.
+
+Uso:
+    python scripts/recalcular_contadores.py              # reconstrói
+    python scripts/recalcular_contadores.py --verificar  # apenas compara com a recontagem
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.ext import db
+from app.models.modelos import ProcessoContador
+from app.processos.contadores import verificar_contadores, reconstruir_contadores
+
+app = create_app()
+
+with app.app_context():
+    # ✅ Cria a tabela-resumo caso ainda não exista
+    ProcessoContador.__table__.create(db.engine, checkfirst=True)
+
+    divergencias = verificar_contadores()
+
+    if not divergencias:
+        print("✅ Contadores consistentes com a tabela de processos.")
+    else:
+        print(f"⚠️ {len(divergencias)} balde(s) divergente(s):\n")
+        for status, diretoria, contador, real in divergencias:
+            print(f"Status: {status or '(vazio)'} | Diretoria: {diretoria} | Contador: {contador} | Real: {real}")
+
+    if '--verificar' in sys.argv:
+        sys.exit(1 if divergencias else 0)
+
+    reconstruir_contadores()
+    db.session.commit()
+    print("\n✔️ Contadores reconstruídos a partir da recontagem completa.")